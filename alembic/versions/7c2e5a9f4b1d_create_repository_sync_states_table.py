@@ -0,0 +1,39 @@
+"""Create repository sync states table
+
+Revision ID: 7c2e5a9f4b1d
+Revises: 1251d8439e3a
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9f4b1d'
+down_revision: Union[str, None] = '1251d8439e3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('repository_sync_states',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('repository_id', sa.Integer(), nullable=False, comment='Repository ID'),
+    sa.Column('branch', sa.String(), nullable=False, comment='Branch or tag name'),
+    sa.Column('last_commit_sha', sa.String(), nullable=False, comment='Last synced commit SHA'),
+    sa.Column('synced_at', sa.DateTime(), nullable=True, comment='Last sync timestamp'),
+    sa.ForeignKeyConstraint(['repository_id'], ['repositories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('repository_id', 'branch', name='uq_repository_sync_state_repository_branch')
+    )
+    op.create_index(op.f('ix_repository_sync_states_id'), 'repository_sync_states', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_repository_sync_states_id'), table_name='repository_sync_states')
+    op.drop_table('repository_sync_states')
@@ -4,6 +4,7 @@ API router for the application.
 
 from fastapi import APIRouter
 
+from doc_ai_helper_backend.api.endpoints.cache import router as cache_router
 from doc_ai_helper_backend.api.endpoints.documents import router as documents_router
 from doc_ai_helper_backend.api.endpoints.health import router as health_router
 from doc_ai_helper_backend.api.endpoints.search import router as search_router
@@ -19,3 +20,4 @@ router.include_router(documents_router, prefix="/documents")
 router.include_router(search_router, prefix="/search")
 router.include_router(llm_router, prefix="/llm")
 router.include_router(repositories_router)  # prefix already defined in router
+router.include_router(cache_router)  # prefix already defined in router
@@ -0,0 +1,224 @@
+"""
+Response compression middleware.
+
+Compresses complete text responses (documents, repository trees, JSON) with
+the best content coding the client accepts: Brotli or zstd when their
+modules are installed, gzip otherwise. Streamed responses such as SSE and
+NDJSON are passed through untouched so events are not held back.
+
+Compressed bodies of responses carrying an entity tag are cached in the
+application cache, so repeat views of hot documents are not recompressed.
+"""
+
+import asyncio
+import gzip
+import logging
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from doc_ai_helper_backend.services.cache import TieredCache
+
+try:
+    import brotli
+except ImportError:  # gzip is always available
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+# Media types sent as event streams; compressing them would buffer events
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson", "application/jsonl")
+
+# Bodies larger than this are compressed in a worker thread
+_THREAD_COMPRESS_MIN_BYTES = 256 * 1024
+
+
+def _compress_gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _compress_brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=5)
+
+
+def _compress_zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def available_encodings() -> Dict[str, Callable[[bytes], bytes]]:
+    """Get the supported content codings, most preferred first."""
+    encodings: Dict[str, Callable[[bytes], bytes]] = {}
+    if brotli is not None:
+        encodings["br"] = _compress_brotli
+    if zstandard is not None:
+        encodings["zstd"] = _compress_zstd
+    encodings["gzip"] = _compress_gzip
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str], supported: List[str]) -> Optional[str]:
+    """Choose a content coding from an Accept-Encoding header.
+
+    The coding with the highest q-value wins; ties go to the earlier entry of
+    ``supported``.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+        supported: Supported codings, most preferred first
+
+    Returns:
+        Optional[str]: Chosen coding, or None to send the identity coding
+    """
+    if not accept_encoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in supported:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Check whether a media type is worth compressing."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in STREAMING_MEDIA_TYPES:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type
+        in ("application/json", "application/javascript", "application/xml", "image/svg+xml")
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete text responses."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache: Optional[TieredCache] = None,
+        cache_ttl: Optional[int] = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smallest body in bytes worth compressing
+            cache: Cache for compressed bodies of responses with an ETag
+            cache_ttl: Time-to-live of cached compressed bodies in seconds
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), list(self.encodings)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type", ""))
+                ):
+                    # Includes SSE/NDJSON: forward immediately
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the start until the body shows whether it is complete
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streamed responses are forwarded chunk by chunk as produced
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            compressed = await self._compress(body, encoding, headers.get("etag"))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The encoded representation is no longer byte-identical
+                headers["ETag"] = f"W/{etag}"
+            passthrough = True
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        """Compress a body, reusing the cached result for its entity tag."""
+        cache_key = f"http:{encoding}:{etag}" if etag and self.cache is not None else None
+        if cache_key is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        compressor = self.encodings[encoding]
+        if len(body) >= _THREAD_COMPRESS_MIN_BYTES:
+            compressed = await asyncio.to_thread(compressor, body)
+        else:
+            compressed = compressor(body)
+
+        if cache_key is not None:
+            await self.cache.set(cache_key, compressed, ttl=self.cache_ttl)
+        return compressed
@@ -2,12 +2,22 @@
 API dependencies.
 """
 
-from typing import Callable
+import asyncio
+import logging
+from typing import Callable, Optional
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from doc_ai_helper_backend.services.cache import AssetCache, TieredCache
+from doc_ai_helper_backend.services.cache.snapshot import (
+    restore_snapshot,
+    save_snapshot,
+)
 from doc_ai_helper_backend.services.document import DocumentService
+from doc_ai_helper_backend.services.document.prefetch import LinkPrefetcher
+from doc_ai_helper_backend.services.document.sync import RepositorySyncEngine
+from doc_ai_helper_backend.services.document.warmup import RepositoryWarmer
 from doc_ai_helper_backend.services.llm import LLMServiceBase, LLMServiceFactory
 from doc_ai_helper_backend.services.llm.orchestrator import LLMOrchestrator
 from doc_ai_helper_backend.services.git.factory import GitServiceFactory
@@ -15,14 +25,178 @@ from doc_ai_helper_backend.services.repository_service import RepositoryService
 from doc_ai_helper_backend.db.database import get_db
 from doc_ai_helper_backend.core.config import settings
 
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+# Application-scoped cache shared by all requests (documents, structures and
+# LLM responses): a hot in-memory tier over a compressed on-disk tier
+_document_cache = TieredCache(
+    max_entries=settings.document_cache_max_entries,
+    default_ttl=settings.document_cache_ttl,
+    directory=settings.cache_dir,
+    namespace_budgets=settings.cache_namespace_budgets,
+    default_namespace_bytes=settings.cache_default_namespace_bytes,
+)
+
+# Background restore of the cache snapshot (started on application startup)
+_cache_restore_task: Optional[asyncio.Task] = None
+
+# Application-scoped link prefetcher (created on first use when enabled)
+_link_prefetcher: Optional[LinkPrefetcher] = None
+
+# Application-scoped repository warmer (created on first use when enabled)
+_repository_warmer: Optional[RepositoryWarmer] = None
+
+# Application-scoped asset disk cache (created on first use when enabled)
+_asset_cache: Optional[AssetCache] = None
+
+
+def get_document_cache() -> TieredCache:
+    """Get the application-scoped cache.
+
+    Returns:
+        TieredCache: Cache shared by documents, structures and LLM responses
+    """
+    return _document_cache
+
+
+def start_document_cache_restore() -> None:
+    """Restore the cache snapshot in the background, if snapshots are enabled.
+
+    Requests are served (cold) while the restore runs; restored entries
+    never overwrite entries cached in the meantime.
+    """
+    global _cache_restore_task
+    if settings.cache_snapshot_path and _cache_restore_task is None:
+        _cache_restore_task = asyncio.create_task(
+            restore_snapshot(
+                _document_cache, settings.cache_snapshot_path, settings.app_version
+            )
+        )
+        _cache_restore_task.add_done_callback(_log_restore_failure)
+
+
+def _log_restore_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Cache snapshot restore failed: {task.exception()}")
+
+
+async def shutdown_document_cache() -> None:
+    """Snapshot the application cache, if enabled, and release its disk tier."""
+    global _cache_restore_task
+    restore_pending = _cache_restore_task is not None and not _cache_restore_task.done()
+    if restore_pending:
+        _cache_restore_task.cancel()
+        await asyncio.gather(_cache_restore_task, return_exceptions=True)
+    _cache_restore_task = None
+
+    # Keep the previous snapshot if it was never restored
+    if settings.cache_snapshot_path and not restore_pending:
+        try:
+            saved = save_snapshot(
+                _document_cache, settings.cache_snapshot_path, settings.app_version
+            )
+            logger.info(f"Saved {saved} cache entries to {settings.cache_snapshot_path}")
+        except Exception as e:
+            logger.warning(f"Cache snapshot failed: {e}")
+    _document_cache.close()
+
 
 def get_document_service() -> DocumentService:
     """Get document service instance.
 
     Returns:
-        DocumentService: Document service instance
+        DocumentService: Document service instance backed by the shared cache
+    """
+    cache_service = _document_cache if settings.document_cache_ttl > 0 else None
+    return DocumentService(cache_service=cache_service)
+
+
+def get_repository_sync_engine() -> RepositorySyncEngine:
+    """Get the incremental repository sync engine.
+
+    Returns:
+        RepositorySyncEngine: Sync engine backed by the shared document cache
+    """
+    return RepositorySyncEngine(
+        get_document_service(),
+        max_changed_paths=settings.repository_sync_max_changed_paths,
+        max_documents=settings.repository_index_max_documents,
+    )
+
+
+def get_link_prefetcher() -> Optional[LinkPrefetcher]:
+    """Get the linked document prefetcher.
+
+    Returns:
+        Optional[LinkPrefetcher]: Prefetcher instance, or None if prefetch is
+        disabled or there is no document cache to prefetch into
+    """
+    global _link_prefetcher
+    if not settings.enable_link_prefetch or settings.document_cache_ttl <= 0:
+        return None
+    if _link_prefetcher is None:
+        _link_prefetcher = LinkPrefetcher(
+            get_document_service(),
+            max_concurrency_per_repo=settings.link_prefetch_concurrency,
+            max_links_per_document=settings.link_prefetch_max_links,
+            cooldown_seconds=settings.link_prefetch_cooldown,
+        )
+    return _link_prefetcher
+
+
+async def shutdown_link_prefetcher() -> None:
+    """Cancel pending prefetches on application shutdown."""
+    global _link_prefetcher
+    if _link_prefetcher is not None:
+        await _link_prefetcher.close()
+        _link_prefetcher = None
+
+
+def get_repository_warmer() -> Optional[RepositoryWarmer]:
+    """Get the repository warmer.
+
+    Returns:
+        Optional[RepositoryWarmer]: Warmer instance, or None if warm-up is
+        disabled or there is no document cache to warm
+    """
+    global _repository_warmer
+    if not settings.enable_repository_warmup or settings.document_cache_ttl <= 0:
+        return None
+    if _repository_warmer is None:
+        _repository_warmer = RepositoryWarmer(
+            get_document_service(),
+            max_concurrent_repositories=settings.repository_warmup_concurrency,
+            cooldown_seconds=settings.link_prefetch_cooldown,
+        )
+    return _repository_warmer
+
+
+async def shutdown_repository_warmer() -> None:
+    """Cancel scheduled and pending warm-ups on application shutdown."""
+    global _repository_warmer
+    if _repository_warmer is not None:
+        await _repository_warmer.close()
+        _repository_warmer = None
+
+
+def get_asset_cache() -> Optional[AssetCache]:
+    """Get the asset disk cache used by the asset proxy.
+
+    Returns:
+        Optional[AssetCache]: Asset cache, or None if the asset proxy is
+        disabled or has no cache budget
     """
-    return DocumentService()
+    global _asset_cache
+    if not settings.enable_asset_proxy or settings.asset_cache_max_bytes <= 0:
+        return None
+    if _asset_cache is None:
+        _asset_cache = AssetCache(
+            settings.asset_cache_dir,
+            max_bytes=settings.asset_cache_max_bytes,
+            max_entry_bytes=settings.asset_cache_max_entry_bytes,
+        )
+    return _asset_cache
 
 
 def get_llm_service() -> LLMServiceBase:
@@ -46,9 +220,9 @@ def get_llm_service() -> LLMServiceBase:
     elif provider == "gemini":
         config["api_key"] = settings.gemini_api_key
 
-    # Create service instance with MCP integration
+    # Reuse the application-scoped instance for this configuration
     # If API keys are missing, the factory will raise an appropriate error
-    return LLMServiceFactory.create(provider, **config)
+    return LLMServiceFactory.get_shared(provider, enable_mcp=False, **config)
 
 
 def get_git_service_factory() -> GitServiceFactory:
@@ -66,10 +240,8 @@ def get_llm_orchestrator() -> LLMOrchestrator:
     Returns:
         LLMOrchestrator: LLMOrchestrator instance
     """
-    # 簡単なdictベースのキャッシュサービスを提供
-    # 本格的なキャッシュが必要な場合は、Redis等を使用
-    cache_service = {}
-    return LLMOrchestrator(cache_service)
+    # アプリケーション共有キャッシュ（"llm:" 名前空間）を使用
+    return LLMOrchestrator(_document_cache)
 
 
 def get_llm_orchestrator_with_document_service(
@@ -83,9 +255,8 @@ def get_llm_orchestrator_with_document_service(
     Returns:
         LLMOrchestrator: LLMOrchestrator instance with DocumentService
     """
-    # 簡単なdictベースのキャッシュサービスを提供
-    cache_service = {}
-    orchestrator = LLMOrchestrator(cache_service)
+    # アプリケーション共有キャッシュ（"llm:" 名前空間）を使用
+    orchestrator = LLMOrchestrator(_document_cache)
     orchestrator.document_service = document_service
     return orchestrator
 
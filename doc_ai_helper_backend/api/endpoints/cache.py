@@ -0,0 +1,133 @@
+"""
+Cache administration API endpoints.
+
+Report statistics of the application cache and purge entries by repository
+or key prefix. Available only when the cache administration feature flag is
+enabled.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from doc_ai_helper_backend.api.dependencies import get_document_cache
+from doc_ai_helper_backend.core.config import settings
+from doc_ai_helper_backend.models.cache import (
+    CachePurgeResponse,
+    CacheStatsResponse,
+    NamespaceCacheStats,
+)
+from doc_ai_helper_backend.services.cache import TieredCache
+from doc_ai_helper_backend.services.document import DocumentService
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+# Router
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+def _check_feature_enabled():
+    """Check if cache administration is enabled."""
+    if not settings.enable_cache_admin:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cache administration feature is not enabled",
+        )
+
+
+@router.get(
+    "/stats",
+    response_model=CacheStatsResponse,
+    summary="Get cache statistics",
+    description="Get per-namespace statistics of the application cache",
+)
+async def get_cache_stats(cache: TieredCache = Depends(get_document_cache)):
+    """
+    Get per-namespace statistics of the application cache.
+
+    Args:
+        cache: Application cache
+
+    Returns:
+        CacheStatsResponse: Entry counts, sizes, hit/miss/eviction counters
+        and oldest entry age per key namespace
+
+    Raises:
+        HTTPException: If the feature is disabled
+    """
+    _check_feature_enabled()
+
+    namespaces = {}
+    for namespace, stats in sorted(cache.stats().items()):
+        lookups = stats["hits"] + stats["misses"]
+        namespaces[namespace] = NamespaceCacheStats(
+            **stats, hit_rate=stats["hits"] / lookups if lookups else None
+        )
+    return CacheStatsResponse(
+        total_entries=sum(s.hot_entries + s.warm_entries for s in namespaces.values()),
+        hot_max_entries=cache.max_entries,
+        namespaces=namespaces,
+    )
+
+
+@router.delete(
+    "/entries",
+    response_model=CachePurgeResponse,
+    summary="Purge cache entries",
+    description="Purge cached documents and structures of a repository, or entries by key prefix",
+)
+async def purge_cache_entries(
+    service: Optional[str] = Query(default=None, description="Git service"),
+    owner: Optional[str] = Query(default=None, description="Repository owner"),
+    repo: Optional[str] = Query(default=None, description="Repository name"),
+    ref: Optional[str] = Query(default=None, description="Branch or tag name"),
+    prefix: Optional[str] = Query(
+        default=None, description="Key prefix, e.g. 'document:github:octocat:'"
+    ),
+    cache: TieredCache = Depends(get_document_cache),
+):
+    """
+    Purge cache entries.
+
+    Repository filters match the document, missing-document and structure
+    keys of ``DocumentService``; a key prefix matches any key. When both are
+    given, an entry must match both.
+
+    Args:
+        service: Git service, None matches any
+        owner: Repository owner, None matches any
+        repo: Repository name, None matches any
+        ref: Branch or tag name, None matches any
+        prefix: Key prefix
+        cache: Application cache
+
+    Returns:
+        CachePurgeResponse: Number of entries deleted
+
+    Raises:
+        HTTPException: If the feature is disabled or no filter is given
+    """
+    _check_feature_enabled()
+
+    repository_filter = any(value is not None for value in (service, owner, repo, ref))
+    if not repository_filter and not prefix:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one of service, owner, repo, ref or prefix is required",
+        )
+
+    def matches(key: str) -> bool:
+        if prefix and not key.startswith(prefix):
+            return False
+        return not repository_filter or DocumentService.cache_key_matches(
+            key, service, owner, repo, ref
+        )
+
+    deleted = cache.delete_where(matches)
+    logger.info(
+        f"Purged {deleted} cache entries (service={service}, owner={owner}, "
+        f"repo={repo}, ref={ref}, prefix={prefix})"
+    )
+    return CachePurgeResponse(deleted=deleted)
@@ -3,17 +3,44 @@ Document-related API endpoints.
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Set
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Header, Path, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from doc_ai_helper_backend.api.dependencies import get_document_service
-from doc_ai_helper_backend.core.exceptions import NotFoundException
+from doc_ai_helper_backend.api.dependencies import (
+    get_asset_cache,
+    get_document_service,
+    get_link_prefetcher,
+)
+from doc_ai_helper_backend.api.http_cache import (
+    cache_headers,
+    document_etag,
+    not_modified,
+    structure_etag,
+)
+from doc_ai_helper_backend.api.range_responses import (
+    build_stream_response,
+    etag_matches,
+    guess_media_type,
+)
+from doc_ai_helper_backend.core.exceptions import BadRequestException, NotFoundException
 from doc_ai_helper_backend.models.document import (
     DocumentResponse,
     RepositoryStructureResponse,
 )
+from doc_ai_helper_backend.models.link_graph import (
+    BacklinksResponse,
+    BrokenLinksResponse,
+)
+from doc_ai_helper_backend.services.cache import AssetCache
+from doc_ai_helper_backend.services.cache.asset_cache import AssetTooLargeError
 from doc_ai_helper_backend.services.document import DocumentService
+from doc_ai_helper_backend.services.document.prefetch import LinkPrefetcher
+from doc_ai_helper_backend.services.git.raw_stream import (
+    RawFileStream,
+    parse_range_header,
+)
 
 # Logger
 logger = logging.getLogger("doc_ai_helper")
@@ -21,6 +48,36 @@ logger = logging.getLogger("doc_ai_helper")
 # Router
 router = APIRouter(tags=["documents"])
 
+# DocumentResponse fields that can be selected with ``fields=``
+SELECTABLE_DOCUMENT_FIELDS = {"content", "transformed_content", "links", "metadata"}
+
+# DocumentResponse fields that are always returned
+DOCUMENT_IDENTITY_FIELDS = {"path", "name", "type", "repository", "owner", "service", "ref"}
+
+
+def _parse_document_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Parse the ``fields`` query parameter.
+
+    Args:
+        fields: Comma-separated field names
+
+    Returns:
+        Optional[Set[str]]: Selected fields, or None for the full response
+
+    Raises:
+        BadRequestException: If an unknown field is requested
+    """
+    if fields is None:
+        return None
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - SELECTABLE_DOCUMENT_FIELDS
+    if unknown:
+        raise BadRequestException(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Selectable fields: {', '.join(sorted(SELECTABLE_DOCUMENT_FIELDS))}"
+        )
+    return selected
+
 
 @router.get(
     "/contents/{service}/{owner}/{repo}/{path:path}",
@@ -29,6 +86,7 @@ router = APIRouter(tags=["documents"])
     description="Get document from a Git repository",
 )
 async def get_document(
+    response: Response,
     service: str = Path(..., description="Git service (github, forgejo, mock)"),
     owner: str = Path(..., description="Repository owner"),
     repo: str = Path(..., description="Repository name"),
@@ -43,12 +101,22 @@ async def get_document(
     root_path: Optional[str] = Query(
         default=None, description="Root directory path for link resolution"
     ),
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Comma-separated fields to return besides the document identity: "
+            "content, transformed_content, links, metadata. Default is all"
+        ),
+    ),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
     document_service: DocumentService = Depends(get_document_service),
+    prefetcher: Optional[LinkPrefetcher] = Depends(get_link_prefetcher),
 ):
     """
     Get document from a Git repository.
 
     Args:
+        response: Response used to set caching headers
         service: Git service type (github, forgejo, mock)
         owner: Repository owner
         repo: Repository name
@@ -57,20 +125,31 @@ async def get_document(
         transform_links: Whether to transform relative links to absolute. Default is True
         base_url: Base URL for link transformation. If None, will be constructed from request parameters
         root_path: Root directory path for link resolution. If specified, relative links are resolved from this directory
+        fields: Comma-separated fields to return. Link transformation and link
+            extraction are skipped when their fields are not requested
+        if_none_match: HTTP If-None-Match header
         document_service: Document service instance
+        prefetcher: Linked document prefetcher, None when disabled
 
     Returns:
-        DocumentResponse: Document data
+        DocumentResponse: Document data (only the selected fields), or 304 if
+        the client's copy is current
 
     Raises:
         NotFoundException: If document is not found
         GitServiceException: If there is an error with the Git service
+        BadRequestException: If an unknown field is requested
     """
     # Allow GitHub, Forgejo, and Mock services
     if service.lower() not in ["github", "forgejo", "mock"]:
         raise NotFoundException(f"Unsupported Git service: {service}")
 
-    return await document_service.get_document(
+    selected = _parse_document_fields(fields)
+    if selected is not None:
+        # Don't compute what the client does not want
+        transform_links = transform_links and "transformed_content" in selected
+
+    document = await document_service.get_document(
         service,
         owner,
         repo,
@@ -79,7 +158,174 @@ async def get_document(
         transform_links=transform_links,
         base_url=base_url,
         root_path=root_path,
+        extract_links=selected is None or "links" in selected,
+    )
+
+    # Schedule low-priority prefetch of linked documents (runs in the background)
+    if prefetcher is not None:
+        prefetcher.schedule(document, root_path)
+
+    etag = document_etag(document, transform_links, root_path, selected)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+    if selected is not None:
+        return JSONResponse(
+            content=document.model_dump(
+                mode="json", include=DOCUMENT_IDENTITY_FIELDS | selected
+            ),
+            headers=cache_headers(etag),
+        )
+    response.headers.update(cache_headers(etag))
+    return document
+
+
+@router.get(
+    "/raw/{service}/{owner}/{repo}/{path:path}",
+    response_class=StreamingResponse,
+    summary="Stream raw document",
+    description="Stream the raw content of a file in chunks, with HTTP Range support",
+    responses={206: {"description": "Partial content"}, 416: {"description": "Range not satisfiable"}},
+)
+async def get_raw_document(
+    service: str = Path(..., description="Git service (github, forgejo, mock)"),
+    owner: str = Path(..., description="Repository owner"),
+    repo: str = Path(..., description="Repository name"),
+    path: str = Path(..., description="File path"),
+    ref: Optional[str] = Query(default="main", description="Branch or tag name"),
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    document_service: DocumentService = Depends(get_document_service),
+):
+    """
+    Stream the raw content of a file.
+
+    Unlike the contents endpoint, the file is neither processed nor loaded
+    into memory, so large generated HTML or data-heavy Markdown can be
+    served in chunks. A single byte range may be requested with the Range
+    header.
+
+    Args:
+        service: Git service type (github, forgejo, mock)
+        owner: Repository owner
+        repo: Repository name
+        path: File path
+        ref: Branch or tag name. Default is "main"
+        range_header: HTTP Range header
+        document_service: Document service instance
+
+    Returns:
+        StreamingResponse: Raw file content (200 or 206), or 416 for an
+        unsatisfiable range
+
+    Raises:
+        NotFoundException: If the file is not found
+        GitServiceException: If there is an error with the Git service
+    """
+    # Allow GitHub, Forgejo, and Mock services
+    if service.lower() not in ["github", "forgejo", "mock"]:
+        raise NotFoundException(f"Unsupported Git service: {service}")
+
+    byte_range = parse_range_header(range_header)
+    stream = await document_service.open_raw_stream(
+        service, owner, repo, path, ref, byte_range
+    )
+    return await build_stream_response(stream, byte_range, guess_media_type(path))
+
+
+@router.get(
+    "/assets/{service}/{owner}/{repo}/{path:path}",
+    response_class=StreamingResponse,
+    summary="Get asset",
+    description="Serve a repository asset through a disk cache keyed by blob SHA",
+    responses={
+        206: {"description": "Partial content"},
+        304: {"description": "Not modified"},
+        416: {"description": "Range not satisfiable"},
+    },
+)
+async def get_asset(
+    service: str = Path(..., description="Git service (github, forgejo, mock)"),
+    owner: str = Path(..., description="Repository owner"),
+    repo: str = Path(..., description="Repository name"),
+    path: str = Path(..., description="Asset path"),
+    ref: Optional[str] = Query(default="main", description="Branch or tag name"),
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    document_service: DocumentService = Depends(get_document_service),
+    asset_cache: Optional[AssetCache] = Depends(get_asset_cache),
+):
+    """
+    Serve a repository asset such as an image referenced from a document.
+
+    The asset's blob SHA, looked up in the cached repository tree, is its
+    entity tag and its disk cache key, so repeat requests are answered with
+    304 or from disk without contacting the Git service. Assets missing from
+    the tree, or too large for the cache, are streamed through uncached.
+
+    Args:
+        service: Git service type (github, forgejo, mock)
+        owner: Repository owner
+        repo: Repository name
+        path: Asset path
+        ref: Branch or tag name. Default is "main"
+        range_header: HTTP Range header
+        if_none_match: HTTP If-None-Match header
+        document_service: Document service instance
+        asset_cache: Asset disk cache, None when disabled
+
+    Returns:
+        StreamingResponse: Asset content (200 or 206), 304 if the client's
+        copy is current, or 416 for an unsatisfiable range
+
+    Raises:
+        NotFoundException: If the asset is not found
+        GitServiceException: If there is an error with the Git service
+    """
+    # Allow GitHub, Forgejo, and Mock services
+    if service.lower() not in ["github", "forgejo", "mock"]:
+        raise NotFoundException(f"Unsupported Git service: {service}")
+
+    path = path.lstrip("/")
+    byte_range = parse_range_header(range_header)
+    media_type = guess_media_type(path)
+    sha = await document_service.get_blob_sha(service, owner, repo, path, ref)
+    if sha is None:
+        stream = await document_service.open_raw_stream(
+            service, owner, repo, path, ref, byte_range
+        )
+        return await build_stream_response(stream, byte_range, media_type)
+
+    # Repository visibility is not known here, so shared caches must not
+    # store the asset: private repositories' content would leak to others
+    etag = f'"{sha}"'
+    headers = cache_headers(etag)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if asset_cache is not None:
+        cached_path = asset_cache.get(service, owner, repo, sha)
+        if cached_path is None:
+            stream = await document_service.open_raw_stream(service, owner, repo, path, ref)
+            try:
+                if (
+                    stream.content_length is None
+                    or stream.content_length <= asset_cache.max_entry_bytes
+                ):
+                    cached_path = await asset_cache.put(
+                        service, owner, repo, sha, stream.iter_chunks()
+                    )
+            except AssetTooLargeError:
+                logger.debug(f"Asset too large to cache: {service}/{owner}/{repo}/{path}")
+            finally:
+                await stream.aclose()
+        if cached_path is not None:
+            stream = RawFileStream.from_file(cached_path, byte_range, etag=etag)
+            return await build_stream_response(stream, byte_range, media_type, headers)
+
+    stream = await document_service.open_raw_stream(
+        service, owner, repo, path, ref, byte_range
     )
+    return await build_stream_response(stream, byte_range, media_type, headers)
 
 
 @router.get(
@@ -89,26 +335,31 @@ async def get_document(
     description="Get structure of a Git repository",
 )
 async def get_repository_structure(
+    response: Response,
     service: str = Path(..., description="Git service (github, forgejo, mock)"),
     owner: str = Path(..., description="Repository owner"),
     repo: str = Path(..., description="Repository name"),
     ref: Optional[str] = Query(default="main", description="Branch or tag name"),
     path: Optional[str] = Query(default="", description="Path prefix to filter by"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
     document_service: DocumentService = Depends(get_document_service),
 ):
     """
     Get structure of a Git repository.
 
     Args:
+        response: Response used to set caching headers
         service: Git service type (github, forgejo, mock)
         owner: Repository owner
         repo: Repository name
         ref: Branch or tag name. Default is "main"
         path: Path prefix to filter by. Default is ""
+        if_none_match: HTTP If-None-Match header
         document_service: Document service instance
 
     Returns:
-        RepositoryStructureResponse: Repository structure data
+        RepositoryStructureResponse: Repository structure data, or 304 if the
+        client's copy is current
 
     Raises:
         NotFoundException: If repository is not found
@@ -118,6 +369,88 @@ async def get_repository_structure(
     if service.lower() not in ["github", "forgejo", "mock"]:
         raise NotFoundException(f"Unsupported Git service: {service}")
 
-    return await document_service.get_repository_structure(
+    structure = await document_service.get_repository_structure(
         service, owner, repo, ref, path
     )
+
+    etag = structure_etag(structure)
+    cached = not_modified(if_none_match, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(cache_headers(etag))
+    return structure
+
+
+@router.get(
+    "/links/{service}/{owner}/{repo}/backlinks/{path:path}",
+    response_model=BacklinksResponse,
+    summary="Get backlinks",
+    description="Get documents linking to a path, from the link graph of processed documents",
+)
+async def get_backlinks(
+    service: str = Path(..., description="Git service (github, forgejo, mock)"),
+    owner: str = Path(..., description="Repository owner"),
+    repo: str = Path(..., description="Repository name"),
+    path: str = Path(..., description="Target document path"),
+    ref: Optional[str] = Query(default="main", description="Branch or tag name"),
+    document_service: DocumentService = Depends(get_document_service),
+):
+    """
+    Get documents linking to a path.
+
+    Args:
+        service: Git service type (github, forgejo, mock)
+        owner: Repository owner
+        repo: Repository name
+        path: Target document path
+        ref: Branch or tag name. Default is "main"
+        document_service: Document service instance
+
+    Returns:
+        BacklinksResponse: Backlinks of the target path
+
+    Raises:
+        NotFoundException: If the Git service is not supported
+    """
+    # Allow GitHub, Forgejo, and Mock services
+    if service.lower() not in ["github", "forgejo", "mock"]:
+        raise NotFoundException(f"Unsupported Git service: {service}")
+
+    return await document_service.get_backlinks(service, owner, repo, path, ref)
+
+
+@router.get(
+    "/links/{service}/{owner}/{repo}/broken",
+    response_model=BrokenLinksResponse,
+    summary="Get broken links",
+    description="Get internal links whose target does not exist in the repository",
+)
+async def get_broken_links(
+    service: str = Path(..., description="Git service (github, forgejo, mock)"),
+    owner: str = Path(..., description="Repository owner"),
+    repo: str = Path(..., description="Repository name"),
+    ref: Optional[str] = Query(default="main", description="Branch or tag name"),
+    document_service: DocumentService = Depends(get_document_service),
+):
+    """
+    Get broken internal links of a repository.
+
+    Args:
+        service: Git service type (github, forgejo, mock)
+        owner: Repository owner
+        repo: Repository name
+        ref: Branch or tag name. Default is "main"
+        document_service: Document service instance
+
+    Returns:
+        BrokenLinksResponse: Broken internal links
+
+    Raises:
+        NotFoundException: If repository is not found
+        GitServiceException: If there is an error with the Git service
+    """
+    # Allow GitHub, Forgejo, and Mock services
+    if service.lower() not in ["github", "forgejo", "mock"]:
+        raise NotFoundException(f"Unsupported Git service: {service}")
+
+    return await document_service.get_broken_links(service, owner, repo, ref)
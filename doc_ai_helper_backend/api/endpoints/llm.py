@@ -19,16 +19,20 @@ from doc_ai_helper_backend.models.llm import (
     MCPToolInfo,
     ToolParameter,
     ProviderCapabilities,
+    StreamMetricsResponse,
 )
 from doc_ai_helper_backend.services.llm.base import LLMServiceBase
 from doc_ai_helper_backend.services.llm.factory import LLMServiceFactory
 from doc_ai_helper_backend.services.llm.orchestrator import LLMOrchestrator
+from doc_ai_helper_backend.services.llm.stream_metrics import stream_metrics
 from doc_ai_helper_backend.core.exceptions import (
     LLMServiceException,
     ServiceNotFoundError,
     TemplateNotFoundError,
     TemplateSyntaxError,
 )
+from doc_ai_helper_backend.api.stream_coalescing import coalesce_stream_events
+from doc_ai_helper_backend.core.config import settings
 from doc_ai_helper_backend.api.dependencies import get_llm_service, get_llm_orchestrator, get_llm_orchestrator_with_document_service
 # Legacy imports - functionality now integrated into orchestrator
 
@@ -332,9 +336,21 @@ async def stream_llm_response(
             # Validate request parameters
             # Request validation handled by orchestrator
             
-            # Execute streaming query using new infrastructure
-            async for chunk in orchestrator.execute_streaming_query(request):
-                yield json.dumps(chunk)
+            # Execute streaming query using new infrastructure. Content is
+            # merged into fewer SSE events; on client disconnect the response
+            # task is cancelled and closing the stream propagates that to the
+            # provider connection.
+            stream = coalesce_stream_events(
+                orchestrator.execute_streaming_query(request),
+                max_chars=settings.llm_stream_coalesce_chars,
+                max_delay=settings.llm_stream_coalesce_ms / 1000,
+                buffer_size=settings.llm_stream_buffer_size,
+            )
+            try:
+                async for data in stream:
+                    yield data
+            finally:
+                await stream.aclose()
 
         except ValidationError as e:
             logger.warning(f"Request validation failed: {e}")
@@ -353,6 +369,22 @@ async def stream_llm_response(
     return EventSourceResponse(event_generator())
 
 
+@router.get(
+    "/stream/metrics",
+    response_model=StreamMetricsResponse,
+    summary="Get streaming metrics",
+    description="Get counts of completed, cancelled and failed streams and the tokens saved by cancelling",
+)
+async def get_stream_metrics():
+    """
+    Get streaming query metrics.
+
+    Returns:
+        StreamMetricsResponse: Stream outcome counts and token estimates
+    """
+    return StreamMetricsResponse(**stream_metrics.snapshot())
+
+
 @router.get(
     "/tools",
     response_model=MCPToolsResponse,
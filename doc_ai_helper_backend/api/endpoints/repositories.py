@@ -6,19 +6,26 @@ and delegation pattern for RepositoryContext creation.
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from ...core.config import settings
-from ...core.exceptions import RepositoryServiceException
-from ...api.dependencies import get_repository_service
+from ...core.exceptions import BaseAPIException, RepositoryServiceException
+from ...api.dependencies import (
+    get_repository_service,
+    get_repository_sync_engine,
+    get_repository_warmer,
+)
+from ...models.document import RepositorySyncResult
 from ...models.repository import (
     RepositoryCreate,
     RepositoryResponse,
     RepositoryUpdate,
 )
 from ...models.repository_context import RepositoryContext
+from ...services.document.sync import RepositorySyncEngine
+from ...services.document.warmup import RepositoryWarmer
 from ...services.repository_service import RepositoryService
 
 logger = logging.getLogger(__name__)
@@ -90,6 +97,7 @@ async def list_repositories(
 async def create_repository(
     repository_data: RepositoryCreate,
     repository_service: RepositoryService = Depends(get_repository_service),
+    warmer: Optional[RepositoryWarmer] = Depends(get_repository_warmer),
 ):
     """
     Create a new repository.
@@ -97,6 +105,7 @@ async def create_repository(
     Args:
         repository_data: Repository creation data
         repository_service: Repository service dependency
+        warmer: Repository warmer, None when warm-up is disabled
         
     Returns:
         Created repository response
@@ -111,6 +120,17 @@ async def create_repository(
         logger.info(
             f"Created repository: {repository.service_type}/{repository.owner}/{repository.name} (ID: {repository.id})"
         )
+
+        # Warm caches in the background so the first user hits a hot cache
+        if warmer is not None:
+            warmer.schedule(
+                repository.service_type.value,
+                repository.owner,
+                repository.name,
+                repository.default_branch,
+                repository.root_path,
+            )
+
         return repository
         
     except RepositoryServiceException as e:
@@ -344,4 +364,82 @@ async def get_repository_context(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/{repository_id}/sync", response_model=RepositorySyncResult)
+async def sync_repository(
+    repository_id: int,
+    branch: Optional[str] = None,
+    repository_service: RepositoryService = Depends(get_repository_service),
+    sync_engine: RepositorySyncEngine = Depends(get_repository_sync_engine),
+):
+    """
+    Sync repository caches to the head of a branch.
+    
+    Only paths changed since the last synced commit are refreshed; the new
+    head commit is recorded for the next sync. Suitable as a push webhook
+    target.
+    
+    Args:
+        repository_id: Repository ID
+        branch: Branch name (optional, defaults to repository's default_branch)
+        repository_service: Repository service dependency
+        sync_engine: Repository sync engine dependency
+        
+    Returns:
+        Sync result with the refreshed and removed paths
+        
+    Raises:
+        HTTPException: If feature is disabled, repository not found, or sync fails
+    """
+    _check_feature_enabled()
+    
+    if repository_id <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Repository ID must be a positive integer"
+        )
+    
+    try:
+        repository = await repository_service.get_repository(repository_id)
+        
+        if not repository:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Repository with ID {repository_id} not found"
+            )
+        
+        ref = branch or repository.default_branch
+        last_commit = await repository_service.get_last_synced_commit(repository_id, ref)
+        result = await sync_engine.sync(
+            repository.service_type.value,
+            repository.owner,
+            repository.name,
+            ref,
+            root_path=repository.root_path,
+            last_commit=last_commit,
+        )
+        if result.current_commit != last_commit:
+            await repository_service.record_sync(repository_id, ref, result.current_commit)
+        
+        logger.info(
+            f"Synced repository {repository_id}@{ref} ({result.mode}): "
+            f"{len(result.refreshed)} refreshed, {len(result.removed)} removed"
+        )
+        return result
+        
+    except HTTPException:
+        raise
+    except RepositoryServiceException as e:
+        logger.error(f"Failed to sync repository {repository_id}: {e}")
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except BaseAPIException as e:
+        logger.error(f"Git service error syncing repository {repository_id}: {e}")
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        logger.error(f"Unexpected error syncing repository {repository_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
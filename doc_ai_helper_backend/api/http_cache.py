@@ -0,0 +1,104 @@
+"""
+HTTP caching for API responses.
+
+Document and structure responses carry strong entity tags derived from the
+blob/tree SHAs and the parameters that shape the response, so clients can
+revalidate with If-None-Match and receive a bodiless 304 for repeat views.
+"""
+
+import hashlib
+from typing import Dict, Optional, Set
+
+from fastapi import Response, status
+
+from doc_ai_helper_backend.api.range_responses import etag_matches
+from doc_ai_helper_backend.core.config import settings
+from doc_ai_helper_backend.models.document import (
+    DocumentResponse,
+    RepositoryStructureResponse,
+)
+
+
+def _etag(*parts: object) -> str:
+    """Build a strong entity tag from response-shaping values."""
+    digest = hashlib.blake2b(digest_size=16)
+    # The app version covers changes to document processing itself
+    for part in (settings.app_version, *parts):
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def document_etag(
+    document: DocumentResponse,
+    transform_links: bool = True,
+    root_path: Optional[str] = None,
+    fields: Optional[Set[str]] = None,
+) -> str:
+    """Build the entity tag of a document response.
+
+    Args:
+        document: Document response
+        transform_links: Whether links were transformed
+        root_path: Root directory path used for link resolution
+        fields: Selected response fields, None for the full response
+
+    Returns:
+        str: Quoted strong entity tag
+    """
+    content_id = document.metadata.sha or hashlib.sha1(
+        document.content.content.encode("utf-8")
+    ).hexdigest()
+    return _etag(
+        document.service,
+        document.owner,
+        document.repository,
+        document.path,
+        document.ref,
+        content_id,
+        transform_links,
+        root_path or None,
+        # Changes where image links point to
+        settings.enable_asset_proxy,
+        sorted(fields) if fields is not None else None,
+    )
+
+
+def structure_etag(structure: RepositoryStructureResponse) -> str:
+    """Build the entity tag of a repository structure response.
+
+    Args:
+        structure: Repository structure response
+
+    Returns:
+        str: Quoted strong entity tag
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for item in structure.tree:
+        digest.update(f"{item.path}\0{item.type}\0{item.sha}\n".encode("utf-8"))
+    return _etag(
+        structure.service, structure.owner, structure.repo, structure.ref, digest.hexdigest()
+    )
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """Build the caching headers of a revalidatable response."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.http_cache_max_age}, must-revalidate",
+    }
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """Build a 304 response if the client's copy is current.
+
+    Args:
+        if_none_match: If-None-Match request header
+        etag: Current entity tag
+
+    Returns:
+        Optional[Response]: 304 response, or None if the full response is needed
+    """
+    if not etag_matches(if_none_match, etag):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
@@ -0,0 +1,147 @@
+"""
+Streaming responses with HTTP Range support.
+"""
+
+import mimetypes
+from typing import AsyncGenerator, AsyncIterator, Dict, Optional
+
+from fastapi import Response, status
+from fastapi.responses import StreamingResponse
+
+from doc_ai_helper_backend.services.git.raw_stream import (
+    ByteRangeSpec,
+    RangeNotSatisfiableError,
+    RawFileStream,
+    resolve_range,
+)
+
+# Served files are untrusted repository content
+UNTRUSTED_CONTENT_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "Content-Security-Policy": "sandbox",
+}
+
+
+def guess_media_type(path: str) -> str:
+    """Guess the media type of a repository file from its extension.
+
+    Args:
+        path: File path
+
+    Returns:
+        str: Media type, with a UTF-8 charset for text types
+    """
+    if path.lower().endswith((".md", ".markdown", ".qmd")):
+        return "text/markdown; charset=utf-8"
+    media_type, _ = mimetypes.guess_type(path)
+    if media_type is None:
+        return "application/octet-stream"
+    if media_type.startswith("text/"):
+        return f"{media_type}; charset=utf-8"
+    return media_type
+
+
+async def _slice_chunks(
+    chunks: AsyncGenerator[bytes, None], first: int, last: int
+) -> AsyncIterator[bytes]:
+    """Yield only bytes first..last (inclusive) of a chunk stream."""
+    position = 0
+    try:
+        async for chunk in chunks:
+            chunk_end = position + len(chunk)
+            if chunk_end > first and position <= last:
+                yield chunk[max(first - position, 0) : last - position + 1]
+            position = chunk_end
+            if position > last:
+                break
+    finally:
+        # Stop reading upstream as soon as the range is complete
+        await chunks.aclose()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag.
+
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+
+    Args:
+        if_none_match: If-None-Match header value
+        etag: Current entity tag (quoted)
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def range_not_satisfiable(total_size: int) -> Response:
+    """Build a 416 response for a content of the given size."""
+    return Response(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        headers={"Content-Range": f"bytes */{total_size}", "Accept-Ranges": "bytes"},
+    )
+
+
+async def build_stream_response(
+    stream: RawFileStream,
+    byte_range: Optional[ByteRangeSpec],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Build a streaming response honouring a requested byte range.
+
+    Ranges already applied upstream are passed through. If the upstream
+    ignored the range, it is applied locally when the full size is known;
+    otherwise the full content is served with 200, as RFC 9110 allows.
+
+    Args:
+        stream: Open raw content stream
+        byte_range: Requested byte range, if any
+        media_type: Response media type
+        headers: Extra response headers
+
+    Returns:
+        Response: 200, 206 or 416 response
+    """
+    response_headers = {"Accept-Ranges": "bytes", **UNTRUSTED_CONTENT_HEADERS}
+    response_headers.update(stream.headers)
+    if stream.etag:
+        response_headers["ETag"] = stream.etag
+    response_headers.update(headers or {})
+
+    chunks = stream.iter_chunks()
+    status_code = status.HTTP_200_OK
+    length = stream.content_length
+
+    if stream.status_code == status.HTTP_206_PARTIAL_CONTENT and stream.content_range:
+        first, last, total = stream.content_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        response_headers["Content-Range"] = f"bytes {first}-{last}/{'*' if total is None else total}"
+        length = last - first + 1
+    elif byte_range is not None and stream.total_size is not None:
+        try:
+            first, last = resolve_range(byte_range, stream.total_size)
+        except RangeNotSatisfiableError as e:
+            await stream.aclose()
+            return range_not_satisfiable(e.total_size)
+        chunks = _slice_chunks(chunks, first, last)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        response_headers["Content-Range"] = f"bytes {first}-{last}/{stream.total_size}"
+        length = last - first + 1
+
+    if length is not None:
+        response_headers["Content-Length"] = str(length)
+
+    return StreamingResponse(
+        chunks,
+        status_code=status_code,
+        media_type=media_type,
+        headers=response_headers,
+    )
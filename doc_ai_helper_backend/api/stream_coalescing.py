@@ -0,0 +1,146 @@
+"""
+Coalescing of streamed LLM events into SSE payloads.
+
+Providers emit content a token or two at a time. Sending each fragment as its
+own SSE event costs a JSON serialization and a write per token, which
+dominates CPU under many concurrent streams. Content fragments are merged
+until a size or time threshold is reached, and serialized on a fast path that
+skips generic dict serialization.
+
+The source stream is read by a producer task into a bounded queue. When a
+slow client lets the queue fill up, the producer stops reading, which in turn
+stops reading from the provider connection (backpressure) instead of
+buffering the whole response in memory.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+# Serialized terminal event, built once
+DONE_EVENT = json.dumps({"content": "", "done": True})
+
+# Queue marker of the end of the source stream
+_END = object()
+
+
+class _SourceError:
+    """Exception raised by the source stream, forwarded to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def serialize_content(content: str) -> str:
+    """Serialize a content event without building and walking a dict."""
+    return '{"content": ' + json.dumps(content) + ', "done": false}'
+
+
+def serialize_event(event: Dict[str, Any]) -> str:
+    """Serialize a stream event, using the fast paths where possible."""
+    if event.get("done") is True and not event.get("content") and len(event) == 2:
+        return DONE_EVENT
+    if len(event) == 2 and event.get("done") is False and isinstance(event.get("content"), str):
+        return serialize_content(event["content"])
+    return json.dumps(event)
+
+
+def _is_content(event: Dict[str, Any]) -> bool:
+    return (
+        len(event) == 2
+        and event.get("done") is False
+        and isinstance(event.get("content"), str)
+    )
+
+
+async def coalesce_stream_events(
+    events: AsyncIterator[Dict[str, Any]],
+    max_chars: int = 256,
+    max_delay: float = 0.05,
+    buffer_size: int = 64,
+) -> AsyncGenerator[str, None]:
+    """Merge content events of a stream and serialize them for SSE.
+
+    Content events are merged until ``max_chars`` characters are pending or
+    ``max_delay`` seconds have passed since the first pending fragment. Any
+    other event (tool progress, errors, the final ``done`` event) flushes the
+    pending content first and is passed through in order. Closing the
+    returned generator cancels the producer and closes the source stream.
+
+    Args:
+        events: Source stream of event dicts
+        max_chars: Pending content size that triggers a flush, 0 disables merging
+        max_delay: Longest time in seconds content is held back
+        buffer_size: Maximum number of events read ahead of the client
+
+    Yields:
+        str: Serialized event payloads
+
+    Raises:
+        Exception: Whatever the source stream raised, after pending content
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(buffer_size, 1))
+
+    async def produce() -> None:
+        try:
+            async for event in events:
+                # Blocks while the queue is full: backpressure on the source
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(_SourceError(e))
+            return
+        finally:
+            await events.aclose()
+        await queue.put(_END)
+
+    producer = asyncio.ensure_future(produce())
+    pending: List[str] = []
+    pending_chars = 0
+    deadline: Optional[float] = None
+
+    try:
+        while True:
+            if pending:
+                timeout = max(deadline - time.monotonic(), 0)
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield serialize_content("".join(pending))
+                    pending, pending_chars, deadline = [], 0, None
+                    continue
+            else:
+                item = await queue.get()
+
+            if isinstance(item, dict) and _is_content(item):
+                if not item["content"]:
+                    continue
+                if max_chars <= 0:
+                    yield serialize_content(item["content"])
+                    continue
+                if not pending:
+                    deadline = time.monotonic() + max_delay
+                pending.append(item["content"])
+                pending_chars += len(item["content"])
+                if pending_chars >= max_chars:
+                    yield serialize_content("".join(pending))
+                    pending, pending_chars, deadline = [], 0, None
+                continue
+
+            # Anything else keeps its position after the pending content
+            if pending:
+                yield serialize_content("".join(pending))
+                pending, pending_chars, deadline = [], 0, None
+
+            if item is _END:
+                return
+            if isinstance(item, _SourceError):
+                raise item.error
+            yield serialize_event(item)
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
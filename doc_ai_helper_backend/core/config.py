@@ -2,7 +2,7 @@
 Configuration settings for the application.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -45,6 +45,123 @@ class Settings(BaseSettings):
     # LLM configuration
     default_llm_provider: str = Field(default="openai", alias="DEFAULT_LLM_PROVIDER")
     llm_cache_ttl: int = Field(default=3600, alias="LLM_CACHE_TTL")  # 1 hour in seconds
+    llm_service_registry_size: int = Field(
+        default=16, alias="LLM_SERVICE_REGISTRY_SIZE"
+    )  # distinct provider/model/base URL/key configurations kept alive
+    llm_tool_max_rounds: int = Field(
+        default=4, alias="LLM_TOOL_MAX_ROUNDS"
+    )  # tool-call rounds before a final answer is forced
+    llm_tool_token_budget: int = Field(
+        default=60000, alias="LLM_TOOL_TOKEN_BUDGET"
+    )  # total tokens across tool rounds, 0 disables
+    llm_tool_time_budget: float = Field(
+        default=120.0, alias="LLM_TOOL_TIME_BUDGET"
+    )  # seconds across tool rounds, 0 disables
+    llm_stream_coalesce_chars: int = Field(
+        default=256, alias="LLM_STREAM_COALESCE_CHARS"
+    )  # merge streamed content up to this size per SSE event, 0 disables
+    llm_stream_coalesce_ms: int = Field(
+        default=50, alias="LLM_STREAM_COALESCE_MS"
+    )  # longest time streamed content is held back for merging
+    llm_stream_buffer_size: int = Field(
+        default=64, alias="LLM_STREAM_BUFFER_SIZE"
+    )  # events read ahead of a slow client before the provider stream is paused
+    llm_stream_replay_chunk_chars: int = Field(
+        default=64, alias="LLM_STREAM_REPLAY_CHUNK_CHARS"
+    )  # content size per event when replaying a cached stream, 0 sends it at once
+    enable_llm_single_flight: bool = Field(
+        default=True, alias="ENABLE_LLM_SINGLE_FLIGHT"
+    )  # share one provider call between identical concurrent queries
+    llm_document_max_tokens: int = Field(
+        default=2000, alias="LLM_DOCUMENT_MAX_TOKENS"
+    )  # document tokens embedded per prompt, capped by the context-window share; 0 uses the share alone
+    llm_token_count_cache_size: int = Field(
+        default=4096, alias="LLM_TOKEN_COUNT_CACHE_SIZE"
+    )  # memoized token counts of message contents, 0 disables
+
+    # Document cache settings
+    document_cache_ttl: int = Field(default=300, alias="DOCUMENT_CACHE_TTL")  # seconds
+    document_cache_max_entries: int = Field(
+        default=1024, alias="DOCUMENT_CACHE_MAX_ENTRIES"
+    )
+    document_negative_cache_ttl: int = Field(
+        default=30, alias="DOCUMENT_NEGATIVE_CACHE_TTL"
+    )  # seconds to remember missing paths, 0 disables
+    http_cache_max_age: int = Field(
+        default=0, alias="HTTP_CACHE_MAX_AGE"
+    )  # seconds clients may reuse document/structure responses before revalidating
+    enable_response_compression: bool = Field(
+        default=True, alias="ENABLE_RESPONSE_COMPRESSION"
+    )  # gzip, plus Brotli/zstd when installed
+    compression_min_size: int = Field(
+        default=1024, alias="COMPRESSION_MIN_SIZE"
+    )  # smaller bodies are sent uncompressed
+
+    # Application cache tiers (shared by document, structure and LLM caches)
+    cache_dir: Optional[str] = Field(
+        default=None, alias="CACHE_DIR"
+    )  # warm-tier directory, defaults to the system temporary directory
+    cache_namespace_budgets: Dict[str, int] = Field(
+        default={
+            "document": 256 * 1024 * 1024,
+            "structure": 64 * 1024 * 1024,
+            "llm": 64 * 1024 * 1024,
+        },
+        alias="CACHE_NAMESPACE_BUDGETS",
+    )  # compressed warm-tier bytes per key namespace, 0 keeps it memory-only
+    cache_default_namespace_bytes: int = Field(
+        default=16 * 1024 * 1024, alias="CACHE_DEFAULT_NAMESPACE_BYTES"
+    )
+    cache_snapshot_path: Optional[str] = Field(
+        default=None, alias="CACHE_SNAPSHOT_PATH"
+    )  # hot set saved on shutdown and restored on startup, None disables
+
+    # Linked document prefetch settings
+    enable_link_prefetch: bool = Field(default=False, alias="ENABLE_LINK_PREFETCH")
+    link_prefetch_concurrency: int = Field(
+        default=2, alias="LINK_PREFETCH_CONCURRENCY"
+    )  # per repository
+    link_prefetch_max_links: int = Field(default=10, alias="LINK_PREFETCH_MAX_LINKS")
+    link_prefetch_cooldown: int = Field(
+        default=60, alias="LINK_PREFETCH_COOLDOWN"
+    )  # seconds to pause a repository after a rate-limit error
+
+    # Repository warm-up settings
+    enable_repository_warmup: bool = Field(
+        default=False, alias="ENABLE_REPOSITORY_WARMUP"
+    )
+    repository_warmup_interval: int = Field(
+        default=0, alias="REPOSITORY_WARMUP_INTERVAL"
+    )  # seconds between scheduled warm-ups, 0 disables the schedule
+    repository_warmup_concurrency: int = Field(
+        default=2, alias="REPOSITORY_WARMUP_CONCURRENCY"
+    )  # repositories warmed at the same time
+
+    # Incremental sync settings
+    repository_sync_max_changed_paths: int = Field(
+        default=200, alias="REPOSITORY_SYNC_MAX_CHANGED_PATHS"
+    )  # larger change sets fall back to a full sync
+
+    # Asset proxy settings
+    enable_asset_proxy: bool = Field(
+        default=False, alias="ENABLE_ASSET_PROXY"
+    )  # rewrite image links to the asset proxy endpoint
+    asset_cache_dir: str = Field(default="./.asset_cache", alias="ASSET_CACHE_DIR")
+    asset_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024, alias="ASSET_CACHE_MAX_BYTES"
+    )
+    asset_cache_max_entry_bytes: int = Field(
+        default=16 * 1024 * 1024, alias="ASSET_CACHE_MAX_ENTRY_BYTES"
+    )  # larger assets are proxied without caching
+
+    # Repository-wide retrieval settings
+    repository_index_max_documents: int = Field(
+        default=200, alias="REPOSITORY_INDEX_MAX_DOCUMENTS"
+    )
+    repository_index_ttl: int = Field(default=3600, alias="REPOSITORY_INDEX_TTL")  # seconds
+    repository_index_max_repositories: int = Field(
+        default=32, alias="REPOSITORY_INDEX_MAX_REPOSITORIES"
+    )
 
     # Database settings
     database_url: str = Field(default="sqlite:///./app.db", alias="DATABASE_URL")
@@ -54,6 +171,9 @@ class Settings(BaseSettings):
     enable_repository_management: bool = Field(default=False, alias="ENABLE_REPOSITORY_MANAGEMENT")
     enable_repository_context_integration: bool = Field(default=False, alias="ENABLE_REPO_CONTEXT_INTEGRATION")
 
+    # Cache administration endpoints
+    enable_cache_admin: bool = Field(default=False, alias="ENABLE_CACHE_ADMIN")
+
     # Server settings
     server_host: str = Field(default="0.0.0.0", alias="HOST")
     server_port: int = Field(default=8000, alias="PORT")
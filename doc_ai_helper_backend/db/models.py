@@ -5,7 +5,18 @@ SQLAlchemy database models.
 from datetime import datetime
 from typing import Any, Dict, List
 
-from sqlalchemy import Boolean, Column, DateTime, Index, Integer, JSON, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.sql import func
 
 from .database import Base
@@ -65,4 +76,34 @@ class Repository(Base):
 
     def __repr__(self) -> str:
         """String representation of Repository."""
-        return f"<Repository(id={self.id}, service={self.service_type}, owner={self.owner}, name={self.name})>"
\ No newline at end of file
+        return f"<Repository(id={self.id}, service={self.service_type}, owner={self.owner}, name={self.name})>"
+
+
+class RepositorySyncState(Base):
+    """Last synced commit per repository and branch."""
+
+    __tablename__ = "repository_sync_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    repository_id = Column(
+        Integer,
+        ForeignKey("repositories.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Repository ID",
+    )
+    branch = Column(String, nullable=False, comment="Branch or tag name")
+    last_commit_sha = Column(String, nullable=False, comment="Last synced commit SHA")
+    synced_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="Last sync timestamp")
+
+    __table_args__ = (
+        # One state per repository+branch combination
+        UniqueConstraint(
+            "repository_id",
+            "branch",
+            name="uq_repository_sync_state_repository_branch",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of RepositorySyncState."""
+        return f"<RepositorySyncState(repository_id={self.repository_id}, branch={self.branch}, commit={self.last_commit_sha})>"
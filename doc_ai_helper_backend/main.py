@@ -8,10 +8,20 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from doc_ai_helper_backend.api.api import router as api_router
+from doc_ai_helper_backend.api.compression import CompressionMiddleware
+from doc_ai_helper_backend.api.dependencies import (
+    get_document_cache,
+    get_repository_warmer,
+    shutdown_document_cache,
+    shutdown_link_prefetcher,
+    start_document_cache_restore,
+    shutdown_repository_warmer,
+)
 from doc_ai_helper_backend.api.error_handlers import setup_error_handlers
 from doc_ai_helper_backend.core.config import settings
 from doc_ai_helper_backend.core.logging import setup_logging
-from doc_ai_helper_backend.db.database import init_db, close_db
+from doc_ai_helper_backend.db.database import AsyncSessionLocal, init_db, close_db
+from doc_ai_helper_backend.services.repository_service import RepositoryService
 
 # Set up logging
 setup_logging()
@@ -34,10 +44,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress document, tree and JSON responses
+if settings.enable_response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        cache=get_document_cache(),
+        cache_ttl=settings.document_cache_ttl,
+    )
+
 # Setup error handlers
 setup_error_handlers(app)
 
 
+async def list_warmup_targets():
+    """List registered repositories as warm-up targets."""
+    targets = []
+    async with AsyncSessionLocal() as session:
+        repository_service = RepositoryService(session)
+        skip, limit = 0, 1000
+        while True:
+            repositories = await repository_service.list_repositories(skip=skip, limit=limit)
+            targets.extend(
+                (
+                    repository.service_type.value,
+                    repository.owner,
+                    repository.name,
+                    repository.default_branch,
+                    repository.root_path,
+                )
+                for repository in repositories
+            )
+            if len(repositories) < limit:
+                return targets
+            skip += limit
+
+
 # Application lifecycle events
 @app.on_event("startup")
 async def startup_event():
@@ -55,12 +97,34 @@ async def startup_event():
     else:
         logger.info("Repository management disabled - skipping database initialization")
 
+    # Restore the cache hot set saved by the previous run
+    start_document_cache_restore()
+
+    # Re-warm registered repositories on a schedule
+    warmer = get_repository_warmer()
+    if (
+        warmer is not None
+        and settings.enable_repository_management
+        and settings.repository_warmup_interval > 0
+    ):
+        warmer.start_periodic(list_warmup_targets, settings.repository_warmup_interval)
+        logger.info(
+            f"Repository warm-up scheduled every {settings.repository_warmup_interval}s"
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on application shutdown."""
     logger.info("Shutting down application...")
-    
+
+    # Cancel pending background prefetches
+    await shutdown_link_prefetcher()
+    await shutdown_repository_warmer()
+
+    # Snapshot the cache hot set and remove the on-disk cache tier
+    await shutdown_document_cache()
+
     if settings.enable_repository_management:
         try:
             await close_db()
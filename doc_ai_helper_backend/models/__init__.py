@@ -7,3 +7,4 @@ from doc_ai_helper_backend.models.repository import *
 from doc_ai_helper_backend.models.search import *
 from doc_ai_helper_backend.models.link_info import *
 from doc_ai_helper_backend.models.frontmatter import *
+from doc_ai_helper_backend.models.link_graph import *
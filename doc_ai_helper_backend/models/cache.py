@@ -0,0 +1,42 @@
+"""
+Cache administration models.
+"""
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class NamespaceCacheStats(BaseModel):
+    """Statistics of one cache key namespace."""
+
+    hot_entries: int = Field(default=0, description="Live entries in the in-memory tier")
+    warm_entries: int = Field(default=0, description="Live entries in the on-disk tier")
+    warm_bytes: int = Field(default=0, description="Compressed bytes in the on-disk tier")
+    warm_budget_bytes: int = Field(default=0, description="Byte budget of the on-disk tier")
+    hits: int = Field(default=0, description="Cache hits")
+    misses: int = Field(default=0, description="Cache misses")
+    demotions: int = Field(default=0, description="Entries moved to the on-disk tier")
+    evictions: int = Field(default=0, description="Entries dropped for lack of space")
+    hit_rate: Optional[float] = Field(
+        default=None, description="Hits per lookup, None before the first lookup"
+    )
+    oldest_entry_age: Optional[float] = Field(
+        default=None, description="Age in seconds of the oldest live entry"
+    )
+
+
+class CacheStatsResponse(BaseModel):
+    """Cache statistics response model."""
+
+    total_entries: int = Field(default=0, description="Live entries in both tiers")
+    hot_max_entries: int = Field(default=0, description="Capacity of the in-memory tier")
+    namespaces: Dict[str, NamespaceCacheStats] = Field(
+        default_factory=dict, description="Statistics per key namespace"
+    )
+
+
+class CachePurgeResponse(BaseModel):
+    """Cache purge response model."""
+
+    deleted: int = Field(default=0, description="Number of entries deleted")
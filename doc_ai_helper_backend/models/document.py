@@ -85,9 +85,47 @@ class RepositoryStructureResponse(BaseModel):
     repo: str = Field(..., description="Repository name")
     ref: str = Field(default="main", description="Branch or tag name")
     tree: List[FileTreeItem] = Field(..., description="Repository tree")
+    truncated: bool = Field(
+        default=False,
+        description="Whether the tree listing is incomplete (e.g. GitHub's recursive tree limit)",
+    )
     last_updated: datetime = Field(..., description="Last updated datetime")
 
 
+class FileChange(BaseModel):
+    """File changed between two commits."""
+
+    path: str = Field(..., description="File path at the head commit")
+    status: str = Field(
+        ..., description="Change status (added, modified, removed, renamed)"
+    )
+    previous_path: Optional[str] = Field(
+        default=None, description="File path at the base commit, for renames"
+    )
+
+
+class RepositorySyncResult(BaseModel):
+    """Result of an incremental repository sync."""
+
+    service: str = Field(..., description="Git service")
+    owner: str = Field(..., description="Repository owner")
+    repo: str = Field(..., description="Repository name")
+    ref: str = Field(default="main", description="Branch or tag name")
+    previous_commit: Optional[str] = Field(
+        default=None, description="Last synced commit SHA"
+    )
+    current_commit: str = Field(..., description="Synced commit SHA")
+    mode: str = Field(
+        ..., description="Sync mode (unchanged, incremental, full)"
+    )
+    refreshed: List[str] = Field(
+        default_factory=list, description="Paths refetched into the caches"
+    )
+    removed: List[str] = Field(
+        default_factory=list, description="Paths dropped from the caches"
+    )
+
+
 class HTMLMetadata(BaseModel):
     """HTML固有のメタデータモデル"""
 
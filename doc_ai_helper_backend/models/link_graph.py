@@ -0,0 +1,49 @@
+"""
+Link graph models.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class BacklinksResponse(BaseModel):
+    """Backlinks response model."""
+
+    service: str = Field(..., description="Git service")
+    owner: str = Field(..., description="Repository owner")
+    repo: str = Field(..., description="Repository name")
+    ref: str = Field(default="main", description="Branch or tag name")
+    path: str = Field(..., description="Target document path")
+    backlinks: List[str] = Field(
+        default_factory=list, description="Paths of documents linking to the target"
+    )
+    indexed_documents: int = Field(
+        default=0, description="Number of documents in the link graph"
+    )
+
+
+class BrokenLink(BaseModel):
+    """Broken internal link model."""
+
+    source: str = Field(..., description="Path of the document containing the link")
+    url: str = Field(..., description="Link URL as written in the document")
+    target: str = Field(..., description="Resolved repository path of the link target")
+    text: str = Field(default="", description="Link text")
+    is_image: bool = Field(default=False, description="Whether the link is an image")
+
+
+class BrokenLinksResponse(BaseModel):
+    """Broken links response model."""
+
+    service: str = Field(..., description="Git service")
+    owner: str = Field(..., description="Repository owner")
+    repo: str = Field(..., description="Repository name")
+    ref: str = Field(default="main", description="Branch or tag name")
+    broken_links: List[BrokenLink] = Field(
+        default_factory=list, description="Internal links whose target does not exist"
+    )
+    checked_links: int = Field(default=0, description="Number of internal links checked")
+    indexed_documents: int = Field(
+        default=0, description="Number of documents in the link graph"
+    )
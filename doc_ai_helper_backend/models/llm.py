@@ -22,6 +22,7 @@ class MessageRole(str, Enum):
     USER = "user"
     ASSISTANT = "assistant"
     SYSTEM = "system"
+    TOOL = "tool"
 
 
 class MessageItem(BaseModel):
@@ -35,6 +36,12 @@ class MessageItem(BaseModel):
         default_factory=datetime.now,
         description="Timestamp when the message was created",
     )
+    tool_calls: Optional[List["ToolCall"]] = Field(
+        default=None, description="Tool calls requested by an assistant message"
+    )
+    tool_call_id: Optional[str] = Field(
+        default=None, description="ID of the tool call a tool message answers"
+    )
 
 
 # Legacy monolithic LLMQueryRequest removed - now using structured LLMQueryRequest as the main interface
@@ -111,6 +118,10 @@ class ToolCall(BaseModel):
     function: FunctionCall = Field(..., description="Function call details")
 
 
+# Resolve the forward reference to ToolCall
+MessageItem.model_rebuild()
+
+
 class ToolChoice(BaseModel):
     """
     Tool choice strategy for function calling.
@@ -221,6 +232,29 @@ class LLMStreamChunk(BaseModel):
 
 
 
+class StreamMetricsResponse(BaseModel):
+    """
+    Metrics of streaming queries.
+    """
+
+    active_streams: int = Field(default=0, description="Streams currently running")
+    completed_streams: int = Field(default=0, description="Streams that finished normally")
+    cancelled_streams: int = Field(
+        default=0, description="Streams cancelled because the client disconnected"
+    )
+    failed_streams: int = Field(default=0, description="Streams that ended with an error")
+    replayed_streams: int = Field(
+        default=0, description="Streams served from the response cache"
+    )
+    streamed_tokens: int = Field(
+        default=0, description="Estimated tokens sent to clients"
+    )
+    estimated_tokens_saved: int = Field(
+        default=0,
+        description="Estimated completion tokens not generated because streams were cancelled (upper bound)",
+    )
+
+
 class ToolParameter(BaseModel):
     """
     Parameter definition for an MCP tool.
@@ -310,6 +344,12 @@ class ToolConfiguration(BaseModel):
         default=True,
         description="If True, use complete Function Calling flow (tool execution + LLM followup). If False, use legacy flow (direct tool results)",
     )
+    max_tool_rounds: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=10,
+        description="Maximum number of tool-call rounds before a final answer is forced (defaults to the server setting)",
+    )
 
 
 class DocumentContext(BaseModel):
@@ -332,6 +372,14 @@ class DocumentContext(BaseModel):
     context_documents: Optional[List[str]] = Field(
         default=None, description="List of document paths to include in context"
     )
+    repository_wide_search: bool = Field(
+        default=False,
+        description="Whether to retrieve relevant chunks from all indexed documents of the repository/ref"
+    )
+    repository_search_top_k: int = Field(
+        default=8, ge=1, le=50,
+        description="Maximum number of repository chunks to include when repository_wide_search is enabled"
+    )
 
 
 class ProcessingOptions(BaseModel):
@@ -0,0 +1,11 @@
+"""
+Cache service module.
+
+This module provides application-scoped cache services.
+"""
+
+from doc_ai_helper_backend.services.cache.asset_cache import AssetCache
+from doc_ai_helper_backend.services.cache.memory_cache import MemoryCache
+from doc_ai_helper_backend.services.cache.tiered_cache import TieredCache
+
+__all__ = ["AssetCache", "MemoryCache", "TieredCache"]
@@ -0,0 +1,194 @@
+"""
+Size-bounded disk cache for repository assets.
+
+Assets (images and other binary files referenced from documents) are keyed by
+their blob SHA, so a cached file never goes stale: a changed asset has a new
+SHA and simply becomes a new entry, while the old one ages out of the LRU.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+
+class AssetTooLargeError(ValueError):
+    """Raised when an asset exceeds the per-entry size limit."""
+
+
+class AssetCache:
+    """Disk-backed LRU cache of asset bytes keyed by (repository, blob SHA).
+
+    Entries are written to a temporary file and atomically renamed into
+    place, so readers never see partial files. The total size is kept under
+    ``max_bytes`` by evicting the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entry_bytes: int = 16 * 1024 * 1024,
+    ):
+        """Initialize the asset cache.
+
+        Existing entries in the directory are adopted, oldest access first,
+        so the cache survives restarts.
+
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Maximum total size of cached assets
+            max_entry_bytes: Largest single asset that is cached
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_existing()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached assets in bytes."""
+        return self._total_bytes
+
+    @staticmethod
+    def _entry_name(service: str, owner: str, repo: str, sha: str) -> str:
+        """Build the file name of an entry."""
+        key = f"{service}:{owner}:{repo}:{sha}".encode("utf-8")
+        return hashlib.sha256(key).hexdigest()
+
+    def _load_existing(self) -> None:
+        """Adopt entries left in the directory by a previous run."""
+        existing = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp"):
+                # Interrupted write
+                os.unlink(entry.path)
+                continue
+            stat = entry.stat()
+            existing.append((stat.st_atime, entry.name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self._entries[name] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, service: str, owner: str, repo: str, sha: str) -> Optional[str]:
+        """Look up a cached asset.
+
+        Args:
+            service: Git service type
+            owner: Repository owner
+            repo: Repository name
+            sha: Blob SHA of the asset
+
+        Returns:
+            Optional[str]: Path of the cached file, or None if not cached
+        """
+        name = self._entry_name(service, owner, repo, sha)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            # Removed behind our back
+            self._forget(name)
+            return None
+        return path
+
+    async def put(
+        self,
+        service: str,
+        owner: str,
+        repo: str,
+        sha: str,
+        chunks: AsyncIterator[bytes],
+    ) -> str:
+        """Write an asset into the cache.
+
+        Args:
+            service: Git service type
+            owner: Repository owner
+            repo: Repository name
+            sha: Blob SHA of the asset
+            chunks: Asset content
+
+        Returns:
+            str: Path of the cached file
+
+        Raises:
+            AssetTooLargeError: If the asset exceeds ``max_entry_bytes``; the
+                partial file is discarded
+        """
+        name = self._entry_name(service, owner, repo, sha)
+        path = os.path.join(self.directory, name)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_entry_bytes:
+                        raise AssetTooLargeError(
+                            f"Asset larger than {self.max_entry_bytes} bytes"
+                        )
+                    file.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+        self._evict()
+        return path
+
+    def clear(self) -> None:
+        """Remove all cached assets."""
+        with self._lock:
+            names = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for name in names:
+            self._unlink(name)
+
+    def _forget(self, name: str) -> None:
+        """Drop an entry from the index."""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(name, 0)
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until under the size budget."""
+        evicted = []
+        with self._lock:
+            while self._total_bytes > self.max_bytes and self._entries:
+                name, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                evicted.append(name)
+        for name in evicted:
+            self._unlink(name)
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} assets from the disk cache")
+
+    def _unlink(self, name: str) -> None:
+        """Delete an entry file, ignoring files already gone."""
+        try:
+            os.unlink(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
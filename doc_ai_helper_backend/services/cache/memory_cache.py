@@ -0,0 +1,96 @@
+"""
+In-memory cache service.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+
+class MemoryCache:
+    """Async in-memory LRU cache with per-entry TTL.
+
+    Implements the async ``get``/``set`` interface expected by
+    ``DocumentService``.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[int] = 300):
+        """Initialize memory cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            default_ttl: Default time-to-live in seconds. None means no expiry
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        # An empty cache is still a configured cache (``if cache_service:``)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None if missing or expired
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds. Defaults to ``default_ttl``
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
+        return self._entries.pop(key, None) is not None
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """Return a live entry, dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
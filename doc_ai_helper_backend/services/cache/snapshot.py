@@ -0,0 +1,144 @@
+"""
+Application cache snapshots.
+
+The hot set of the application cache is written to disk on shutdown and
+restored on startup, so restarts and rolling deploys keep their hit rate
+instead of refetching everything from the Git service and the LLM provider.
+
+Snapshots are pickled and must live in a directory only this application can
+write to. A snapshot written by another application version is ignored,
+since cached models may have changed shape.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, List, Optional, Tuple
+
+from doc_ai_helper_backend.services.cache.tiered_cache import (
+    TieredCache,
+    compress,
+    decompress,
+)
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+SNAPSHOT_MAGIC = b"DAHCACHE"
+SNAPSHOT_FORMAT = 1
+
+
+def save_snapshot(cache: TieredCache, path: str, version: str) -> int:
+    """Write the hot set of a cache to a snapshot file.
+
+    The file is replaced atomically; entries that cannot be pickled are
+    skipped.
+
+    Args:
+        cache: Cache to snapshot
+        path: Snapshot file path
+        version: Application version recorded in the snapshot
+
+    Returns:
+        int: Number of entries written
+    """
+    entries = []
+    for key, value, expires_at in cache.hot_items():
+        try:
+            entries.append(
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at)
+            )
+        except Exception as e:
+            logger.debug(f"Skipping unpicklable cache entry {key}: {e}")
+
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "created_at": time.time(),
+        "entries": entries,
+    }
+    data = SNAPSHOT_MAGIC + compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return len(entries)
+
+
+def load_snapshot(path: str, version: str) -> List[Tuple[str, Any, Optional[float]]]:
+    """Read the live entries of a snapshot file.
+
+    Missing, corrupt and other-version snapshots yield no entries; expired
+    entries and entries that no longer unpickle are dropped.
+
+    Args:
+        path: Snapshot file path
+        version: Current application version
+
+    Returns:
+        List[Tuple[str, Any, Optional[float]]]: (key, value, expires_at),
+        least recently used first
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return []
+
+    try:
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError("not a cache snapshot")
+        payload = pickle.loads(decompress(data[len(SNAPSHOT_MAGIC) :]))
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache snapshot {path}: {e}")
+        return []
+
+    if payload.get("format") != SNAPSHOT_FORMAT or payload.get("version") != version:
+        logger.info(
+            f"Ignoring cache snapshot from version {payload.get('version')} "
+            f"(current: {version})"
+        )
+        return []
+
+    now = time.time()
+    entries = []
+    for key, value_data, expires_at in payload.get("entries", []):
+        if expires_at is not None and expires_at <= now:
+            continue
+        try:
+            entries.append((key, pickle.loads(value_data), expires_at))
+        except Exception as e:
+            logger.debug(f"Dropping unreadable snapshot entry {key}: {e}")
+    return entries
+
+
+async def restore_snapshot(cache: TieredCache, path: str, version: str) -> int:
+    """Restore a snapshot into a cache without blocking the event loop.
+
+    Reading and unpickling happen in a worker thread; entries cached since
+    startup are not overwritten.
+
+    Args:
+        cache: Cache to restore into
+        path: Snapshot file path
+        version: Current application version
+
+    Returns:
+        int: Number of entries restored
+    """
+    entries = await asyncio.to_thread(load_snapshot, path, version)
+    restored = cache.restore(entries)
+    if restored:
+        logger.info(f"Restored {restored} cache entries from {path}")
+    return restored
@@ -0,0 +1,509 @@
+"""
+Two-tier application cache.
+
+Hot entries are kept as live objects in an in-memory LRU. Entries evicted from
+it are demoted to a warm tier of serialized, compressed records in a
+memory-mapped file on disk, each namespace within its own byte budget, and
+are promoted back on their next hit. The working set can therefore exceed
+RAM without refetching from the Git service or the LLM provider.
+"""
+
+import logging
+import mmap
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zlib is always available
+    zstandard = None
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+# Namespace of keys without a ``namespace:`` prefix
+DEFAULT_NAMESPACE = "default"
+
+# Record codec markers
+_CODEC_ZLIB = b"z"
+_CODEC_ZSTD = b"s"
+
+# Dead bytes tolerated in the warm file before it is compacted
+_COMPACT_MIN_DEAD_BYTES = 4 * 1024 * 1024
+
+# (value, expires_at, stored_at) - wall-clock timestamps, expires_at may be None
+_HotEntry = Tuple[Any, Optional[float], float]
+# (offset, length, expires_at, stored_at) of a warm record
+_WarmEntry = Tuple[int, int, Optional[float], float]
+
+# Per-namespace counters reported by ``TieredCache.stats``
+_COUNTERS = ("hits", "misses", "demotions", "evictions")
+
+
+def key_namespace(key: str) -> str:
+    """Get the namespace of a cache key (its ``namespace:`` prefix)."""
+    namespace, separator, _ = key.partition(":")
+    return namespace if separator else DEFAULT_NAMESPACE
+
+
+def compress(data: bytes, level: int = 3) -> bytes:
+    """Compress a record with zstd when available, zlib otherwise."""
+    if zstandard is not None:
+        return _CODEC_ZSTD + zstandard.ZstdCompressor(level=level).compress(data)
+    return _CODEC_ZLIB + zlib.compress(data, level)
+
+
+def decompress(record: bytes) -> bytes:
+    """Decompress a record written by ``compress``."""
+    codec, payload = record[:1], record[1:]
+    if codec == _CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd record but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(payload)
+    raise ValueError(f"Unknown record codec: {codec!r}")
+
+
+class WarmStore:
+    """Append-only record file read through a memory map."""
+
+    def __init__(self, path: str):
+        """Create (or truncate) the record file.
+
+        Args:
+            path: File path
+        """
+        self.path = path
+        self._file = open(path, "w+b")
+        self._map: Optional[mmap.mmap] = None
+
+    @property
+    def size(self) -> int:
+        """Size of the record file in bytes."""
+        return os.fstat(self._file.fileno()).st_size
+
+    def append(self, record: bytes) -> int:
+        """Append a record.
+
+        Returns:
+            int: Offset of the record
+        """
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(record)
+        return offset
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Read a record, remapping the file if it grew past the map."""
+        end = offset + length
+        if self._map is None or end > len(self._map):
+            self._file.flush()
+            self._unmap()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:end]
+
+    def rewrite(self, records: Iterable[Tuple[int, int]]) -> List[int]:
+        """Rewrite the file keeping only the given records.
+
+        Args:
+            records: (offset, length) of the records to keep
+
+        Returns:
+            List[int]: New offsets, in the order of ``records``
+        """
+        compact_path = self.path + ".compact"
+        offsets = []
+        with open(compact_path, "wb") as compact:
+            for offset, length in records:
+                offsets.append(compact.tell())
+                compact.write(self.read(offset, length))
+        self._unmap()
+        self._file.close()
+        os.replace(compact_path, self.path)
+        self._file = open(self.path, "r+b")
+        return offsets
+
+    def truncate(self) -> None:
+        """Drop all records."""
+        self._unmap()
+        self._file.seek(0)
+        self._file.truncate()
+
+    def close(self, remove: bool = True) -> None:
+        """Close the file, removing it by default."""
+        self._unmap()
+        self._file.close()
+        if remove:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class TieredCache:
+    """Async two-tier cache: hot in-memory LRU over a compressed disk tier.
+
+    Implements the same async ``get``/``set``/``delete``/``clear`` interface
+    as ``MemoryCache``. Keys are namespaced by their prefix (``document:``,
+    ``structure:``, ``llm:``...), and each namespace has its own warm-tier
+    byte budget; a namespace with no budget is memory-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: Optional[int] = 300,
+        directory: Optional[str] = None,
+        namespace_budgets: Optional[Dict[str, int]] = None,
+        default_namespace_bytes: int = 16 * 1024 * 1024,
+        compression_level: int = 3,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of hot entries before demotion
+            default_ttl: Default time-to-live in seconds. None means no expiry
+            directory: Directory of the warm-tier file. Defaults to the
+                system temporary directory
+            namespace_budgets: Warm-tier byte budget per namespace
+            default_namespace_bytes: Warm-tier byte budget of other namespaces
+            compression_level: zstd/zlib compression level
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.directory = directory
+        self.namespace_budgets = dict(namespace_budgets or {})
+        self.default_namespace_bytes = default_namespace_bytes
+        self.compression_level = compression_level
+        self._hot: "OrderedDict[str, _HotEntry]" = OrderedDict()
+        self._warm: Dict[str, "OrderedDict[str, _WarmEntry]"] = {}
+        self._warm_bytes: Dict[str, int] = {}
+        self._dead_bytes = 0
+        self._store: Optional[WarmStore] = None
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._hot) + sum(len(entries) for entries in self._warm.values())
+
+    def __bool__(self) -> bool:
+        # An empty cache is still a configured cache (``if cache_service:``)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._hot.get(key)
+        if entry is not None:
+            return not self._expired(entry[1])
+        record = self._warm.get(key_namespace(key), {}).get(key)
+        return record is not None and not self._expired(record[2])
+
+    @property
+    def hot_count(self) -> int:
+        """Number of entries in the hot tier."""
+        return len(self._hot)
+
+    def warm_bytes(self, namespace: str) -> int:
+        """Compressed bytes held by a namespace in the warm tier."""
+        return self._warm_bytes.get(namespace, 0)
+
+    def namespace_budget(self, namespace: str) -> int:
+        """Warm-tier byte budget of a namespace."""
+        return self.namespace_budgets.get(namespace, self.default_namespace_bytes)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, promoting it from the warm tier on a hit.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None if missing or expired
+        """
+        namespace = key_namespace(key)
+        entry = self._hot.get(key)
+        if entry is not None:
+            if self._expired(entry[1]):
+                del self._hot[key]
+                self._count(namespace, "misses")
+                return None
+            self._hot.move_to_end(key)
+            self._count(namespace, "hits")
+            return entry[0]
+
+        record = self._pop_warm(key)
+        if record is None or self._expired(record[2]):
+            self._count(namespace, "misses")
+            return None
+        offset, length, expires_at, stored_at = record
+        try:
+            value = pickle.loads(decompress(self._store.read(offset, length)))
+        except Exception as e:
+            logger.warning(f"Dropping unreadable warm cache entry {key}: {e}")
+            self._count(namespace, "misses")
+            return None
+        self._count(namespace, "hits")
+        self._put_hot(key, value, expires_at, stored_at)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value in the hot tier.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds. Defaults to ``default_ttl``
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._pop_warm(key)
+        self._put_hot(key, value, expires_at)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a cached value from both tiers.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
+        in_hot = self._hot.pop(key, None) is not None
+        in_warm = self._pop_warm(key) is not None
+        return in_hot or in_warm
+
+    def hot_items(self) -> List[Tuple[str, Any, Optional[float]]]:
+        """List live hot entries, least recently used first.
+
+        Returns:
+            List[Tuple[str, Any, Optional[float]]]: (key, value, expires_at),
+            expires_at being a wall-clock timestamp or None
+        """
+        return [
+            (key, value, expires_at)
+            for key, (value, expires_at, _) in self._hot.items()
+            if not self._expired(expires_at)
+        ]
+
+    def restore(self, items: Iterable[Tuple[str, Any, Optional[float]]]) -> int:
+        """Insert entries restored from a snapshot.
+
+        Expired entries and keys cached since startup are skipped, so a
+        background restore never overwrites fresher values. Restored entries
+        are older than anything cached since startup: they go to the least
+        recently used end of the hot tier while it has spare capacity, and
+        the rest goes straight to the warm tier instead of evicting live
+        entries.
+
+        Args:
+            items: (key, value, expires_at), least recently used first
+
+        Returns:
+            int: Number of entries restored
+        """
+        restorable = [
+            (key, value, expires_at)
+            for key, value, expires_at in items
+            if not self._expired(expires_at) and key not in self
+        ]
+        now = time.time()
+        overflow = []
+        # Most recently used first, each pushed in front of the previous one
+        for key, value, expires_at in reversed(restorable):
+            if len(self._hot) < self.max_entries:
+                self._hot[key] = (value, expires_at, now)
+                self._hot.move_to_end(key, last=False)
+            else:
+                overflow.append((key, value, expires_at))
+        for key, value, expires_at in reversed(overflow):
+            self._demote(key, value, expires_at, now)
+        return len(restorable)
+
+    def keys(self) -> List[str]:
+        """List the keys of live entries in both tiers."""
+        keys = [key for key, entry in self._hot.items() if not self._expired(entry[1])]
+        for entries in self._warm.values():
+            keys.extend(key for key, record in entries.items() if not self._expired(record[2]))
+        return keys
+
+    def delete_where(self, predicate: Callable[[str], bool]) -> int:
+        """Delete the entries whose key matches a predicate.
+
+        Args:
+            predicate: Function returning True for keys to delete
+
+        Returns:
+            int: Number of entries deleted
+        """
+        deleted = 0
+        for key in [key for key in self._hot if predicate(key)]:
+            del self._hot[key]
+            deleted += 1
+        for entries in list(self._warm.values()):
+            for key in [key for key in entries if predicate(key)]:
+                self._pop_warm(key)
+                deleted += 1
+        return deleted
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Report per-namespace statistics.
+
+        Hot entries are live objects, so only the warm tier has a byte size.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per namespace: hot_entries,
+            warm_entries, warm_bytes, warm_budget_bytes, hits, misses,
+            demotions, evictions and oldest_entry_age (seconds, or None)
+        """
+        now = time.time()
+        stats: Dict[str, Dict[str, Any]] = {}
+
+        def namespace_stats(namespace: str) -> Dict[str, Any]:
+            if namespace not in stats:
+                stats[namespace] = {
+                    "hot_entries": 0,
+                    "warm_entries": 0,
+                    "warm_bytes": self.warm_bytes(namespace),
+                    "warm_budget_bytes": self.namespace_budget(namespace),
+                    **dict.fromkeys(_COUNTERS, 0),
+                    **self._counters.get(namespace, {}),
+                    "oldest_entry_age": None,
+                }
+            return stats[namespace]
+
+        def observe(namespace: str, tier: str, stored_at: float) -> None:
+            entry = namespace_stats(namespace)
+            entry[tier] += 1
+            age = now - stored_at
+            if entry["oldest_entry_age"] is None or age > entry["oldest_entry_age"]:
+                entry["oldest_entry_age"] = age
+
+        for key, (_, expires_at, stored_at) in self._hot.items():
+            if not self._expired(expires_at):
+                observe(key_namespace(key), "hot_entries", stored_at)
+        for namespace, entries in self._warm.items():
+            for _, _, expires_at, stored_at in entries.values():
+                if not self._expired(expires_at):
+                    observe(namespace, "warm_entries", stored_at)
+        for namespace in self._counters:
+            namespace_stats(namespace)
+        return stats
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        self._hot.clear()
+        self._warm.clear()
+        self._warm_bytes.clear()
+        self._dead_bytes = 0
+        if self._store is not None:
+            self._store.truncate()
+
+    def close(self) -> None:
+        """Drop the warm tier and remove its file."""
+        self._warm.clear()
+        self._warm_bytes.clear()
+        self._dead_bytes = 0
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    @staticmethod
+    def _expired(expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    def _count(self, namespace: str, counter: str) -> None:
+        counters = self._counters.setdefault(namespace, dict.fromkeys(_COUNTERS, 0))
+        counters[counter] += 1
+
+    def _put_hot(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float],
+        stored_at: Optional[float] = None,
+    ) -> None:
+        """Insert a hot entry, demoting least recently used overflow."""
+        self._hot[key] = (value, expires_at, time.time() if stored_at is None else stored_at)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.max_entries:
+            old_key, (old_value, old_expires_at, old_stored_at) = self._hot.popitem(last=False)
+            self._demote(old_key, old_value, old_expires_at, old_stored_at)
+
+    def _pop_warm(self, key: str) -> Optional[_WarmEntry]:
+        """Remove a warm record from the index, returning it."""
+        namespace = key_namespace(key)
+        entries = self._warm.get(namespace)
+        record = entries.pop(key, None) if entries else None
+        if record is not None:
+            self._warm_bytes[namespace] -= record[1]
+            self._dead_bytes += record[1]
+        return record
+
+    def _demote(
+        self, key: str, value: Any, expires_at: Optional[float], stored_at: float
+    ) -> None:
+        """Serialize an entry evicted from the hot tier into the warm tier."""
+        if self._expired(expires_at):
+            return
+        namespace = key_namespace(key)
+        budget = self.namespace_budget(namespace)
+        record = None
+        if budget > 0:
+            try:
+                record = compress(
+                    pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                    self.compression_level,
+                )
+            except Exception as e:
+                logger.debug(f"Cannot demote cache entry {key}: {e}")
+        if record is None or len(record) > budget:
+            self._count(namespace, "evictions")
+            return
+
+        offset = self._warm_store().append(record)
+        entries = self._warm.setdefault(namespace, OrderedDict())
+        entries[key] = (offset, len(record), expires_at, stored_at)
+        self._warm_bytes[namespace] = self._warm_bytes.get(namespace, 0) + len(record)
+        self._count(namespace, "demotions")
+        while self._warm_bytes[namespace] > budget:
+            _, (_, length, _, _) = entries.popitem(last=False)
+            self._warm_bytes[namespace] -= length
+            self._dead_bytes += length
+            self._count(namespace, "evictions")
+        self._maybe_compact()
+
+    def _warm_store(self) -> WarmStore:
+        """Open the warm-tier file on first use (one file per process)."""
+        if self._store is None:
+            directory = self.directory or tempfile.gettempdir()
+            os.makedirs(directory, exist_ok=True)
+            self._store = WarmStore(
+                os.path.join(directory, f"doc_ai_helper_cache-{os.getpid()}.bin")
+            )
+        return self._store
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the warm file once dead records outweigh live ones."""
+        live_bytes = sum(self._warm_bytes.values())
+        if self._dead_bytes < _COMPACT_MIN_DEAD_BYTES or self._dead_bytes < live_bytes:
+            return
+        live = [
+            (namespace, key, record)
+            for namespace, entries in self._warm.items()
+            for key, record in entries.items()
+        ]
+        offsets = self._store.rewrite((record[0], record[1]) for _, _, record in live)
+        for (namespace, key, (_, length, expires_at, stored_at)), offset in zip(live, offsets):
+            # Reassigning keeps each key's LRU position
+            self._warm[namespace][key] = (offset, length, expires_at, stored_at)
+        self._dead_bytes = 0
+        logger.debug(f"Compacted warm cache to {live_bytes} bytes")
@@ -0,0 +1,295 @@
+"""
+Cross-document link graph.
+
+Keeps a per-(service, owner, repo, ref) graph of internal links extracted
+from processed documents, so that backlinks and broken links can be
+answered without re-fetching every document.
+"""
+
+import logging
+import posixpath
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from doc_ai_helper_backend.models.link_graph import BrokenLink
+from doc_ai_helper_backend.models.link_info import LinkInfo
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+GraphKey = Tuple[str, str, str, str]
+
+# (resolved target, original url, link text, is image)
+Edge = Tuple[str, str, str, bool]
+
+
+def resolve_link_target(url: str, base_dir: str) -> Optional[str]:
+    """Resolve a document link to a repository path.
+
+    Args:
+        url: Link URL as written in the document
+        base_dir: Directory the link is relative to
+
+    Returns:
+        Optional[str]: Normalized repository path without leading slash, or
+        None for external links, pure anchors and non-path schemes
+    """
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme or parsed.netloc or not parsed.path:
+        return None
+
+    link_path = unquote(parsed.path)
+    if link_path.startswith("/"):
+        joined = link_path
+    else:
+        joined = posixpath.join("/" + base_dir.strip("/"), link_path)
+    normalized = posixpath.normpath(joined).lstrip("/")
+    if normalized in ("", "."):
+        return None
+    return normalized
+
+
+class LinkGraph:
+    """Internal link graph for a single repository ref."""
+
+    def __init__(self, key: GraphKey):
+        """Initialize an empty link graph.
+
+        Args:
+            key: (service, owner, repo, ref)
+        """
+        self.key = key
+        self._outgoing: Dict[str, Tuple[Optional[str], Tuple[Edge, ...]]] = {}
+        self._incoming: Dict[str, Set[str]] = {}
+        self._tree_paths: Optional[FrozenSet[str]] = None
+        self._tree_dirs: FrozenSet[str] = frozenset()
+        self.tree_updated_at: Optional[float] = None
+
+    @property
+    def document_count(self) -> int:
+        """Number of documents whose links are indexed."""
+        return len(self._outgoing)
+
+    @property
+    def has_tree(self) -> bool:
+        """Whether a tree index is available for broken-link detection."""
+        return self._tree_paths is not None
+
+    def has_document(self, path: str, sha: Optional[str]) -> bool:
+        """Check whether a document is indexed at the given SHA.
+
+        Args:
+            path: Document path
+            sha: Document blob SHA
+
+        Returns:
+            bool: True if the document is indexed with the same SHA
+        """
+        entry = self._outgoing.get(path)
+        return entry is not None and sha is not None and entry[0] == sha
+
+    def update_document(
+        self,
+        path: str,
+        sha: Optional[str],
+        links: Iterable[LinkInfo],
+        base_dir: Optional[str] = None,
+    ) -> bool:
+        """Replace the outgoing links of a document.
+
+        Args:
+            path: Document path
+            sha: Document blob SHA. Unchanged SHAs are skipped
+            links: Links extracted by the document processor
+            base_dir: Directory relative links are resolved from.
+                Defaults to the document's directory
+
+        Returns:
+            bool: True if the graph was updated
+        """
+        path = path.strip("/")
+        if self.has_document(path, sha):
+            return False
+
+        if base_dir is None or not base_dir.strip():
+            base_dir = posixpath.dirname(path)
+
+        edges: List[Edge] = []
+        for link in links:
+            if link.is_external:
+                continue
+            target = resolve_link_target(link.url, base_dir)
+            if target is not None:
+                edges.append((target, link.url, link.text, link.is_image))
+
+        self._remove_incoming(path)
+        self._outgoing[path] = (sha, tuple(edges))
+        for target, _, _, _ in edges:
+            self._incoming.setdefault(target, set()).add(path)
+        return True
+
+    def remove_document(self, path: str) -> bool:
+        """Remove a document and its outgoing links.
+
+        Args:
+            path: Document path
+
+        Returns:
+            bool: True if the document was indexed
+        """
+        path = path.strip("/")
+        if path not in self._outgoing:
+            return False
+        self._remove_incoming(path)
+        del self._outgoing[path]
+        return True
+
+    def set_tree(self, paths: Iterable[str]) -> None:
+        """Set the repository tree used for broken-link detection.
+
+        Only directories that have at least one entry in the tree are treated
+        as fully listed, so non-recursive trees (e.g. Forgejo contents
+        listings) do not produce false positives for unlisted subdirectories.
+
+        Args:
+            paths: File and directory paths of the repository ref
+        """
+        self._tree_paths = frozenset(p.strip("/") for p in paths)
+        self._tree_dirs = frozenset(posixpath.dirname(p) for p in self._tree_paths)
+        self.tree_updated_at = time.monotonic()
+
+    def path_exists(self, path: str, max_age: Optional[float] = None) -> Optional[bool]:
+        """Check a path against the tree index.
+
+        A path is known to be missing only if its parent directory is fully
+        listed (or is itself known to be missing).
+
+        Args:
+            path: Repository path
+            max_age: Maximum age of the tree index in seconds. Older trees
+                are not trusted
+
+        Returns:
+            Optional[bool]: True if the path exists, False if it is known to
+            be missing, None if the tree index cannot tell
+        """
+        if self._tree_paths is None:
+            return None
+        if max_age is not None and time.monotonic() - self.tree_updated_at > max_age:
+            return None
+
+        path = path.strip("/")
+        while path:
+            if path in self._tree_paths:
+                return True
+            parent = posixpath.dirname(path)
+            if parent in self._tree_dirs:
+                return False
+            # Parent is unlisted: it is either a missing directory or unknown
+            path = parent
+            if path in self._tree_paths:
+                return None
+        return None
+
+    def backlinks(self, path: str) -> List[str]:
+        """Get documents linking to a path.
+
+        Args:
+            path: Target document path
+
+        Returns:
+            List[str]: Sorted source document paths
+        """
+        return sorted(self._incoming.get(path.strip("/"), ()))
+
+    def broken_links(self) -> Tuple[List[BrokenLink], int]:
+        """Find internal links whose target is missing from the tree index.
+
+        Returns:
+            Tuple[List[BrokenLink], int]: Broken links and the number of links checked
+        """
+        if self._tree_paths is None:
+            return [], 0
+
+        broken: List[BrokenLink] = []
+        checked = 0
+        for source, (_, edges) in sorted(self._outgoing.items()):
+            for target, url, text, is_image in edges:
+                if posixpath.dirname(target) not in self._tree_dirs:
+                    continue
+                checked += 1
+                if target not in self._tree_paths:
+                    broken.append(
+                        BrokenLink(
+                            source=source,
+                            url=url,
+                            target=target,
+                            text=text,
+                            is_image=is_image,
+                        )
+                    )
+        return broken, checked
+
+    def _remove_incoming(self, source: str) -> None:
+        """Drop reverse edges contributed by a source document."""
+        entry = self._outgoing.get(source)
+        if entry is None:
+            return
+        for target, _, _, _ in entry[1]:
+            sources = self._incoming.get(target)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del self._incoming[target]
+
+
+class LinkGraphRegistry:
+    """Process-wide registry of link graphs, bounded by LRU."""
+
+    def __init__(self, max_repositories: int = 32):
+        """Initialize the registry.
+
+        Args:
+            max_repositories: Maximum number of repository refs to keep
+        """
+        self.max_repositories = max_repositories
+        self._graphs: "OrderedDict[GraphKey, LinkGraph]" = OrderedDict()
+
+    def get(self, service: str, owner: str, repo: str, ref: str) -> Optional[LinkGraph]:
+        """Get an existing link graph.
+
+        Returns:
+            Optional[LinkGraph]: The graph, or None if not yet created
+        """
+        key = (service, owner, repo, ref)
+        graph = self._graphs.get(key)
+        if graph is not None:
+            self._graphs.move_to_end(key)
+        return graph
+
+    def get_or_create(self, service: str, owner: str, repo: str, ref: str) -> LinkGraph:
+        """Get a link graph, creating an empty one if needed.
+
+        Returns:
+            LinkGraph: The graph for the repository ref
+        """
+        key = (service, owner, repo, ref)
+        graph = self.get(*key)
+        if graph is None:
+            graph = LinkGraph(key)
+            self._graphs[key] = graph
+            while len(self._graphs) > self.max_repositories:
+                self._graphs.popitem(last=False)
+        return graph
+
+    def discard(self, service: str, owner: str, repo: str, ref: str) -> None:
+        """Drop the link graph of a repository ref."""
+        self._graphs.pop((service, owner, repo, ref), None)
+
+
+# Shared registry used by DocumentService and the API
+link_graph_registry = LinkGraphRegistry()
@@ -0,0 +1,175 @@
+"""
+Speculative prefetch of linked documents.
+
+After a document is served, its internal links are the most likely next
+navigation. The prefetcher fetches them in the background through the
+cached ``DocumentService`` so the next click is served from cache.
+"""
+
+import asyncio
+import logging
+import os
+import posixpath
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from doc_ai_helper_backend.core.exceptions import (
+    GitHubRateLimitError,
+    RateLimitException,
+)
+from doc_ai_helper_backend.models.document import DocumentResponse
+from doc_ai_helper_backend.services.document.link_graph import resolve_link_target
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+# Extensions of documents worth prefetching
+PREFETCHABLE_EXTENSIONS = {".md", ".markdown", ".html", ".htm"}
+
+RepoKey = Tuple[str, str, str]
+PrefetchKey = Tuple[str, str, str, str, str]
+
+
+class LinkPrefetcher:
+    """Low-priority background prefetcher for linked documents."""
+
+    def __init__(
+        self,
+        document_service,
+        max_concurrency_per_repo: int = 2,
+        max_links_per_document: int = 10,
+        max_pending: int = 100,
+        cooldown_seconds: float = 60.0,
+        start_delay: float = 0.1,
+    ):
+        """Initialize the prefetcher.
+
+        Args:
+            document_service: Cached DocumentService used for fetching
+            max_concurrency_per_repo: Concurrent prefetches per repository
+            max_links_per_document: Links prefetched for one served document
+            max_pending: Maximum number of queued or running prefetches
+            cooldown_seconds: Pause per repository after a rate-limit error
+            start_delay: Delay before a prefetch starts, so user requests go first
+        """
+        self.document_service = document_service
+        self.max_concurrency_per_repo = max_concurrency_per_repo
+        self.max_links_per_document = max_links_per_document
+        self.max_pending = max_pending
+        self.cooldown_seconds = cooldown_seconds
+        self.start_delay = start_delay
+        self._semaphores: Dict[RepoKey, asyncio.Semaphore] = {}
+        self._cooldown_until: Dict[RepoKey, float] = {}
+        self._inflight: Set[PrefetchKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued or running prefetches."""
+        return len(self._inflight)
+
+    def candidate_paths(
+        self, document: DocumentResponse, root_path: Optional[str] = None
+    ) -> List[str]:
+        """Get internal, non-image document links worth prefetching.
+
+        Args:
+            document: Served document
+            root_path: Root directory used for link resolution
+
+        Returns:
+            List[str]: Repository paths in link order, without duplicates
+        """
+        if root_path and root_path.strip():
+            base_dir = root_path.strip("/")
+        else:
+            base_dir = posixpath.dirname(document.path)
+        paths: List[str] = []
+        for link in document.links or []:
+            if link.is_external or link.is_image:
+                continue
+            target = resolve_link_target(link.url, base_dir)
+            if (
+                target
+                and target != document.path
+                and target not in paths
+                and os.path.splitext(target)[1].lower() in PREFETCHABLE_EXTENSIONS
+            ):
+                paths.append(target)
+            if len(paths) >= self.max_links_per_document:
+                break
+        return paths
+
+    def is_cooling_down(self, service: str, owner: str, repo: str) -> bool:
+        """Check whether prefetching is paused for a repository."""
+        return self._cooldown_until.get((service, owner, repo), 0.0) > time.monotonic()
+
+    def schedule(
+        self, document: DocumentResponse, root_path: Optional[str] = None
+    ) -> int:
+        """Schedule background prefetches for the links of a served document.
+
+        Args:
+            document: Served document
+            root_path: Root directory used for link resolution
+
+        Returns:
+            int: Number of prefetches scheduled
+        """
+        service, owner, repo = document.service, document.owner, document.repository
+        if self.is_cooling_down(service, owner, repo):
+            return 0
+
+        scheduled = 0
+        for path in self.candidate_paths(document, root_path):
+            key = (service, owner, repo, document.ref, path)
+            if key in self._inflight:
+                continue
+            if len(self._inflight) >= self.max_pending:
+                break
+            self._inflight.add(key)
+            task = asyncio.create_task(self._prefetch(key, root_path))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            scheduled += 1
+
+        if scheduled:
+            logger.debug(f"Scheduled {scheduled} prefetches for {service}/{owner}/{repo}/{document.path}")
+        return scheduled
+
+    async def close(self) -> None:
+        """Cancel all pending prefetches."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+    async def _prefetch(self, key: PrefetchKey, root_path: Optional[str]) -> None:
+        """Fetch a single document into the cache."""
+        service, owner, repo, ref, path = key
+        repo_key = (service, owner, repo)
+        semaphore = self._semaphores.setdefault(
+            repo_key, asyncio.Semaphore(self.max_concurrency_per_repo)
+        )
+        try:
+            if self.start_delay:
+                await asyncio.sleep(self.start_delay)
+            async with semaphore:
+                if self.is_cooling_down(service, owner, repo):
+                    return
+                await self.document_service.get_document(
+                    service, owner, repo, path, ref, root_path=root_path
+                )
+        except (RateLimitException, GitHubRateLimitError):
+            logger.warning(
+                f"Rate limit hit while prefetching {service}/{owner}/{repo}; "
+                f"pausing prefetch for {self.cooldown_seconds}s"
+            )
+            self._cooldown_until[repo_key] = time.monotonic() + self.cooldown_seconds
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Prefetch failed for {service}/{owner}/{repo}/{path}: {e}")
+        finally:
+            self._inflight.discard(key)
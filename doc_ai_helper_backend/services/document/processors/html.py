@@ -22,6 +22,7 @@ from doc_ai_helper_backend.services.document.processors.base import (
 from doc_ai_helper_backend.services.document.utils.html_analyzer import (
     HTMLAnalyzer,
 )
+from doc_ai_helper_backend.services.document.utils.links import LinkTransformer
 
 logger = logging.getLogger("doc_ai_helper")
 
@@ -283,6 +284,12 @@ class HTMLProcessor(DocumentProcessorBase):
         Returns:
             構築されたRaw URL（失敗時はNone）
         """
+        from doc_ai_helper_backend.core.config import settings
+
+        # アセットプロキシ経由（ディスクキャッシュ・条件付きリクエスト対応）
+        if settings.enable_asset_proxy:
+            return LinkTransformer.build_asset_proxy_url(service, owner, repo, ref, path)
+
         # パスの先頭スラッシュを削除
         clean_path = path.lstrip("/")
         
@@ -290,7 +297,6 @@ class HTMLProcessor(DocumentProcessorBase):
             return f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{clean_path}"
         elif service.lower() == "forgejo":
             # Forgejoの場合は設定からベースURLを取得
-            from doc_ai_helper_backend.core.config import settings
             if settings.forgejo_base_url:
                 base_url = settings.forgejo_base_url.rstrip("/")
                 return f"{base_url}/{owner}/{repo}/raw/{ref}/{clean_path}"
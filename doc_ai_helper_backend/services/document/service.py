@@ -7,22 +7,30 @@ import os
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
+from doc_ai_helper_backend.core.config import settings
 from doc_ai_helper_backend.core.exceptions import (
     DocumentParsingException,
     GitServiceException,
     GitHubRepositoryNotFoundError,
     NotFoundException,
+    RateLimitException,
 )
 from doc_ai_helper_backend.models.document import (
     DocumentResponse,
     DocumentType,
     RepositoryStructureResponse,
 )
+from doc_ai_helper_backend.models.link_graph import (
+    BacklinksResponse,
+    BrokenLinksResponse,
+)
 from doc_ai_helper_backend.models.link_info import LinkInfo
+from doc_ai_helper_backend.services.document.link_graph import link_graph_registry
 from doc_ai_helper_backend.services.document.processors.factory import (
     DocumentProcessorFactory,
 )
 from doc_ai_helper_backend.services.git.factory import GitServiceFactory
+from doc_ai_helper_backend.services.git.raw_stream import ByteRangeSpec, RawFileStream
 
 # Logger
 logger = logging.getLogger("doc_ai_helper")
@@ -50,6 +58,7 @@ class DocumentService:
         transform_links: bool = True,
         base_url: Optional[str] = None,
         root_path: Optional[str] = None,
+        extract_links: bool = True,
     ) -> DocumentResponse:
         """Get document from a Git repository.
 
@@ -63,6 +72,8 @@ class DocumentService:
             transform_links: Whether to transform relative links to absolute. Default is True
             base_url: Base URL for link transformation. If None, will be constructed from request parameters
             root_path: Root directory path for link resolution. If specified, relative links are resolved from this directory
+            extract_links: Whether to extract links. Default is True. Without
+                links the link graph is not updated
 
         Returns:
             DocumentResponse: Document data
@@ -75,12 +86,38 @@ class DocumentService:
         logger.info(f"Getting document from {service}/{owner}/{repo}/{path} at {ref}")
 
         # Check cache if enabled
+        cache_key = self._document_cache_key(
+            service, owner, repo, path, ref, transform_links, root_path, extract_links
+        )
+        # A variant with links also serves requests that don't need them
+        lookup_keys = [cache_key]
+        if not extract_links:
+            lookup_keys.insert(
+                0,
+                self._document_cache_key(
+                    service, owner, repo, path, ref, transform_links, root_path
+                ),
+            )
+        missing_key = self._missing_cache_key(service, owner, repo, path, ref)
+        negative_cache = use_cache and settings.document_negative_cache_ttl > 0
         if use_cache and self.cache_service:
-            cache_key = f"document:{service}:{owner}:{repo}:{path}:{ref}"
-            cached_doc = await self.cache_service.get(cache_key)
-            if cached_doc:
-                logger.info(f"Document found in cache: {cache_key}")
-                return cached_doc
+            for lookup_key in lookup_keys:
+                cached_doc = await self.cache_service.get(lookup_key)
+                if cached_doc:
+                    logger.info(f"Document found in cache: {lookup_key}")
+                    return cached_doc
+            if negative_cache and await self.cache_service.get(missing_key):
+                logger.info(f"Document known to be missing: {missing_key}")
+                raise NotFoundException(f"Document not found: {path}")
+
+        # Answer missing paths locally from a fresh tree index
+        if negative_cache:
+            graph = link_graph_registry.get(service, owner, repo, ref)
+            if graph is not None and graph.path_exists(
+                path, max_age=settings.document_cache_ttl
+            ) is False:
+                logger.info(f"Document not in tree index: {service}/{owner}/{repo}/{path}")
+                raise NotFoundException(f"Document not found: {path}")
 
         try:
             # Get Git service
@@ -115,8 +152,8 @@ class DocumentService:
                 if processed_metadata:
                     document.metadata.extra = processed_metadata
 
-                # Extract links
-                links = processor.extract_links(raw_content, path)
+                # Extract links (skipped when not requested)
+                links = processor.extract_links(raw_content, path) if extract_links else None
 
                 # Transform links if requested
                 if transform_links:
@@ -135,6 +172,12 @@ class DocumentService:
                 # Add links to document
                 document.links = links
 
+                # Update the cross-document link graph (skipped for unchanged SHAs)
+                if links is not None:
+                    link_graph_registry.get_or_create(
+                        service, owner, repo, ref
+                    ).update_document(path, document.metadata.sha, links, root_path)
+
             except Exception as e:
                 logger.error(f"Error processing document: {str(e)}")
                 # Fallback to original document if processing fails
@@ -142,16 +185,20 @@ class DocumentService:
 
             # Cache document if cache is enabled
             if use_cache and self.cache_service:
-                cache_key = f"document:{service}:{owner}:{repo}:{path}:{ref}"
                 await self.cache_service.set(cache_key, document)
 
             return document
 
-        except GitHubRepositoryNotFoundError as e:
-            logger.warning(f"Repository not found: {service}/{owner}/{repo}")
-            raise
-        except NotFoundException as e:
+        except (GitHubRepositoryNotFoundError, NotFoundException) as e:
             logger.warning(f"Document not found: {service}/{owner}/{repo}/{path}")
+            # Short-lived negative entry so repeated misses skip the Git service
+            if negative_cache and self.cache_service:
+                await self.cache_service.set(
+                    missing_key, e.message, ttl=settings.document_negative_cache_ttl
+                )
+            raise
+        except RateLimitException as e:
+            logger.warning(f"Rate limit exceeded: {service}/{owner}/{repo}/{path}")
             raise
         except GitServiceException as e:
             logger.error(f"Git service error: {str(e)}")
@@ -160,6 +207,213 @@ class DocumentService:
             logger.error(f"Error getting document: {str(e)}")
             raise DocumentParsingException(f"Error processing document: {str(e)}")
 
+    async def open_raw_stream(
+        self,
+        service: str,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str = "main",
+        byte_range: Optional[ByteRangeSpec] = None,
+    ) -> RawFileStream:
+        """Open a streaming read of a file's raw content.
+
+        Raw content is not processed or cached; it is streamed in chunks from
+        the Git service's raw endpoint, so large files do not have to fit in
+        memory. Known-missing paths are rejected from the negative cache.
+
+        Args:
+            service: Git service type (github, gitlab, etc.)
+            owner: Repository owner
+            repo: Repository name
+            path: File path
+            ref: Branch or tag name. Default is "main"
+            byte_range: Requested byte range, forwarded upstream
+
+        Returns:
+            RawFileStream: Open raw content stream
+
+        Raises:
+            NotFoundException: If the file is not found
+            GitServiceException: If there is an error with the Git service
+        """
+        logger.info(f"Streaming raw content of {service}/{owner}/{repo}/{path} at {ref}")
+
+        missing_key = self._missing_cache_key(service, owner, repo, path, ref)
+        if (
+            self.cache_service
+            and settings.document_negative_cache_ttl > 0
+            and await self.cache_service.get(missing_key)
+        ):
+            raise NotFoundException(f"Document not found: {path}")
+
+        git_service = GitServiceFactory.create(service)
+        return await git_service.open_raw_stream(owner, repo, path, ref, byte_range)
+
+    async def get_blob_sha(
+        self, service: str, owner: str, repo: str, path: str, ref: str = "main"
+    ) -> Optional[str]:
+        """Look up the blob SHA of a file in the (cached) repository tree.
+
+        Args:
+            service: Git service type (github, gitlab, etc.)
+            owner: Repository owner
+            repo: Repository name
+            path: File path
+            ref: Branch or tag name. Default is "main"
+
+        Returns:
+            Optional[str]: Blob SHA, or None if the path is not in the tree
+            (e.g. a truncated tree) or the tree has no SHAs
+
+        Raises:
+            NotFoundException: If repository is not found
+            GitServiceException: If there is an error with the Git service
+        """
+        structure = await self.get_repository_structure(service, owner, repo, ref)
+        path = path.lstrip("/")
+        for item in structure.tree:
+            if item.path == path and item.type == "file":
+                return item.sha or None
+        return None
+
+    @staticmethod
+    def _document_cache_key(
+        service: str,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str,
+        transform_links: bool = True,
+        root_path: Optional[str] = None,
+        extract_links: bool = True,
+    ) -> str:
+        """Build the cache key of a processed document.
+
+        The default variant (transformed links, no root path, links
+        extracted) uses the plain
+        ``document:{service}:{owner}:{repo}:{path}:{ref}`` key; other variants
+        get a suffix so differently processed responses never collide.
+
+        Returns:
+            str: Cache key
+        """
+        cache_key = f"document:{service}:{owner}:{repo}:{path}:{ref}"
+        if not transform_links:
+            cache_key += "|raw"
+        elif root_path:
+            cache_key += f"|root={root_path}"
+        if not extract_links:
+            cache_key += "|nolinks"
+        return cache_key
+
+    @staticmethod
+    def _missing_cache_key(
+        service: str, owner: str, repo: str, path: str, ref: str
+    ) -> str:
+        """Build the negative cache key of a missing document.
+
+        Returns:
+            str: Cache key
+        """
+        return f"missing:{service}:{owner}:{repo}:{path}:{ref}"
+
+    @staticmethod
+    def cache_key_matches(
+        key: str,
+        service: Optional[str] = None,
+        owner: Optional[str] = None,
+        repo: Optional[str] = None,
+        ref: Optional[str] = None,
+    ) -> bool:
+        """Check whether a cache key belongs to a repository (and ref).
+
+        Understands the ``document:``, ``missing:`` and ``structure:`` key
+        schemes; other keys never match.
+
+        Args:
+            key: Cache key
+            service: Git service type, None matches any
+            owner: Repository owner, None matches any
+            repo: Repository name, None matches any
+            ref: Branch or tag name, None matches any
+
+        Returns:
+            bool: True if every given filter matches the key
+        """
+        namespace, _, rest = key.partition(":")
+        parts = rest.split("|", 1)[0].split(":")
+        if namespace in ("document", "missing") and len(parts) >= 5:
+            key_ref = parts[-1]
+        elif namespace == "structure" and len(parts) >= 5:
+            key_ref = parts[3]
+        else:
+            return False
+        expected = (service, owner, repo, ref)
+        actual = (parts[0], parts[1], parts[2], key_ref)
+        return all(e is None or e == a for e, a in zip(expected, actual))
+
+    async def invalidate_document(
+        self,
+        service: str,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str = "main",
+        root_path: Optional[str] = None,
+    ) -> None:
+        """Drop the cached variants of a document.
+
+        Removes the default, raw and (if given) root-path variants, with and
+        without extracted links, and any negative entry for the path.
+
+        Args:
+            service: Git service type (github, gitlab, etc.)
+            owner: Repository owner
+            repo: Repository name
+            path: Document path
+            ref: Branch or tag name. Default is "main"
+            root_path: Root directory path used for link resolution
+        """
+        if not self.cache_service:
+            return
+        keys = {
+            self._document_cache_key(service, owner, repo, path, ref),
+            self._document_cache_key(service, owner, repo, path, ref, False),
+            self._missing_cache_key(service, owner, repo, path, ref),
+        }
+        if root_path:
+            keys.add(
+                self._document_cache_key(service, owner, repo, path, ref, True, root_path)
+            )
+        # Variants processed without link extraction
+        keys |= {
+            self._document_cache_key(
+                service, owner, repo, path, ref, transform_links, variant_root, False
+            )
+            for transform_links in (True, False)
+            for variant_root in {None, root_path}
+        }
+        for key in keys:
+            await self.cache_service.delete(key)
+
+    async def invalidate_structure(
+        self, service: str, owner: str, repo: str, ref: str = "main", path: str = ""
+    ) -> None:
+        """Drop a cached repository structure.
+
+        Args:
+            service: Git service type (github, gitlab, etc.)
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+            path: Path prefix of the cached structure. Default is ""
+        """
+        if self.cache_service:
+            await self.cache_service.delete(
+                f"structure:{service}:{owner}:{repo}:{ref}:{path}"
+            )
+
     async def get_repository_structure(
         self,
         service: str,
@@ -212,6 +466,13 @@ class DocumentService:
                 cache_key = f"structure:{service}:{owner}:{repo}:{ref}:{path}"
                 await self.cache_service.set(cache_key, structure)
 
+            # Keep the full tree as the link graph's index for broken-link checks.
+            # A truncated tree would report existing files as missing.
+            if not path and not structure.truncated:
+                link_graph_registry.get_or_create(service, owner, repo, ref).set_tree(
+                    item.path for item in structure.tree
+                )
+
             return structure
 
         except GitHubRepositoryNotFoundError as e:
@@ -229,6 +490,75 @@ class DocumentService:
                 f"Error processing repository structure: {str(e)}"
             )
 
+    async def get_backlinks(
+        self, service: str, owner: str, repo: str, path: str, ref: str = "main"
+    ) -> BacklinksResponse:
+        """Get documents linking to a path.
+
+        Only documents already processed by this service are known to the
+        link graph; no documents are fetched.
+
+        Args:
+            service: Git service type (github, gitlab, etc.)
+            owner: Repository owner
+            repo: Repository name
+            path: Target document path
+            ref: Branch or tag name. Default is "main"
+
+        Returns:
+            BacklinksResponse: Backlinks of the target path
+        """
+        graph = link_graph_registry.get(service, owner, repo, ref)
+        return BacklinksResponse(
+            service=service,
+            owner=owner,
+            repo=repo,
+            ref=ref,
+            path=path,
+            backlinks=graph.backlinks(path) if graph else [],
+            indexed_documents=graph.document_count if graph else 0,
+        )
+
+    async def get_broken_links(
+        self, service: str, owner: str, repo: str, ref: str = "main"
+    ) -> BrokenLinksResponse:
+        """Get internal links whose target does not exist in the repository.
+
+        Links are checked against the tree index of the link graph. The
+        repository structure is fetched (or read from cache) only when no
+        tree index is available yet; a truncated tree is not used as an index,
+        so no links are checked for it.
+
+        Args:
+            service: Git service type (github, gitlab, etc.)
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+
+        Returns:
+            BrokenLinksResponse: Broken internal links
+
+        Raises:
+            NotFoundException: If repository is not found
+            GitServiceException: If there is an error with the Git service
+        """
+        graph = link_graph_registry.get_or_create(service, owner, repo, ref)
+        if not graph.has_tree:
+            structure = await self.get_repository_structure(service, owner, repo, ref)
+            if not structure.truncated:
+                graph.set_tree(item.path for item in structure.tree)
+
+        broken_links, checked_links = graph.broken_links()
+        return BrokenLinksResponse(
+            service=service,
+            owner=owner,
+            repo=repo,
+            ref=ref,
+            broken_links=broken_links,
+            checked_links=checked_links,
+            indexed_documents=graph.document_count,
+        )
+
     async def search_repository(
         self, service: str, owner: str, repo: str, query: str, limit: int = 10
     ) -> Dict:
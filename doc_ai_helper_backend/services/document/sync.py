@@ -0,0 +1,235 @@
+"""
+Incremental repository sync.
+
+Keeps the document, structure, link graph and search caches of a repository
+fresh by comparing the last synced commit with the current head and
+refreshing only the changed paths, so sync cost scales with the size of the
+change rather than the size of the repository.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional, Set
+
+from doc_ai_helper_backend.core.exceptions import (
+    GitServiceException,
+    NotFoundException,
+)
+from doc_ai_helper_backend.models.document import FileChange, RepositorySyncResult
+from doc_ai_helper_backend.services.document.link_graph import link_graph_registry
+from doc_ai_helper_backend.services.git.factory import GitServiceFactory
+from doc_ai_helper_backend.services.llm.repository_index import (
+    INDEXABLE_EXTENSIONS,
+    repository_index_registry,
+)
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+# Change statuses meaning the path no longer exists at the head commit
+REMOVED_STATUSES = {"removed", "deleted"}
+
+
+class RepositorySyncEngine:
+    """Refreshes repository caches from commit comparisons."""
+
+    def __init__(
+        self,
+        document_service,
+        max_changed_paths: int = 200,
+        max_documents: int = 200,
+        concurrency: int = 4,
+    ):
+        """Initialize the sync engine.
+
+        Args:
+            document_service: Cached DocumentService used for fetching
+            max_changed_paths: Change sets larger than this trigger a full sync
+            max_documents: Documents kept in the search index on a full sync
+            concurrency: Concurrent document fetches
+        """
+        self.document_service = document_service
+        self.max_changed_paths = max_changed_paths
+        self.max_documents = max_documents
+        self.concurrency = concurrency
+
+    async def sync(
+        self,
+        service: str,
+        owner: str,
+        repo: str,
+        ref: str = "main",
+        root_path: Optional[str] = None,
+        last_commit: Optional[str] = None,
+    ) -> RepositorySyncResult:
+        """Sync the caches of a repository to the head of a branch.
+
+        Without a last commit, or when the comparison is unavailable (e.g.
+        after a force push) or too large, falls back to a full sync that
+        still only refetches documents whose blob SHA changed.
+
+        Args:
+            service: Git service type (github, forgejo, mock)
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+            root_path: Documentation root directory. Default is the repository root
+            last_commit: Commit SHA of the previous sync
+
+        Returns:
+            RepositorySyncResult: Sync result, including the commit to record
+
+        Raises:
+            NotFoundException: If repository or ref is not found
+            GitServiceException: If there is an error with the Git service
+        """
+        git_service = GitServiceFactory.create(service)
+        head = await git_service.get_latest_commit(owner, repo, ref)
+        result = RepositorySyncResult(
+            service=service,
+            owner=owner,
+            repo=repo,
+            ref=ref,
+            previous_commit=last_commit,
+            current_commit=head,
+            mode="unchanged",
+        )
+        if last_commit == head:
+            return result
+
+        changes: Optional[List[FileChange]] = None
+        if last_commit:
+            try:
+                changes = await git_service.compare_commits(owner, repo, last_commit, head)
+            except (NotFoundException, GitServiceException) as e:
+                logger.warning(
+                    f"Cannot compare {service}/{owner}/{repo} {last_commit}...{head}, "
+                    f"falling back to full sync: {e}"
+                )
+
+        if changes is None or len(changes) > self.max_changed_paths:
+            result.mode = "full"
+            await self._full_sync(result, root_path)
+        else:
+            result.mode = "incremental"
+            await self._incremental_sync(result, changes, root_path)
+
+        logger.info(
+            f"Synced {service}/{owner}/{repo}@{ref} to {head} ({result.mode}): "
+            f"{len(result.refreshed)} refreshed, {len(result.removed)} removed"
+        )
+        return result
+
+    async def _incremental_sync(
+        self,
+        result: RepositorySyncResult,
+        changes: List[FileChange],
+        root_path: Optional[str],
+    ) -> None:
+        """Refresh only the changed paths."""
+        service, owner, repo, ref = result.service, result.owner, result.repo, result.ref
+        index = repository_index_registry.get(service, owner, repo, ref)
+        graph = link_graph_registry.get(service, owner, repo, ref)
+
+        removed: Set[str] = set()
+        refreshed: Set[str] = set()
+        for change in changes:
+            if change.previous_path and change.previous_path != change.path:
+                removed.add(change.previous_path)
+            if change.status in REMOVED_STATUSES:
+                removed.add(change.path)
+            else:
+                refreshed.add(change.path)
+        removed -= refreshed
+
+        for path in sorted(removed | refreshed):
+            await self.document_service.invalidate_document(
+                service, owner, repo, path, ref, root_path
+            )
+        for path in sorted(removed):
+            if index is not None:
+                index.remove_document(path)
+            if graph is not None:
+                graph.remove_document(path)
+
+        if changes:
+            # Blob SHAs and (for adds/removes) the tree itself changed
+            await self.document_service.invalidate_structure(service, owner, repo, ref)
+            await self.document_service.get_repository_structure(service, owner, repo, ref)
+
+        await self._refetch(result, [p for p in sorted(refreshed) if self._is_indexable(p, root_path)])
+        result.removed = sorted(removed)
+
+    async def _full_sync(
+        self, result: RepositorySyncResult, root_path: Optional[str]
+    ) -> None:
+        """Refetch documents whose blob SHA differs from the indexed one."""
+        service, owner, repo, ref = result.service, result.owner, result.repo, result.ref
+        await self.document_service.invalidate_structure(service, owner, repo, ref)
+        structure = await self.document_service.get_repository_structure(
+            service, owner, repo, ref
+        )
+
+        index = repository_index_registry.get_or_create(service, owner, repo, ref)
+        graph = link_graph_registry.get(service, owner, repo, ref)
+        current = dict(
+            [
+                (item.path, item.sha)
+                for item in structure.tree
+                if item.type == "file" and self._is_indexable(item.path, root_path)
+            ][: self.max_documents]
+        )
+
+        removed = [path for path in index.paths() if path not in current]
+        for path in removed:
+            await self.document_service.invalidate_document(
+                service, owner, repo, path, ref, root_path
+            )
+            index.remove_document(path)
+            if graph is not None:
+                graph.remove_document(path)
+
+        changed = [
+            path
+            for path, sha in sorted(current.items())
+            if not (sha and index.has_document(path, sha))
+        ]
+        for path in changed:
+            await self.document_service.invalidate_document(
+                service, owner, repo, path, ref, root_path
+            )
+        await self._refetch(result, changed)
+        result.removed = sorted(removed)
+        index.built_at = time.time()
+
+    async def _refetch(self, result: RepositorySyncResult, paths: List[str]) -> None:
+        """Fetch documents into the caches and the search index."""
+        service, owner, repo, ref = result.service, result.owner, result.repo, result.ref
+        index = repository_index_registry.get_or_create(service, owner, repo, ref)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        refreshed: List[str] = []
+
+        async def fetch(path: str) -> None:
+            async with semaphore:
+                try:
+                    document = await self.document_service.get_document(
+                        service, owner, repo, path, ref
+                    )
+                except NotFoundException:
+                    logger.debug(f"Changed path vanished during sync: {path}")
+                    return
+                index.add_document(path, document.content.content, document.metadata.sha)
+                refreshed.append(path)
+
+        await asyncio.gather(*(fetch(path) for path in paths))
+        result.refreshed = sorted(refreshed)
+
+    @staticmethod
+    def _is_indexable(path: str, root_path: Optional[str]) -> bool:
+        """Check whether a path is a document under the root path."""
+        prefix = (root_path or "").strip("/")
+        return os.path.splitext(path)[1].lower() in INDEXABLE_EXTENSIONS and (
+            not prefix or path.startswith(prefix + "/")
+        )
@@ -438,11 +438,36 @@ class LinkTransformer:
 
         return original_tag.replace(url, transformed_url)
 
+    @staticmethod
+    def build_asset_proxy_url(service: str, owner: str, repo: str, ref: str, path: str) -> str:
+        """
+        アセットプロキシ経由のURLを構築する。
+
+        Args:
+            service: Gitサービス名
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            ref: ブランチ/タグ名
+            path: ファイルパス
+
+        Returns:
+            アセットプロキシエンドポイントのURL
+        """
+        from doc_ai_helper_backend.core.config import settings
+
+        clean_path = path.lstrip("/")
+        return (
+            f"{settings.api_prefix}/documents/assets/{service}/{owner}/{repo}/"
+            f"{clean_path}?ref={ref}"
+        )
+
     @staticmethod
     def _build_raw_url(service: str, owner: str, repo: str, ref: str, path: str, service_base_url: Optional[str] = None) -> Optional[str]:
         """
         外部Raw URLを構築する。
 
+        アセットプロキシが有効な場合は、プロキシ経由のURLを返す。
+
         Args:
             service: Gitサービス名
             owner: リポジトリオーナー
@@ -454,6 +479,12 @@ class LinkTransformer:
         Returns:
             構築されたRaw URL（失敗時はNone）
         """
+        from doc_ai_helper_backend.core.config import settings
+
+        # アセットプロキシ経由（ディスクキャッシュ・条件付きリクエスト対応）
+        if settings.enable_asset_proxy:
+            return LinkTransformer.build_asset_proxy_url(service, owner, repo, ref, path)
+
         # パスの先頭スラッシュを削除
         clean_path = path.lstrip("/")
         
@@ -466,7 +497,6 @@ class LinkTransformer:
                 return f"{base_url}/{owner}/{repo}/raw/{ref}/{clean_path}"
             else:
                 # ベースURLが不明な場合は設定から取得を試みる
-                from doc_ai_helper_backend.core.config import settings
                 if settings.forgejo_base_url:
                     base_url = settings.forgejo_base_url.rstrip("/")
                     return f"{base_url}/{owner}/{repo}/raw/{ref}/{clean_path}"
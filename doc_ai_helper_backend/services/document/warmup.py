@@ -0,0 +1,206 @@
+"""
+Background warm-up of registered repositories.
+
+A newly registered repository is cold: its structure, documents and
+repository-wide search index are only fetched when the first user asks for
+them. The warmer fetches them in the background, on registration and on a
+fixed interval, so the first user gets hot-cache latency.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from doc_ai_helper_backend.core.exceptions import (
+    GitHubRateLimitError,
+    RateLimitException,
+)
+from doc_ai_helper_backend.services.llm.repository_index import (
+    repository_index_registry,
+)
+
+# Logger
+logger = logging.getLogger("doc_ai_helper")
+
+WarmupKey = Tuple[str, str, str, str]
+# (service, owner, repo, ref, root_path)
+WarmupTarget = Tuple[str, str, str, str, Optional[str]]
+
+
+class RepositoryWarmer:
+    """Warms document, structure and search caches of repositories."""
+
+    def __init__(
+        self,
+        document_service,
+        max_concurrent_repositories: int = 2,
+        cooldown_seconds: float = 60.0,
+    ):
+        """Initialize the warmer.
+
+        Args:
+            document_service: Cached DocumentService used for fetching
+            max_concurrent_repositories: Repositories warmed at the same time
+            cooldown_seconds: Pause per repository after a rate-limit error
+        """
+        self.document_service = document_service
+        self.cooldown_seconds = cooldown_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrent_repositories)
+        self._cooldown_until: Dict[Tuple[str, str, str], float] = {}
+        self._inflight: Set[WarmupKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._periodic_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued or running warm-ups."""
+        return len(self._inflight)
+
+    def is_cooling_down(self, service: str, owner: str, repo: str) -> bool:
+        """Check whether warm-up is paused for a repository."""
+        return self._cooldown_until.get((service, owner, repo), 0.0) > time.monotonic()
+
+    async def warm(
+        self,
+        service: str,
+        owner: str,
+        repo: str,
+        ref: str = "main",
+        root_path: Optional[str] = None,
+    ) -> int:
+        """Warm the caches of one repository.
+
+        Fetches the full repository structure, then every indexable document
+        under ``root_path`` through the cached DocumentService. Documents are
+        requested in the default (link-transformed) variant used by the
+        documents endpoint and the LLM orchestrator, and their content is
+        added to the repository-wide search index.
+
+        Args:
+            service: Git service type (github, forgejo, mock)
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+            root_path: Documentation root directory. Default is the repository root
+
+        Returns:
+            int: Number of documents in the search index after warm-up
+
+        Raises:
+            NotFoundException: If repository is not found
+            GitServiceException: If there is an error with the Git service
+        """
+        started = time.monotonic()
+        index = await repository_index_registry.rebuild(
+            self.document_service,
+            service,
+            owner,
+            repo,
+            ref,
+            root_path=root_path or "",
+            transform_links=True,
+            skip_unchanged=False,
+        )
+        logger.info(
+            f"Warmed {service}/{owner}/{repo}@{ref}: {index.document_count} documents "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return index.document_count
+
+    def schedule(
+        self,
+        service: str,
+        owner: str,
+        repo: str,
+        ref: str = "main",
+        root_path: Optional[str] = None,
+    ) -> bool:
+        """Schedule a background warm-up of a repository.
+
+        Args:
+            service: Git service type (github, forgejo, mock)
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+            root_path: Documentation root directory
+
+        Returns:
+            bool: True if a warm-up was scheduled, False if one is already
+            pending or the repository is cooling down after a rate limit
+        """
+        key = (service, owner, repo, ref)
+        if key in self._inflight or self.is_cooling_down(service, owner, repo):
+            return False
+        self._inflight.add(key)
+        task = asyncio.create_task(self._run(key, root_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def start_periodic(
+        self,
+        list_targets: Callable[[], Awaitable[Iterable[WarmupTarget]]],
+        interval_seconds: float,
+    ) -> None:
+        """Start re-warming repositories on a fixed interval.
+
+        Args:
+            list_targets: Coroutine function returning the repositories to warm
+            interval_seconds: Seconds between warm-up rounds
+        """
+        if self._periodic_task is None or self._periodic_task.done():
+            self._periodic_task = asyncio.create_task(
+                self._periodic(list_targets, interval_seconds)
+            )
+
+    async def close(self) -> None:
+        """Cancel the periodic job and all pending warm-ups."""
+        tasks = list(self._tasks)
+        if self._periodic_task is not None:
+            tasks.append(self._periodic_task)
+            self._periodic_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+    async def _periodic(
+        self,
+        list_targets: Callable[[], Awaitable[Iterable[WarmupTarget]]],
+        interval_seconds: float,
+    ) -> None:
+        """Schedule warm-ups for all targets, then sleep, until cancelled."""
+        while True:
+            try:
+                targets = list(await list_targets())
+                scheduled = sum(1 for target in targets if self.schedule(*target))
+                logger.info(f"Scheduled warm-up of {scheduled}/{len(targets)} repositories")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to list repositories for warm-up: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    async def _run(self, key: WarmupKey, root_path: Optional[str]) -> None:
+        """Run a scheduled warm-up, logging instead of raising."""
+        service, owner, repo, ref = key
+        try:
+            async with self._semaphore:
+                if self.is_cooling_down(service, owner, repo):
+                    return
+                await self.warm(service, owner, repo, ref, root_path)
+        except (RateLimitException, GitHubRateLimitError):
+            logger.warning(
+                f"Rate limit hit while warming {service}/{owner}/{repo}; "
+                f"pausing warm-up for {self.cooldown_seconds}s"
+            )
+            self._cooldown_until[(service, owner, repo)] = (
+                time.monotonic() + self.cooldown_seconds
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Warm-up failed for {service}/{owner}/{repo}@{ref}: {e}")
+        finally:
+            self._inflight.discard(key)
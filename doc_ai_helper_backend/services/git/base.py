@@ -6,6 +6,8 @@ import abc
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+import httpx
+
 from doc_ai_helper_backend.core.exceptions import (
     GitServiceException,
     NotFoundException,
@@ -17,9 +19,17 @@ from doc_ai_helper_backend.models.document import (
     DocumentMetadata,
     DocumentResponse,
     DocumentType,
+    FileChange,
     FileTreeItem,
     RepositoryStructureResponse,
 )
+from doc_ai_helper_backend.services.git.raw_stream import (
+    RAW_CHUNK_SIZE,
+    ByteRangeSpec,
+    RawFileStream,
+    format_range_header,
+    parse_content_range,
+)
 
 
 class GitServiceBase(abc.ABC):
@@ -179,6 +189,174 @@ class GitServiceBase(abc.ABC):
         """
         pass
 
+    async def open_raw_stream(
+        self,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str = "main",
+        byte_range: Optional[ByteRangeSpec] = None,
+    ) -> RawFileStream:
+        """Open a streaming read of a file's raw content.
+
+        The default implementation loads the document through
+        ``get_document`` and ignores ``byte_range``; services with raw/blob
+        endpoints override it to stream from upstream.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            path: File path
+            ref: Branch or tag name. Default is "main"
+            byte_range: Requested byte range, forwarded upstream when supported
+
+        Returns:
+            RawFileStream: Open raw content stream
+
+        Raises:
+            NotFoundException: If the file is not found
+            GitServiceException: If there is an error with the Git service
+            UnauthorizedException: If access is unauthorized
+            RateLimitException: If rate limit is exceeded
+        """
+        document = await self.get_document(owner, repo, path, ref)
+        return RawFileStream.from_bytes(
+            document.content.content.encode("utf-8"), etag=document.metadata.sha
+        )
+
+    async def _open_http_stream(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        byte_range: Optional[ByteRangeSpec] = None,
+        context: str = "Raw content",
+    ) -> RawFileStream:
+        """Open a streaming GET request against a raw/blob endpoint.
+
+        Args:
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            byte_range: Byte range to request upstream
+            context: Context description for error messages
+
+        Returns:
+            RawFileStream: Open raw content stream
+
+        Raises:
+            NotFoundException: If resource is not found (404)
+            UnauthorizedException: If access is unauthorized (401/403)
+            RateLimitException: If rate limit is exceeded
+            GitServiceException: For other errors
+        """
+        # Byte counts and ranges must refer to the bytes that are forwarded,
+        # and aiter_bytes() decodes any content coding
+        request_headers = {**headers, "Accept-Encoding": "identity"}
+        if byte_range is not None:
+            request_headers["Range"] = format_range_header(byte_range)
+
+        client = httpx.AsyncClient(follow_redirects=True)
+        try:
+            request = client.build_request("GET", url, headers=request_headers, params=params)
+            response = await client.send(request, stream=True)
+        except httpx.RequestError as e:
+            await client.aclose()
+            raise GitServiceException(f"{context}: Request error: {str(e)}")
+
+        async def close() -> None:
+            await response.aclose()
+            await client.aclose()
+
+        if response.status_code == 416:
+            # Let the caller resolve the range against the full content
+            await close()
+            return await self._open_http_stream(url, headers, params, None, context)
+        if response.status_code >= 400:
+            await response.aread()
+            await close()
+            if (
+                response.status_code == 403
+                and response.headers.get("X-RateLimit-Remaining") == "0"
+            ):
+                raise RateLimitException(f"{context}: Rate limit exceeded")
+            self._handle_http_error(response, context)
+
+        encoded = response.headers.get("Content-Encoding", "identity").lower() != "identity"
+        # The upstream length of an encoded body is not the decoded length
+        content_length = None if encoded else response.headers.get("Content-Length")
+        content_range = None
+        if response.status_code == 206 and encoded:
+            # Range offsets of an encoded body do not apply to the decoded bytes
+            await close()
+            return await self._open_http_stream(url, headers, params, None, context)
+        if response.status_code == 206:
+            content_range = parse_content_range(response.headers.get("Content-Range"))
+            if content_range is None:
+                # Unusable partial response: fetch the full content instead
+                await close()
+                return await self._open_http_stream(url, headers, params, None, context)
+        forwarded = {
+            name: response.headers[name]
+            for name in ("Last-Modified",)
+            if name in response.headers
+        }
+        return RawFileStream(
+            response.aiter_bytes(RAW_CHUNK_SIZE),
+            status_code=206 if content_range else 200,
+            content_length=int(content_length) if content_length else None,
+            content_range=content_range,
+            etag=response.headers.get("ETag"),
+            headers=forwarded,
+            close=close,
+        )
+
+    async def get_latest_commit(
+        self, owner: str, repo: str, ref: str = "main"
+    ) -> str:
+        """Get the commit SHA a branch or tag points to.
+
+        Services without commit support raise GitServiceException; callers
+        treat that as "cannot sync incrementally".
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+
+        Returns:
+            str: Commit SHA
+
+        Raises:
+            NotFoundException: If repository or ref is not found
+            GitServiceException: If the service does not support commit lookup
+        """
+        raise GitServiceException(
+            f"Commit lookup is not supported by {self.service_name}"
+        )
+
+    async def compare_commits(
+        self, owner: str, repo: str, base: str, head: str
+    ) -> List[FileChange]:
+        """Get the files changed between two commits.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            base: Base commit SHA
+            head: Head commit SHA
+
+        Returns:
+            List[FileChange]: Changed files
+
+        Raises:
+            NotFoundException: If a commit is not found (e.g. after a force push)
+            GitServiceException: If the service does not support comparison
+        """
+        raise GitServiceException(
+            f"Commit comparison is not supported by {self.service_name}"
+        )
+
     def _handle_http_error(self, response: Any, context: str) -> None:
         """Handle HTTP errors in a standardized way.
 
@@ -24,10 +24,12 @@ from doc_ai_helper_backend.models.document import (
     DocumentMetadata,
     DocumentResponse,
     DocumentType,
+    FileChange,
     FileTreeItem,
     RepositoryStructureResponse,
 )
 from doc_ai_helper_backend.services.git.base import GitServiceBase
+from doc_ai_helper_backend.services.git.raw_stream import ByteRangeSpec, RawFileStream
 
 # Logger
 logger = logging.getLogger("doc_ai_helper")
@@ -314,6 +316,107 @@ class ForgejoService(GitServiceBase):
             logger.error(f"Error getting repository structure from Forgejo: {str(e)}")
             raise GitServiceException(f"Failed to get repository structure: {str(e)}")
 
+    async def open_raw_stream(
+        self,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str = "main",
+        byte_range: Optional[ByteRangeSpec] = None,
+    ) -> RawFileStream:
+        """Stream a file's raw content from the Forgejo raw endpoint."""
+        return await self._open_http_stream(
+            f"{self.api_base_url}/repos/{owner}/{repo}/raw/{path}",
+            headers={**self._get_default_headers(), "Accept": "*/*"},
+            params={"ref": ref},
+            byte_range=byte_range,
+            context=f"Raw content of {owner}/{repo}/{path}",
+        )
+
+    async def get_latest_commit(
+        self, owner: str, repo: str, ref: str = "main"
+    ) -> str:
+        """Get the commit SHA a Forgejo branch or tag points to."""
+        try:
+            headers = self._get_default_headers()
+            async with httpx.AsyncClient() as client:
+                response = await self._make_request(
+                    client,
+                    "GET",
+                    f"{self.api_base_url}/repos/{owner}/{repo}/commits",
+                    headers=headers,
+                    params={"sha": ref, "limit": 1, "stat": "false", "files": "false"},
+                )
+
+                commits = response.json()
+                if not commits:
+                    raise NotFoundException(f"Ref not found: {owner}/{repo}@{ref}")
+                return commits[0]["sha"]
+
+        except (NotFoundException, UnauthorizedException, RateLimitException):
+            raise
+        except Exception as e:
+            logger.error(f"Error getting commit from Forgejo: {str(e)}")
+            raise GitServiceException(f"Failed to get commit: {str(e)}")
+
+    async def compare_commits(
+        self, owner: str, repo: str, base: str, head: str
+    ) -> List[FileChange]:
+        """Get the files changed between two Forgejo commits.
+
+        The compare API lists files per commit; the last status of each path
+        wins, and a file added then removed in the range is dropped. Renamed
+        entries carry ``previous_filename``, which is followed back to the
+        path at the base commit so that sync can invalidate it.
+        """
+        try:
+            headers = self._get_default_headers()
+            async with httpx.AsyncClient() as client:
+                response = await self._make_request(
+                    client,
+                    "GET",
+                    f"{self.api_base_url}/repos/{owner}/{repo}/compare/{base}...{head}",
+                    headers=headers,
+                )
+
+                # Forgejo lists commits newest first
+                changes: Dict[str, FileChange] = {}
+                for commit in reversed(response.json().get("commits") or []):
+                    for item in commit.get("files") or []:
+                        path = item["filename"]
+                        status = item.get("status", "modified")
+                        previous_path = None
+                        old_path = item.get("previous_filename")
+                        if old_path and old_path != path:
+                            moved = changes.pop(old_path, None)
+                            if moved and moved.status == "added":
+                                # Created within the range: still an addition
+                                status = "added"
+                            else:
+                                previous_path = (
+                                    moved.previous_path if moved and moved.previous_path
+                                    else old_path
+                                )
+                        previous = changes.get(path)
+                        if previous:
+                            previous_path = previous_path or previous.previous_path
+                            if previous.status == "added":
+                                if status == "removed":
+                                    del changes[path]
+                                    continue
+                                status = "added"
+                        changes[path] = FileChange(
+                            path=path, status=status, previous_path=previous_path
+                        )
+
+                return list(changes.values())
+
+        except (NotFoundException, UnauthorizedException, RateLimitException):
+            raise
+        except Exception as e:
+            logger.error(f"Error comparing commits on Forgejo: {str(e)}")
+            raise GitServiceException(f"Failed to compare commits: {str(e)}")
+
     async def search_repository(
         self, owner: str, repo: str, query: str, limit: int = 10
     ) -> List[Dict[str, Any]]:
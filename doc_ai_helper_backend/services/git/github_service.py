@@ -26,10 +26,12 @@ from doc_ai_helper_backend.models.document import (
     DocumentMetadata,
     DocumentResponse,
     DocumentType,
+    FileChange,
     FileTreeItem,
     RepositoryStructureResponse,
 )
 from doc_ai_helper_backend.services.git.base import GitServiceBase
+from doc_ai_helper_backend.services.git.raw_stream import ByteRangeSpec, RawFileStream
 
 # Logger
 logger = logging.getLogger("doc_ai_helper")
@@ -37,6 +39,9 @@ logger = logging.getLogger("doc_ai_helper")
 # GitHub API base URL
 GITHUB_API_BASE_URL = "https://api.github.com"
 
+# Maximum number of files listed by the compare API
+GITHUB_COMPARE_MAX_FILES = 300
+
 
 class GitHubService(GitServiceBase):
     """GitHub service implementation."""
@@ -190,6 +195,10 @@ class GitHubService(GitServiceBase):
             if data.get("encoding") == "base64" and data.get("content"):
                 # Decode content from base64
                 content = base64.b64decode(data["content"]).decode("utf-8")
+            elif data.get("encoding") == "none" and data.get("size"):
+                # Files over 1 MB are not inlined by the contents API
+                stream = await self.open_raw_stream(owner, repo, path, ref)
+                content = (await stream.read()).decode("utf-8")
             else:
                 # Handle other encodings or empty content
                 logger.warning(f"Unexpected content encoding: {data.get('encoding')}")
@@ -296,6 +305,11 @@ class GitHubService(GitServiceBase):
                     )
                 )
 
+            # GitHub stops listing large recursive trees at its size limit
+            truncated = bool(data.get("truncated"))
+            if truncated:
+                logger.warning(f"Repository tree of {owner}/{repo}@{ref} is truncated")
+
             # Build response
             return RepositoryStructureResponse(
                 service=self.service_name,
@@ -303,6 +317,7 @@ class GitHubService(GitServiceBase):
                 repo=repo,
                 ref=ref,
                 tree=tree_items,
+                truncated=truncated,
                 last_updated=datetime.utcnow(),
             )
 
@@ -317,6 +332,128 @@ class GitHubService(GitServiceBase):
                 f"Error getting repository structure from GitHub: {str(e)}"
             )
 
+    async def open_raw_stream(
+        self,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str = "main",
+        byte_range: Optional[ByteRangeSpec] = None,
+    ) -> RawFileStream:
+        """Stream a file's raw content from GitHub.
+
+        Uses the raw media type of the contents API, which serves files up
+        to 100 MB without base64 encoding and works for private
+        repositories with the configured token.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            path: File path
+            ref: Branch or tag name. Default is "main"
+            byte_range: Byte range to request upstream
+
+        Returns:
+            RawFileStream: Open raw content stream
+
+        Raises:
+            NotFoundException: If the file is not found
+            GitServiceException: If there is an error with the GitHub API
+            UnauthorizedException: If access is unauthorized
+            RateLimitException: If rate limit is exceeded
+        """
+        return await self._open_http_stream(
+            f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/contents/{path}",
+            headers={**self.headers, "Accept": "application/vnd.github.raw"},
+            params={"ref": ref},
+            byte_range=byte_range,
+            context=f"Raw content of {owner}/{repo}/{path}",
+        )
+
+    async def get_latest_commit(
+        self, owner: str, repo: str, ref: str = "main"
+    ) -> str:
+        """Get the commit SHA a GitHub branch or tag points to.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+
+        Returns:
+            str: Commit SHA
+
+        Raises:
+            NotFoundException: If repository or ref is not found
+            GitServiceException: If there is an error with the GitHub API
+            UnauthorizedException: If access is unauthorized
+            RateLimitException: If rate limit is exceeded
+        """
+        url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/commits/{ref}"
+
+        try:
+            data, _ = await self._make_request("GET", url)
+            return data["sha"]
+
+        except GitHubRepositoryNotFoundError as e:
+            raise e
+        except NotFoundException as e:
+            raise NotFoundException(f"Ref not found: {owner}/{repo}@{ref}")
+        except (UnauthorizedException, RateLimitException) as e:
+            raise e
+        except Exception as e:
+            raise GitServiceException(f"Error getting commit from GitHub: {str(e)}")
+
+    async def compare_commits(
+        self, owner: str, repo: str, base: str, head: str
+    ) -> List[FileChange]:
+        """Get the files changed between two GitHub commits.
+
+        GitHub lists at most 300 files per comparison. A comparison that hits
+        this limit may be incomplete, so it is reported as an error and
+        callers fall back to a full sync.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            base: Base commit SHA
+            head: Head commit SHA
+
+        Returns:
+            List[FileChange]: Changed files
+
+        Raises:
+            NotFoundException: If a commit is not found
+            GitServiceException: If there is an error with the GitHub API or
+                the change list may be truncated
+            UnauthorizedException: If access is unauthorized
+            RateLimitException: If rate limit is exceeded
+        """
+        url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/compare/{base}...{head}"
+
+        try:
+            data, _ = await self._make_request("GET", url)
+            files = data.get("files", [])
+            if len(files) >= GITHUB_COMPARE_MAX_FILES:
+                raise GitServiceException(
+                    f"Comparison {base}...{head} lists {len(files)} files and may be truncated"
+                )
+            return [
+                FileChange(
+                    path=item["filename"],
+                    status=item.get("status", "modified"),
+                    previous_path=item.get("previous_filename"),
+                )
+                for item in files
+            ]
+
+        except NotFoundException as e:
+            raise NotFoundException(f"Commits not found: {owner}/{repo} {base}...{head}")
+        except (UnauthorizedException, RateLimitException, GitServiceException) as e:
+            raise e
+        except Exception as e:
+            raise GitServiceException(f"Error comparing commits on GitHub: {str(e)}")
+
     async def search_repository(
         self, owner: str, repo: str, query: str, limit: int = 10
     ) -> List[Dict[str, Any]]:
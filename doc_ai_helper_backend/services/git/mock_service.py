@@ -6,6 +6,7 @@ that can be used for development, testing, and demos without
 requiring actual Git service credentials.
 """
 
+import hashlib
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -24,6 +25,7 @@ from doc_ai_helper_backend.models.document import (
     DocumentMetadata,
     DocumentResponse,
     DocumentType,
+    FileChange,
     FileTreeItem,
     RepositoryStructureResponse,
 )
@@ -300,6 +302,59 @@ class MockGitService(GitServiceBase):
 
         return {"results": results_list}
 
+    async def get_latest_commit(
+        self, owner: str, repo: str, ref: str = "main"
+    ) -> str:
+        """Get a mock commit SHA for a branch or tag.
+
+        The SHA is derived from the mock documents of the repository, so it
+        changes whenever the mock data changes.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch or tag name. Default is "main"
+
+        Returns:
+            str: Mock commit SHA
+
+        Raises:
+            NotFoundException: If repository is not found
+        """
+        repo_path = f"{owner}/{repo}"
+        if repo_path not in self.existing_repos and self.existing_repos:
+            raise NotFoundException(f"Repository not found: {repo_path}")
+
+        digest = hashlib.sha1(f"{repo_path}@{ref}".encode("utf-8"))
+        for key in sorted(k for k in self.documents if k.startswith(f"{repo_path}/")):
+            digest.update(key.encode("utf-8"))
+            digest.update(str(self.documents[key].get("content", "")).encode("utf-8"))
+        return digest.hexdigest()
+
+    async def compare_commits(
+        self, owner: str, repo: str, base: str, head: str
+    ) -> List[FileChange]:
+        """Get the files changed between two mock commits.
+
+        Mock data has no history, so the changed files cannot be listed
+        and callers fall back to a full sync.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            base: Base commit SHA
+            head: Head commit SHA
+
+        Returns:
+            List[FileChange]: Never returns
+
+        Raises:
+            GitServiceException: Always, since mock data has no history
+        """
+        raise GitServiceException(
+            f"Commit comparison is not supported by mock data: {owner}/{repo}"
+        )
+
     async def check_repository_exists(self, owner: str, repo: str) -> bool:
         """Check if repository exists.
 
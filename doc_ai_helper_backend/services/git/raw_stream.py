@@ -0,0 +1,230 @@
+"""
+Raw file streaming primitives.
+
+Raw content is streamed in chunks straight from the Git service's raw/blob
+endpoints instead of being pulled through the base64 JSON contents API.
+"""
+
+import os
+import re
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+# Chunk size used when streaming raw content
+RAW_CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+_CONTENT_RANGE_PATTERN = re.compile(r"^\s*bytes\s+(\d+)-(\d+)/(\d+|\*)\s*$", re.IGNORECASE)
+
+# (first byte, last byte) as requested; either side may be open
+ByteRangeSpec = Tuple[Optional[int], Optional[int]]
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when a byte range lies outside the content."""
+
+    def __init__(self, total_size: int):
+        super().__init__(f"Range not satisfiable for {total_size} bytes")
+        self.total_size = total_size
+
+
+def parse_range_header(value: Optional[str]) -> Optional[ByteRangeSpec]:
+    """Parse a single-range ``Range`` header.
+
+    Multi-range and malformed headers are ignored (the full content is
+    served), as permitted by RFC 9110.
+
+    Args:
+        value: Range header value, e.g. ``bytes=0-1023``, ``bytes=100-`` or
+            ``bytes=-500``
+
+    Returns:
+        Optional[ByteRangeSpec]: (start, end) with open sides as None, or
+        None if the header is absent or ignored
+    """
+    if not value:
+        return None
+    match = _RANGE_PATTERN.match(value)
+    if not match:
+        return None
+    start = int(match.group(1)) if match.group(1) else None
+    end = int(match.group(2)) if match.group(2) else None
+    if start is None and end is None:
+        return None
+    if start is not None and end is not None and end < start:
+        return None
+    return start, end
+
+
+def format_range_header(spec: ByteRangeSpec) -> str:
+    """Format a range spec as a ``Range`` header value."""
+    start, end = spec
+    if start is None:
+        return f"bytes=-{end}"
+    return f"bytes={start}-{'' if end is None else end}"
+
+
+def resolve_range(spec: ByteRangeSpec, total_size: int) -> Tuple[int, int]:
+    """Resolve a range spec against the content size.
+
+    Args:
+        spec: Requested (start, end)
+        total_size: Content size in bytes
+
+    Returns:
+        Tuple[int, int]: Inclusive (first, last) byte positions
+
+    Raises:
+        RangeNotSatisfiableError: If the range lies outside the content
+    """
+    start, end = spec
+    if start is None:
+        # Suffix range: the last `end` bytes
+        if not end or total_size == 0:
+            raise RangeNotSatisfiableError(total_size)
+        return max(total_size - end, 0), total_size - 1
+    if start >= total_size:
+        raise RangeNotSatisfiableError(total_size)
+    last = total_size - 1 if end is None else min(end, total_size - 1)
+    return start, last
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Parse a ``Content-Range`` response header.
+
+    Returns:
+        Optional[Tuple[int, int, Optional[int]]]: (first, last, total size),
+        total size None if unknown, or None if the header is absent or invalid
+    """
+    if not value:
+        return None
+    match = _CONTENT_RANGE_PATTERN.match(value)
+    if not match:
+        return None
+    total = None if match.group(3) == "*" else int(match.group(3))
+    return int(match.group(1)), int(match.group(2)), total
+
+
+class RawFileStream:
+    """An open raw-content stream from a Git service.
+
+    ``status_code`` is 206 when the upstream already applied the requested
+    range (``content_range`` is then set), 200 otherwise. The stream must be
+    consumed with ``iter_chunks`` or ``read``, or closed with ``aclose``.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        status_code: int = 200,
+        content_length: Optional[int] = None,
+        content_range: Optional[Tuple[int, int, Optional[int]]] = None,
+        etag: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        close: Optional[Callable[[], Awaitable[None]]] = None,
+    ):
+        """Initialize the stream.
+
+        Args:
+            chunks: Async iterator of body chunks
+            status_code: 200 for full content, 206 for a range applied upstream
+            content_length: Body length in bytes, if known
+            content_range: (first, last, total size) for 206 responses
+            etag: Entity tag of the content, if known
+            headers: Other upstream headers worth forwarding
+            close: Coroutine function releasing the upstream connection
+        """
+        self._chunks = chunks
+        self.status_code = status_code
+        self.content_length = content_length
+        self.content_range = content_range
+        self.etag = etag
+        self.headers = headers or {}
+        self._close = close
+        self._closed = False
+
+    @classmethod
+    def from_bytes(cls, data: bytes, etag: Optional[str] = None) -> "RawFileStream":
+        """Create a stream over in-memory content."""
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for offset in range(0, len(data), RAW_CHUNK_SIZE):
+                yield data[offset : offset + RAW_CHUNK_SIZE]
+
+        return cls(chunks(), content_length=len(data), etag=etag)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        byte_range: Optional[ByteRangeSpec] = None,
+        etag: Optional[str] = None,
+    ) -> "RawFileStream":
+        """Create a stream over a local file.
+
+        The file is opened immediately, so it stays readable even if it is
+        deleted (e.g. evicted from a cache) before the stream is consumed. A
+        satisfiable range is applied by seeking, so only the requested bytes
+        are read. An unsatisfiable range is left to the caller, which sees the
+        full size and can answer 416.
+        """
+        file = open(path, "rb")
+        total = os.fstat(file.fileno()).st_size
+        first, last = 0, total - 1
+        content_range = None
+        if byte_range is not None:
+            try:
+                first, last = resolve_range(byte_range, total)
+                content_range = (first, last, total)
+            except RangeNotSatisfiableError:
+                pass
+
+        async def chunks() -> AsyncIterator[bytes]:
+            file.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                chunk = file.read(min(RAW_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        async def close() -> None:
+            file.close()
+
+        if content_range is not None:
+            return cls(
+                chunks(),
+                status_code=206,
+                content_length=last - first + 1,
+                content_range=content_range,
+                etag=etag,
+                close=close,
+            )
+        return cls(chunks(), content_length=total, etag=etag, close=close)
+
+    @property
+    def total_size(self) -> Optional[int]:
+        """Size of the full content, if known."""
+        if self.content_range is not None:
+            return self.content_range[2]
+        return self.content_length if self.status_code == 200 else None
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Iterate over body chunks, closing the stream at the end."""
+        try:
+            async for chunk in self._chunks:
+                if chunk:
+                    yield chunk
+        finally:
+            await self.aclose()
+
+    async def read(self) -> bytes:
+        """Read the whole body into memory."""
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def aclose(self) -> None:
+        """Release the upstream connection."""
+        if not self._closed:
+            self._closed = True
+            if self._close is not None:
+                await self._close()
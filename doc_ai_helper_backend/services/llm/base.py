@@ -48,12 +48,13 @@ class LLMServiceBase(ABC):
         pass
 
     @abstractmethod
-    async def estimate_tokens(self, text: str) -> int:
+    async def estimate_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
         Estimate the number of tokens in a text.
 
         Args:
             text: The text to estimate tokens for
+            model: The model whose tokenizer to use (defaults to the service's model)
 
         Returns:
             int: Estimated token count
@@ -121,6 +122,43 @@ class LLMServiceBase(ABC):
         """
         pass
 
+    async def _stream_provider_api_with_tools(
+        self, options: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream from the provider API, including tool calls.
+
+        Providers that can stream tool-call deltas override this method. The
+        default implementation makes a single non-streaming call and yields
+        its result as events.
+
+        Args:
+            options: Provider-specific options prepared by _prepare_provider_options
+
+        Yields:
+            Dict[str, Any]: One of ``{"content": str}`` for content,
+            ``{"tool_call_delta": {"index", "id", "name", "arguments"}}`` for
+            partial tool calls, ``{"usage": LLMUsage}`` for token usage, and
+            finally ``{"tool_calls": List[ToolCall]}`` if the model called tools
+        """
+        raw_response = await self._call_provider_api(options)
+        response = await self._convert_provider_response(raw_response, options)
+        if response.content:
+            yield {"content": response.content}
+        for index, tool_call in enumerate(response.tool_calls or []):
+            yield {
+                "tool_call_delta": {
+                    "index": index,
+                    "id": tool_call.id,
+                    "name": tool_call.function.name,
+                    "arguments": tool_call.function.arguments,
+                }
+            }
+        if response.usage:
+            yield {"usage": response.usage}
+        if response.tool_calls:
+            yield {"tool_calls": list(response.tool_calls)}
+
     @abstractmethod
     async def _convert_provider_response(
         self, raw_response: Any, options: Dict[str, Any]
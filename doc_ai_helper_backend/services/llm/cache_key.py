@@ -0,0 +1,154 @@
+"""
+LLM Cache Key
+
+LLMレスポンスキャッシュのキーを生成します。
+ドキュメントは内容ではなくblobのSHAで識別し、会話履歴はメッセージごとに
+直前までのダイジェストと連鎖させたダイジェストで表すため、長い文書や会話でも
+リクエストごとの直列化とハッシュ計算のコストを抑えられます。
+"""
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from doc_ai_helper_backend.models.llm import MessageItem
+
+if TYPE_CHECKING:
+    from doc_ai_helper_backend.models.repository_context import (
+        DocumentMetadata,
+        RepositoryContext,
+    )
+    from doc_ai_helper_backend.services.llm.document_retriever import DocumentChunk
+
+# ダイジェストのバイト数（128bit）
+DIGEST_SIZE = 16
+# 空の会話履歴のダイジェスト
+EMPTY_HISTORY_DIGEST = b""
+
+_SEPARATOR = b"\0"
+
+
+def _new_hash() -> "hashlib.blake2b":
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def _update(digest: "hashlib.blake2b", value: Optional[str]) -> None:
+    """区切り付きで値をダイジェストに追加（Noneと空文字列を区別）"""
+    if value is None:
+        digest.update(b"\1")
+    else:
+        digest.update(value.encode("utf-8"))
+    digest.update(_SEPARATOR)
+
+
+def extend_history_digest(parent: bytes, message: MessageItem) -> bytes:
+    """
+    直前までの会話履歴のダイジェストに1メッセージを連鎖
+
+    タイムスタンプは応答内容に影響しないためキーに含めません。
+
+    Args:
+        parent: 直前までの会話履歴のダイジェスト
+        message: 追加するメッセージ
+
+    Returns:
+        bytes: メッセージを含めた会話履歴のダイジェスト
+    """
+    digest = _new_hash()
+    digest.update(parent)
+    _update(digest, message.role.value)
+    _update(digest, message.content)
+    _update(digest, message.tool_call_id)
+    if message.tool_calls:
+        _update(
+            digest,
+            json.dumps([call.model_dump() for call in message.tool_calls], sort_keys=True),
+        )
+    return digest.digest()
+
+
+def history_digest(
+    messages: Optional[Sequence[MessageItem]], start: bytes = EMPTY_HISTORY_DIGEST
+) -> bytes:
+    """
+    会話履歴のダイジェストを計算
+
+    ダイジェストは連鎖しているため、既知の履歴のダイジェストを ``start`` に
+    渡せば、新しく追加されたメッセージだけをハッシュすれば済みます。
+
+    Args:
+        messages: 会話履歴（``start`` 以降のメッセージ）
+        start: 先行する履歴のダイジェスト
+
+    Returns:
+        bytes: 会話履歴全体のダイジェスト
+    """
+    digest = start
+    for message in messages or ():
+        digest = extend_history_digest(digest, message)
+    return digest
+
+
+def document_fingerprint(
+    document_metadata: Optional["DocumentMetadata"] = None,
+    document_content: Optional[str] = None,
+) -> Optional[str]:
+    """
+    ドキュメントの識別子を取得
+
+    blobのSHAがあればそれを使い、ない場合のみ内容をハッシュします。
+    """
+    sha = getattr(document_metadata, "sha", None)
+    if sha:
+        return f"sha:{sha}"
+    if document_content is None:
+        return None
+    return "content:" + hashlib.blake2b(
+        document_content.encode("utf-8"), digest_size=DIGEST_SIZE
+    ).hexdigest()
+
+
+def build_cache_key(
+    prompt: str,
+    conversation_history: Optional[List[MessageItem]] = None,
+    options: Optional[Dict[str, Any]] = None,
+    repository_context: Optional["RepositoryContext"] = None,
+    document_metadata: Optional["DocumentMetadata"] = None,
+    document_content: Optional[str] = None,
+    repository_chunks: Optional[List["DocumentChunk"]] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> str:
+    """
+    クエリ用のキャッシュキーを生成
+
+    Args:
+        prompt: ユーザープロンプト
+        conversation_history: 会話履歴
+        options: 処理オプション
+        repository_context: リポジトリコンテキスト
+        document_metadata: ドキュメントメタデータ（SHAを含む場合は内容の代わりに使用）
+        document_content: ドキュメント内容
+        repository_chunks: リポジトリ全体検索で選択されたチャンク
+        provider: LLMプロバイダー名（キャッシュはプロバイダー間で共有しない）
+        model: 解決済みのモデル名（応答とドキュメント予算がモデルに依存するため）
+
+    Returns:
+        str: ``llm:`` 名前空間のキャッシュキー
+    """
+    digest = _new_hash()
+    _update(digest, provider.lower() if provider else None)
+    _update(digest, model)
+    _update(digest, prompt)
+    digest.update(history_digest(conversation_history))
+    digest.update(_SEPARATOR)
+    _update(digest, json.dumps(options, sort_keys=True, default=str) if options else None)
+    _update(
+        digest,
+        repository_context.model_dump_json() if repository_context else None,
+    )
+    _update(digest, document_fingerprint(document_metadata, document_content))
+    for chunk in repository_chunks or ():
+        _update(digest, chunk.source)
+        _update(digest, chunk.text)
+    return f"llm:{digest.hexdigest()}"
@@ -8,19 +8,16 @@ import logging
 from typing import Dict, Any, Optional, List
 
 from doc_ai_helper_backend.models.llm import MessageItem, MessageRole
+from doc_ai_helper_backend.services.llm.tokenizer import tokenizer_registry
 
 logger = logging.getLogger(__name__)
 
 
 def estimate_message_tokens(message: MessageItem, encoding_name: str = "cl100k_base") -> int:
-    """Estimate token count for a single message"""
-    try:
-        import tiktoken
-        encoding = tiktoken.get_encoding(encoding_name)
-        return len(encoding.encode(f"{message.role.value}: {message.content}"))
-    except ImportError:
-        # Fallback if tiktoken is not available
-        return len(message.content) // 4  # Rough approximation: 4 chars ≈ 1 token
+    """Estimate token count for a single message (memoized by content)"""
+    return tokenizer_registry.count_tokens(
+        f"{message.role.value}: {message.content}", encoding_name=encoding_name
+    )
 
 
 def optimize_conversation_history(
@@ -39,8 +36,9 @@ def optimize_conversation_history(
     if not history:
         return [], {"was_optimized": False, "reason": "Empty history"}
 
-    # Estimate total tokens
-    total_tokens = sum(estimate_message_tokens(msg, encoding_name) for msg in history)
+    # Count each message once; every step below reuses these counts
+    message_tokens = [estimate_message_tokens(msg, encoding_name) for msg in history]
+    total_tokens = sum(message_tokens)
     
     if total_tokens <= max_tokens:
         return history, {
@@ -56,7 +54,7 @@ def optimize_conversation_history(
     # Need to optimize - preserve recent messages and fit as many older ones as possible
     if len(history) <= preserve_recent:
         # Can't remove any messages due to preserve_recent constraint
-        recent_tokens = sum(estimate_message_tokens(msg, encoding_name) for msg in history[-preserve_recent:])
+        recent_tokens = sum(message_tokens[-preserve_recent:])
         return history, {
             "was_optimized": False,
             "reason": f"Cannot optimize: only {len(history)} messages, preserve_recent={preserve_recent}",
@@ -69,7 +67,7 @@ def optimize_conversation_history(
 
     # Keep recent messages
     recent_messages = history[-preserve_recent:]
-    recent_tokens = sum(estimate_message_tokens(msg, encoding_name) for msg in recent_messages)
+    recent_tokens = sum(message_tokens[-preserve_recent:])
     
     if recent_tokens > max_tokens:
         # Even recent messages exceed limit - return them anyway as they're required
@@ -85,21 +83,15 @@ def optimize_conversation_history(
     
     # Add older messages until we approach the limit
     available_tokens = max_tokens - recent_tokens
-    older_messages = history[:-preserve_recent]
     
-    # Try to include as many older messages as possible (starting from most recent older messages)
-    included_older = []
+    # Walk back from the most recent older message to find where the kept history starts
+    start = len(history) - len(recent_messages)
     current_tokens = 0
+    while start > 0 and current_tokens + message_tokens[start - 1] <= available_tokens:
+        start -= 1
+        current_tokens += message_tokens[start]
     
-    for msg in reversed(older_messages):
-        msg_tokens = estimate_message_tokens(msg, encoding_name)
-        if current_tokens + msg_tokens <= available_tokens:
-            included_older.insert(0, msg)  # Insert at beginning to maintain order
-            current_tokens += msg_tokens
-        else:
-            break
-    
-    final_history = included_older + recent_messages
+    final_history = history[start:]
     final_tokens = current_tokens + recent_tokens
     
     return final_history, {
@@ -0,0 +1,387 @@
+"""
+Document Retrieval
+
+ドキュメント内容の関連度ランキング機能を提供します。
+ドキュメントを見出し単位のチャンクに分割し、BM25でプロンプトとの関連度を評価して、
+モデルのコンテキストウィンドウから算出したトークン予算内に関連チャンクを詰め込みます。
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ドキュメントに割り当てるコンテキストウィンドウの割合
+DEFAULT_CONTEXT_RATIO = 0.5
+# ドキュメントに割り当てる最小トークン数
+MIN_DOCUMENT_TOKENS = 512
+# 1チャンクあたりの最大トークン数（これを超えるセクションは段落で分割）
+MAX_CHUNK_TOKENS = 400
+# 選択されなかったチャンクの位置に挿入する区切り
+OMISSION_MARKER = "...(中略)..."
+
+_MD_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_HTML_HEADING_PATTERN = re.compile(
+    r"<h([1-6])[^>]*>(.*?)</h\1>", re.IGNORECASE | re.DOTALL
+)
+_HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+_WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+@dataclass
+class DocumentChunk:
+    """見出し情報付きのドキュメントチャンク"""
+
+    index: int
+    text: str
+    heading: str = ""
+    tokens: int = 0
+    source: Optional[str] = None
+    terms: Counter = field(default_factory=Counter, repr=False)
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    テキストのトークン数を推定（tiktokenに依存しない簡易推定）
+
+    ASCII文字は約4文字で1トークン、日本語などの非ASCII文字は1文字1トークンとして数える。
+
+    Args:
+        text: 推定対象のテキスト
+
+    Returns:
+        推定トークン数
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25用にテキストを索引語へ分割
+
+    英数字は単語単位、日本語（かな・漢字）は文字バイグラムで分割する。
+
+    Args:
+        text: 分割対象のテキスト
+
+    Returns:
+        索引語のリスト
+    """
+    lowered = text.lower()
+    terms = _WORD_PATTERN.findall(lowered)
+    for run in _CJK_PATTERN.findall(lowered):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def split_into_chunks(
+    content: str,
+    max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+    source: Optional[str] = None,
+) -> List[DocumentChunk]:
+    """
+    ドキュメントを見出し単位のチャンクに分割
+
+    Markdownの見出し（コードフェンス内は除く）とHTMLの見出しタグをセクション境界とし、
+    大きすぎるセクションは段落単位でさらに分割する。分割されたチャンクには
+    見出しの階層パスを付与する。
+
+    Args:
+        content: ドキュメント内容
+        max_chunk_tokens: 1チャンクあたりの最大トークン数
+        source: チャンクの出典（ファイルパスなど）
+
+    Returns:
+        ドキュメント順のチャンクリスト
+    """
+    sections: List[Tuple[str, str]] = []
+    heading_stack: List[Tuple[int, str]] = []
+    current_heading = ""
+    current_lines: List[str] = []
+    in_fence = False
+
+    def flush() -> None:
+        text = "\n".join(current_lines).strip()
+        if text:
+            sections.append((current_heading, text))
+
+    for line in content.split("\n"):
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+
+        heading = None
+        if not in_fence:
+            md_match = _MD_HEADING_PATTERN.match(line)
+            if md_match:
+                heading = (len(md_match.group(1)), md_match.group(2))
+            else:
+                html_match = _HTML_HEADING_PATTERN.search(line)
+                if html_match:
+                    title = _HTML_TAG_PATTERN.sub("", html_match.group(2)).strip()
+                    heading = (int(html_match.group(1)), title)
+
+        if heading:
+            flush()
+            current_lines = []
+            level, title = heading
+            while heading_stack and heading_stack[-1][0] >= level:
+                heading_stack.pop()
+            heading_stack.append((level, title))
+            current_heading = " > ".join(t for _, t in heading_stack)
+
+        current_lines.append(line)
+
+    flush()
+
+    chunks: List[DocumentChunk] = []
+    for heading, text in sections:
+        for piece in _split_section(text, max_chunk_tokens):
+            chunk = DocumentChunk(
+                index=len(chunks),
+                text=piece,
+                heading=heading,
+                tokens=estimate_text_tokens(piece),
+                source=source,
+            )
+            chunk.terms = Counter(tokenize(f"{heading}\n{piece}"))
+            chunks.append(chunk)
+    return chunks
+
+
+def _split_section(text: str, max_chunk_tokens: int) -> List[str]:
+    """大きすぎるセクションを段落単位で分割"""
+    if estimate_text_tokens(text) <= max_chunk_tokens:
+        return [text]
+
+    pieces: List[str] = []
+    buffer: List[str] = []
+    buffer_tokens = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph_tokens = estimate_text_tokens(paragraph)
+        if buffer and buffer_tokens + paragraph_tokens > max_chunk_tokens:
+            pieces.append("\n\n".join(buffer))
+            buffer, buffer_tokens = [], 0
+        buffer.append(paragraph)
+        buffer_tokens += paragraph_tokens
+    if buffer:
+        pieces.append("\n\n".join(buffer))
+    return pieces
+
+
+class BM25Index:
+    """
+    チャンク集合に対するBM25インデックス
+
+    文書頻度を構築時に一度だけ計算し、クエリごとに全チャンクをスコアリングする。
+    """
+
+    def __init__(
+        self, chunks: Sequence[DocumentChunk], k1: float = 1.5, b: float = 0.75
+    ):
+        """
+        インデックスの構築
+
+        Args:
+            chunks: 索引対象のチャンク
+            k1: 語頻度の飽和パラメータ
+            b: 文書長正規化パラメータ
+        """
+        self.chunks = list(chunks)
+        self.k1 = k1
+        self.b = b
+        self._lengths = [sum(chunk.terms.values()) for chunk in self.chunks]
+        self._avg_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+        document_frequency: Counter = Counter()
+        for chunk in self.chunks:
+            document_frequency.update(chunk.terms.keys())
+        total = len(self.chunks)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def score(self, query: str) -> List[float]:
+        """
+        クエリに対する各チャンクのBM25スコアを計算
+
+        Args:
+            query: 検索クエリ（ユーザープロンプト）
+
+        Returns:
+            チャンク順のスコアリスト
+        """
+        query_terms = [t for t in set(tokenize(query)) if t in self._idf]
+        if not query_terms or not self._avg_length:
+            return [0.0] * len(self.chunks)
+
+        scores = []
+        for chunk, length in zip(self.chunks, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            total = 0.0
+            for term in query_terms:
+                tf = chunk.terms.get(term, 0)
+                if tf:
+                    total += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(total)
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[Tuple[DocumentChunk, float]]:
+        """
+        スコア上位k件のチャンクを取得（スコア0のチャンクは除外）
+
+        Args:
+            query: 検索クエリ
+            k: 取得件数
+
+        Returns:
+            (チャンク, スコア)のリスト（スコア降順）
+        """
+        ranked = sorted(
+            zip(self.chunks, self.score(query)), key=lambda item: item[1], reverse=True
+        )
+        return [(chunk, score) for chunk, score in ranked[:k] if score > 0]
+
+
+def pack_chunks(
+    chunks: Sequence[DocumentChunk],
+    scores: Sequence[float],
+    token_budget: int,
+) -> List[DocumentChunk]:
+    """
+    スコアの高い順にトークン予算内へチャンクを詰め込む
+
+    先頭チャンク（タイトルや概要）には小さな事前スコアを与え、関連チャンクがない場合は
+    ドキュメント順に詰め込む。結果はドキュメント順に並べ替えて返す。
+
+    Args:
+        chunks: 候補チャンク
+        scores: 各チャンクのスコア
+        token_budget: トークン予算
+
+    Returns:
+        選択されたチャンク（ドキュメント順）
+    """
+    order = sorted(
+        range(len(chunks)),
+        key=lambda i: (scores[i] + (0.01 if i == 0 else 0.0), -i),
+        reverse=True,
+    )
+    selected: List[DocumentChunk] = []
+    used = 0
+    for i in order:
+        if used + chunks[i].tokens <= token_budget:
+            selected.append(chunks[i])
+            used += chunks[i].tokens
+    return sorted(selected, key=lambda chunk: chunk.index)
+
+
+def join_chunks(chunks: Iterable[DocumentChunk]) -> str:
+    """選択されたチャンクを連結（連続しない箇所には省略マーカーを挿入）"""
+    parts: List[str] = []
+    previous = -1
+    for chunk in chunks:
+        if chunk.index != previous + 1:
+            parts.append(OMISSION_MARKER)
+        parts.append(chunk.text)
+        previous = chunk.index
+    return "\n\n".join(parts)
+
+
+def calculate_document_token_budget(
+    context_window: Optional[int],
+    reserved_tokens: int = 0,
+    ratio: float = DEFAULT_CONTEXT_RATIO,
+    max_tokens: Optional[int] = None,
+) -> int:
+    """
+    モデルのコンテキストウィンドウからドキュメント用トークン予算を算出
+
+    コンテキストウィンドウの割合は上限としてのみ使い、``max_tokens`` を
+    超える予算は割り当てない（大きなコンテキストのモデルでもプロンプトを小さく保つ）。
+
+    Args:
+        context_window: モデルのコンテキストウィンドウ（不明な場合はNone）
+        reserved_tokens: プロンプトや会話履歴のために確保するトークン数
+        ratio: ドキュメントに割り当てるコンテキストウィンドウの割合
+        max_tokens: ドキュメント用トークン予算の上限（None または 0 で上限なし）
+
+    Returns:
+        ドキュメント用トークン予算
+    """
+    if not context_window:
+        budget = MIN_DOCUMENT_TOKENS * 4
+    else:
+        budget = max(MIN_DOCUMENT_TOKENS, int(context_window * ratio) - reserved_tokens)
+    if max_tokens:
+        budget = min(budget, max_tokens)
+    return budget
+
+
+def select_relevant_content(
+    document_content: str,
+    query: Optional[str],
+    token_budget: int,
+) -> Tuple[str, Dict[str, int]]:
+    """
+    トークン予算内でクエリに関連する部分のドキュメント内容を選択
+
+    予算内に収まる場合はドキュメント全体をそのまま返す。
+
+    Args:
+        document_content: ドキュメント内容
+        query: ユーザープロンプト
+        token_budget: トークン予算
+
+    Returns:
+        (選択された内容, 統計情報)のタプル
+    """
+    total_tokens = estimate_text_tokens(document_content)
+    if total_tokens <= token_budget:
+        return document_content, {
+            "total_chunks": 1,
+            "selected_chunks": 1,
+            "total_tokens": total_tokens,
+            "selected_tokens": total_tokens,
+        }
+
+    chunks = split_into_chunks(document_content)
+    scores = BM25Index(chunks).score(query) if query else [0.0] * len(chunks)
+    selected = pack_chunks(chunks, scores, token_budget)
+    if not selected and chunks:
+        # 単一チャンクすら予算に収まらない場合は最も関連するチャンクを切り詰めて使う
+        best = max(range(len(chunks)), key=lambda i: (scores[i], -i))
+        chunk = chunks[best]
+        keep = max(1, len(chunk.text) * token_budget // max(chunk.tokens, 1))
+        selected = [
+            DocumentChunk(
+                index=chunk.index,
+                text=chunk.text[:keep],
+                heading=chunk.heading,
+                tokens=estimate_text_tokens(chunk.text[:keep]),
+                source=chunk.source,
+            )
+        ]
+    content = join_chunks(selected)
+    if chunks and (not selected or selected[-1].index != chunks[-1].index):
+        content = f"{content}\n\n{OMISSION_MARKER}".lstrip()
+
+    return content, {
+        "total_chunks": len(chunks),
+        "selected_chunks": len(selected),
+        "total_tokens": total_tokens,
+        "selected_tokens": sum(chunk.tokens for chunk in selected),
+    }
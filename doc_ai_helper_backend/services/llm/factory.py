@@ -6,11 +6,21 @@ LLM service factory.
 完全に構成されたLLMサービスを提供します。
 """
 
-from typing import Dict, Type, Optional
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Type, Optional
 
 from doc_ai_helper_backend.services.llm.base import LLMServiceBase
+from doc_ai_helper_backend.core.config import settings
 from doc_ai_helper_backend.core.exceptions import ServiceNotFoundError
 
+logger = logging.getLogger(__name__)
+
+# 共有インスタンスのキー: (プロバイダー, MCP統合の有無, 設定)
+SharedServiceKey = Tuple[str, bool, Tuple[Tuple[str, str], ...]]
+
 
 class LLMServiceFactory:
     """
@@ -23,6 +33,10 @@ class LLMServiceFactory:
     # Registry of available LLM services
     _services: Dict[str, Type[LLMServiceBase]] = {}
 
+    # アプリケーション共有のサービスインスタンス（LRU）
+    _shared: "OrderedDict[SharedServiceKey, LLMServiceBase]" = OrderedDict()
+    _shared_lock = threading.Lock()
+
     @classmethod
     def register(cls, provider_name: str, service_class: Type[LLMServiceBase]) -> None:
         """
@@ -32,7 +46,12 @@ class LLMServiceFactory:
             provider_name: The name of the LLM provider
             service_class: The service class for the provider
         """
-        cls._services[provider_name.lower()] = service_class
+        provider = provider_name.lower()
+        cls._services[provider] = service_class
+        # 置き換え前のクラスの共有インスタンスを破棄
+        with cls._shared_lock:
+            for key in [key for key in cls._shared if key[0] == provider]:
+                del cls._shared[key]
 
     @classmethod
     def create(cls, provider: str, **config) -> LLMServiceBase:
@@ -135,6 +154,66 @@ class LLMServiceFactory:
 
         return service
 
+    @classmethod
+    def get_shared(
+        cls, provider: str, enable_mcp: bool = True, **config
+    ) -> LLMServiceBase:
+        """
+        同一設定のLLMサービスインスタンスを再利用して取得
+
+        (プロバイダー, モデル, ベースURL, APIキー) などの設定が一致するリクエスト間で
+        インスタンスを共有し、HTTPクライアントのキープアライブ接続とトークンエンコーダーを
+        再利用する。未登録の設定の場合のみ ``create_with_mcp`` で作成する。
+
+        Args:
+            provider: LLMプロバイダーの名前
+            enable_mcp: FastMCP統合を有効にするか
+            **config: サービスの設定オプション
+
+        Returns:
+            LLMServiceBase: 共有されたLLMサービスのインスタンス
+
+        Raises:
+            ServiceNotFoundError: 要求されたプロバイダーが登録されていない場合
+        """
+        key = cls._shared_key(provider, enable_mcp, config)
+        with cls._shared_lock:
+            service = cls._shared.get(key)
+            if service is not None:
+                cls._shared.move_to_end(key)
+                return service
+
+        service = cls.create_with_mcp(provider, enable_mcp=enable_mcp, **config)
+
+        with cls._shared_lock:
+            # 同時に作成された場合は先に登録されたインスタンスを使う
+            existing = cls._shared.get(key)
+            if existing is not None:
+                return existing
+            cls._shared[key] = service
+            while len(cls._shared) > max(settings.llm_service_registry_size, 1):
+                cls._shared.popitem(last=False)
+        logger.debug(f"Registered shared LLM service for provider '{provider.lower()}'")
+        return service
+
+    @classmethod
+    def clear_shared(cls) -> None:
+        """共有インスタンスをすべて破棄"""
+        with cls._shared_lock:
+            cls._shared.clear()
+
+    @staticmethod
+    def _shared_key(
+        provider: str, enable_mcp: bool, config: Dict[str, Any]
+    ) -> SharedServiceKey:
+        """共有インスタンスのキーを生成（APIキーはハッシュ化して保持）"""
+        items = []
+        for name, value in sorted(config.items()):
+            if name == "api_key" and value:
+                value = hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+            items.append((name, repr(value)))
+        return (provider.lower(), enable_mcp, tuple(items))
+
     @classmethod
     def get_available_providers(cls) -> list[str]:
         """
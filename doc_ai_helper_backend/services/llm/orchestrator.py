@@ -6,7 +6,6 @@ LLMサービスの統合オーケストレータ。
 """
 
 import asyncio
-import hashlib
 import logging
 from typing import Dict, Any, Optional, List, AsyncGenerator, TYPE_CHECKING
 
@@ -17,10 +16,12 @@ if TYPE_CHECKING:
         DocumentMetadata,
     )
     from doc_ai_helper_backend.services.llm.base import LLMServiceBase
+    from doc_ai_helper_backend.services.llm.document_retriever import DocumentChunk
 
 from doc_ai_helper_backend.models.llm import (
     LLMResponse,
     LLMQueryRequest,
+    LLMUsage,
     MessageItem,
     MessageRole,
     FunctionDefinition,
@@ -30,12 +31,26 @@ from doc_ai_helper_backend.core.exceptions import LLMServiceException, ServiceNo
 from doc_ai_helper_backend.core.config import settings
 
 # 分割されたモジュールからの関数インポート
+from .cache_key import build_cache_key
 from .conversation_optimizer import (
     optimize_conversation_history,
     build_conversation_messages,
 )
 from .system_prompt_generator import generate_system_prompt
-from .tool_executor import handle_tool_execution_and_followup
+from .document_retriever import calculate_document_token_budget, estimate_text_tokens
+from .repository_index import repository_index_registry
+from .single_flight import single_flight
+from .stream_metrics import (
+    STREAM_CANCELLED,
+    STREAM_COMPLETED,
+    STREAM_FAILED,
+    stream_metrics,
+)
+from .tool_executor import (
+    execute_tool_calls,
+    handle_tool_execution_and_followup,
+    stream_tool_loop,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +96,7 @@ class LLMOrchestrator:
             if not request.query.prompt or not request.query.prompt.strip():
                 raise LLMServiceException("Prompt cannot be empty")
 
-            # サービスインスタンスを作成
+            # 同一設定のサービスインスタンスを再利用
             service_config = {"model": request.query.model}
             
             # プロバイダー固有の設定を追加
@@ -92,7 +107,7 @@ class LLMOrchestrator:
                     "default_model": request.query.model or settings.default_openai_model
                 })
             
-            service = LLMServiceFactory.create_with_mcp(
+            service = LLMServiceFactory.get_shared(
                 request.query.provider,
                 enable_mcp=True,
                 **service_config
@@ -107,6 +122,7 @@ class LLMOrchestrator:
             repository_context = None
             document_metadata = None
             document_content = None
+            repository_chunks = None
             
             if request.document and request.document.repository_context:
                 repository_context = request.document.repository_context
@@ -115,6 +131,14 @@ class LLMOrchestrator:
                 # ドキュメントコンテキストがある場合、必要に応じて文書取得
                 if request.document.auto_include_document:
                     document_content, document_metadata = await self._retrieve_document_content(repository_context)
+
+                # リポジトリ全体検索が有効な場合、インデックスから関連チャンクを取得
+                if request.document.repository_wide_search:
+                    repository_chunks = await self._retrieve_repository_chunks(
+                        repository_context,
+                        request.query.prompt,
+                        request.document.repository_search_top_k,
+                    )
             
             # ツールが有効な場合は、ツール付きクエリを実行
             if request.tools and request.tools.enable_tools:
@@ -138,54 +162,72 @@ class LLMOrchestrator:
                     options=options,
                     repository_context=repository_context,
                     document_metadata=document_metadata,
-                    document_content=document_content
+                    document_content=document_content,
+                    repository_chunks=repository_chunks,
+                    max_tool_rounds=request.tools.max_tool_rounds,
                 )
             
             # 標準クエリの実行（直接実装）
             # 1. キャッシュチェック
             cache_key = self._generate_cache_key(
                 request.query.prompt, request.query.conversation_history, options, repository_context,
-                document_metadata, document_content
+                document_metadata, document_content, repository_chunks,
+                provider=request.query.provider,
+                model=request.query.model or getattr(service, "default_model", None),
             )
 
-            if cached_response := self.cache_service.get(cache_key):
+            if cached_response := await self._get_cached_response(cache_key):
                 logger.info("Returning cached response")
                 return cached_response
 
-            # 2. システムプロンプト生成
-            system_prompt = generate_system_prompt(
-                repository_context=repository_context,
-                document_metadata=document_metadata,
-                document_content=document_content,
-                include_document_in_system_prompt=request.document.auto_include_document,
-            )
+            async def generate() -> LLMResponse:
+                # 2. システムプロンプト生成（関連チャンクをトークン予算内で選択）
+                document_token_budget = await self._calculate_document_token_budget(
+                    service, request.query.prompt, request.query.conversation_history, options
+                )
+                system_prompt = generate_system_prompt(
+                    repository_context=repository_context,
+                    document_metadata=document_metadata,
+                    document_content=document_content,
+                    include_document_in_system_prompt=request.document.auto_include_document,
+                    query=request.query.prompt,
+                    max_document_tokens=document_token_budget,
+                    repository_chunks=repository_chunks,
+                )
 
-            # 3. プロバイダー固有オプション準備
-            provider_options = await service._prepare_provider_options(
-                prompt=request.query.prompt,
-                conversation_history=request.query.conversation_history,
-                options=options,
-                system_prompt=system_prompt,
-            )
+                # 3. プロバイダー固有オプション準備
+                provider_options = await service._prepare_provider_options(
+                    prompt=request.query.prompt,
+                    conversation_history=request.query.conversation_history,
+                    options=options,
+                    system_prompt=system_prompt,
+                )
 
-            # 4. プロバイダーAPI呼び出し
-            raw_response = await service._call_provider_api(provider_options)
+                # 4. プロバイダーAPI呼び出し
+                raw_response = await service._call_provider_api(provider_options)
 
-            # 5. レスポンス変換
-            llm_response = await service._convert_provider_response(
-                raw_response, provider_options
-            )
+                # 5. レスポンス変換
+                llm_response = await service._convert_provider_response(
+                    raw_response, provider_options
+                )
 
-            # 6. 会話履歴最適化情報設定（現在のやり取りを含む）
-            updated_history = self._build_updated_conversation_history(
-                request.query.conversation_history, 
-                request.query.prompt, 
-                llm_response.content
-            )
-            self._set_conversation_optimization_info(llm_response, updated_history)
+                # 6. 会話履歴最適化情報設定（現在のやり取りを含む）
+                updated_history = self._build_updated_conversation_history(
+                    request.query.conversation_history, 
+                    request.query.prompt, 
+                    llm_response.content
+                )
+                self._set_conversation_optimization_info(llm_response, updated_history)
 
-            # 7. レスポンスキャッシュ
-            self.cache_service[cache_key] = llm_response
+                # 7. レスポンスキャッシュ
+                await self._cache_response(cache_key, llm_response)
+                return llm_response
+
+            # 同じクエリが実行中であれば、プロバイダーを呼ばずにその結果を共有
+            if settings.enable_llm_single_flight:
+                llm_response = await single_flight.run(cache_key, generate)
+            else:
+                llm_response = await generate()
 
             logger.info(f"Query execution completed successfully, model: {llm_response.model}")
             return llm_response
@@ -216,7 +258,7 @@ class LLMOrchestrator:
             if not request.query.prompt or not request.query.prompt.strip():
                 raise LLMServiceException("Prompt cannot be empty")
 
-            # サービスインスタンスを作成
+            # 同一設定のサービスインスタンスを再利用
             service_config = {"model": request.query.model}
             
             # プロバイダー固有の設定を追加
@@ -227,7 +269,7 @@ class LLMOrchestrator:
                     "default_model": request.query.model or settings.default_openai_model
                 })
             
-            service = LLMServiceFactory.create_with_mcp(
+            service = LLMServiceFactory.get_shared(
                 request.query.provider,
                 enable_mcp=True,
                 **service_config
@@ -242,6 +284,7 @@ class LLMOrchestrator:
             repository_context = None
             document_metadata = None
             document_content = None
+            repository_chunks = None
             
             if request.document and request.document.repository_context:
                 repository_context = request.document.repository_context
@@ -250,30 +293,120 @@ class LLMOrchestrator:
                 # ドキュメントコンテキストがある場合、必要に応じて文書取得
                 if request.document.auto_include_document:
                     document_content, document_metadata = await self._retrieve_document_content(repository_context)
+
+                # リポジトリ全体検索が有効な場合、インデックスから関連チャンクを取得
+                if request.document.repository_wide_search:
+                    repository_chunks = await self._retrieve_repository_chunks(
+                        repository_context,
+                        request.query.prompt,
+                        request.document.repository_search_top_k,
+                    )
                 
-            # 1. システムプロンプト生成
-            system_prompt = generate_system_prompt(
-                repository_context=repository_context,
-                document_metadata=document_metadata,
-                document_content=document_content,
-                include_document_in_system_prompt=request.document.auto_include_document,
-            )
+            # ツールなしのクエリは非ストリーミングと同じキーでキャッシュを共有
+            use_tools = bool(request.tools and request.tools.enable_tools)
+            cache_key = None
+            cached_response = None
+            if not use_tools:
+                cache_key = self._generate_cache_key(
+                    request.query.prompt, request.query.conversation_history, options, repository_context,
+                    document_metadata, document_content, repository_chunks,
+                    provider=request.query.provider,
+                    model=request.query.model or getattr(service, "default_model", None),
+                )
+                cached_response = await self._get_cached_response(cache_key)
 
-            # 2. プロバイダー固有オプション準備
-            provider_options = await service._prepare_provider_options(
-                prompt=request.query.prompt,
-                conversation_history=request.query.conversation_history,
-                options=options,
-                system_prompt=system_prompt,
-            )
+            async def build_system_prompt() -> str:
+                # 1. システムプロンプト生成（関連チャンクをトークン予算内で選択）
+                document_token_budget = await self._calculate_document_token_budget(
+                    service, request.query.prompt, request.query.conversation_history, options
+                )
+                return generate_system_prompt(
+                    repository_context=repository_context,
+                    document_metadata=document_metadata,
+                    document_content=document_content,
+                    include_document_in_system_prompt=request.document.auto_include_document,
+                    query=request.query.prompt,
+                    max_document_tokens=document_token_budget,
+                    repository_chunks=repository_chunks,
+                )
 
-            # 3. プロバイダーAPIからのストリーミング
-            async for chunk in service._stream_provider_api(provider_options):
-                # ストリーミングチャンクを構造化データとして返す
-                yield {"content": chunk, "done": False}
-            
-            # ストリーミング完了を示す
-            yield {"content": "", "done": True}
+            async def open_provider_stream() -> AsyncGenerator[Dict[str, Any], None]:
+                # 2. プロバイダー固有オプション準備
+                provider_options = await service._prepare_provider_options(
+                    prompt=request.query.prompt,
+                    conversation_history=request.query.conversation_history,
+                    options=options,
+                    system_prompt=await build_system_prompt(),
+                )
+
+                # 3. プロバイダーAPIからのストリーミング（完了時にキャッシュ）
+                return self._caching_events(
+                    self._content_events(service._stream_provider_api(provider_options)),
+                    cache_key,
+                    request,
+                    service,
+                    provider_options,
+                )
+
+            if cached_response is not None:
+                # キャッシュヒット時はプロバイダーを呼ばずに合成ストリームとして再生
+                logger.info("Replaying cached response as stream")
+                stream_metrics.record_replayed()
+                events = self._replay_events(
+                    cached_response.content, settings.llm_stream_replay_chunk_chars
+                )
+            elif use_tools:
+                # ツールが有効な場合は、ツール呼び出しとフォローアップをストリーミング
+                tools = await service.get_available_functions()
+                tool_choice = None
+                if request.tools.tool_choice:
+                    tool_choice = ToolChoice(type=request.tools.tool_choice)
+
+                events = stream_tool_loop(
+                    service,
+                    tools,
+                    repository_context,
+                    request.query.prompt,
+                    request.query.conversation_history,
+                    await build_system_prompt(),
+                    options,
+                    tool_choice=tool_choice,
+                    max_rounds=request.tools.max_tool_rounds,
+                )
+            elif settings.enable_llm_single_flight:
+                # 同じクエリが実行中であれば、そのストリームを分岐して受け取る
+                events = single_flight.stream(cache_key, open_provider_stream)
+            else:
+                events = await open_provider_stream()
+
+            # クライアント切断時は上流ストリームを閉じ、節約できたトークン数を記録
+            max_tokens = options.get("max_completion_tokens", options.get("max_tokens", 1000))
+            streamed_parts = []
+            outcome = STREAM_FAILED
+            stream_metrics.record_started()
+            try:
+                async for event in events:
+                    if event.get("content"):
+                        streamed_parts.append(event["content"])
+                    yield event
+
+                # ストリーミング完了を示す
+                yield {"content": "", "done": True}
+                outcome = STREAM_COMPLETED
+            except (GeneratorExit, asyncio.CancelledError):
+                outcome = STREAM_CANCELLED
+                if cache_key and single_flight.stream_subscribers(cache_key) > 1:
+                    # 他の購読者のために生成は続くため、節約したトークンはない
+                    max_tokens = 0
+                    logger.info("Streaming query cancelled, provider stream kept for other subscribers")
+                else:
+                    logger.info("Streaming query cancelled, closing provider stream")
+                raise
+            finally:
+                await events.aclose()
+                stream_metrics.record_finished(
+                    outcome, estimate_text_tokens("".join(streamed_parts)), max_tokens
+                )
 
             logger.info("Streaming query execution completed successfully")
 
@@ -281,6 +414,111 @@ class LLMOrchestrator:
             logger.error(f"Error in streaming query execution: {str(e)}")
             raise LLMServiceException(f"Streaming query execution failed: {str(e)}")
 
+    @staticmethod
+    async def _content_events(
+        chunks: AsyncGenerator[str, None]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """プロバイダーのコンテンツチャンクをストリーミングイベントに変換"""
+        try:
+            async for chunk in chunks:
+                yield {"content": chunk, "done": False}
+        finally:
+            # 中断時もプロバイダーのストリームを確実に閉じる
+            await chunks.aclose()
+
+    @staticmethod
+    async def _replay_events(
+        content: str, chunk_chars: int
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        キャッシュ済みレスポンスを合成ストリームとして再生
+
+        Args:
+            content: キャッシュ済みのレスポンス本文
+            chunk_chars: 1イベントあたりの文字数。0以下の場合は一度に送信
+        """
+        if not content:
+            return
+        if chunk_chars <= 0:
+            yield {"content": content, "done": False}
+            return
+        for start in range(0, len(content), chunk_chars):
+            yield {"content": content[start:start + chunk_chars], "done": False}
+
+    async def _caching_events(
+        self,
+        events: AsyncGenerator[Dict[str, Any], None],
+        cache_key: str,
+        request: LLMQueryRequest,
+        service: "LLMServiceBase",
+        provider_options: Dict[str, Any],
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        ストリーミングイベントを中継し、完了したレスポンスをキャッシュ
+
+        キャッシュは完了通知の前に行い、途中で閉じられた場合は保存しません。
+        """
+        streamed_parts = []
+        try:
+            async for event in events:
+                if event.get("content"):
+                    streamed_parts.append(event["content"])
+                yield event
+        finally:
+            await events.aclose()
+
+        await self._cache_streamed_response(
+            cache_key, "".join(streamed_parts), request, service, provider_options
+        )
+
+    async def _cache_streamed_response(
+        self,
+        cache_key: str,
+        content: str,
+        request: LLMQueryRequest,
+        service: "LLMServiceBase",
+        provider_options: Dict[str, Any],
+    ) -> None:
+        """
+        ストリーミングで生成したレスポンスを非ストリーミングと同じ形式でキャッシュ
+
+        本文は送信済みのため、キャッシュへの保存に失敗してもストリームは失敗させません。
+        """
+        try:
+            await self._store_streamed_response(
+                cache_key, content, request, service, provider_options
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache streamed response: {str(e)}")
+
+    async def _store_streamed_response(
+        self,
+        cache_key: str,
+        content: str,
+        request: LLMQueryRequest,
+        service: "LLMServiceBase",
+        provider_options: Dict[str, Any],
+    ) -> None:
+        """ストリーミングで生成したレスポンスをLLMResponseとして保存"""
+        completion_tokens = estimate_text_tokens(content)
+        llm_response = LLMResponse(
+            content=content,
+            model=(
+                provider_options.get("model")
+                or request.query.model
+                or getattr(service, "default_model", "unknown")
+            ),
+            provider=request.query.provider,
+            usage=LLMUsage(
+                completion_tokens=completion_tokens, total_tokens=completion_tokens
+            ),
+        )
+        updated_history = self._build_updated_conversation_history(
+            request.query.conversation_history, request.query.prompt, content
+        )
+        self._set_conversation_optimization_info(llm_response, updated_history)
+        await self._cache_response(cache_key, llm_response)
+
     # === 内部実装メソッド ===
 
     async def _execute_query_with_tools_internal(
@@ -295,6 +533,8 @@ class LLMOrchestrator:
         document_metadata: Optional["DocumentMetadata"] = None,
         document_content: Optional[str] = None,
         include_document_in_system_prompt: bool = True,
+        repository_chunks: Optional[List["DocumentChunk"]] = None,
+        max_tool_rounds: Optional[int] = None,
     ) -> LLMResponse:
         """
         ツール付きLLMクエリを実行
@@ -308,12 +548,18 @@ class LLMOrchestrator:
             logger.warning("No repository context provided")
 
         try:
-            # 1. システムプロンプト生成
+            # 1. システムプロンプト生成（関連チャンクをトークン予算内で選択）
+            document_token_budget = await self._calculate_document_token_budget(
+                service, prompt, conversation_history, options
+            )
             system_prompt = generate_system_prompt(
                 repository_context=repository_context,
                 document_metadata=document_metadata,
                 document_content=document_content,
                 include_document_in_system_prompt=include_document_in_system_prompt,
+                query=prompt,
+                max_document_tokens=document_token_budget,
+                repository_chunks=repository_chunks,
             )
 
             # 2. ツール付きプロバイダーオプション準備
@@ -334,11 +580,12 @@ class LLMOrchestrator:
                 raw_response, provider_options
             )
 
-            # 5. ツール実行とフォローアップ処理
+            # 5. ツール実行とフォローアップ処理（ツール呼び出しがなくなるまで繰り返す）
             if llm_response.tool_calls and len(llm_response.tool_calls) > 0:
                 await handle_tool_execution_and_followup(
                     service, llm_response, tools, repository_context,
-                    prompt, conversation_history, system_prompt, options
+                    prompt, conversation_history, system_prompt, options,
+                    max_rounds=max_tool_rounds,
                 )
             else:
                 logger.info("No tool calls detected in LLM response")
@@ -470,38 +717,10 @@ IMPORTANT: You have access to tools for document analysis and repository managem
         """ツール実行とフォローアップレスポンス生成を処理"""
         logger.info(f"Tool calls detected: {len(llm_response.tool_calls)}, executing tools and generating followup response")
         
-        # 全ツール呼び出しを実行
-        executed_results = []
-        for tool_call in llm_response.tool_calls:
-            try:
-                # リポジトリコンテキストを辞書に変換
-                repo_context_dict = self._convert_repository_context_to_dict(repository_context)
-                
-                # 利用可能な関数のマッピング取得
-                available_functions = {func.name: func for func in tools}
-                
-                # ツール呼び出し実行
-                result = await service.execute_function_call(
-                    tool_call.function,
-                    available_functions,
-                    repository_context=repo_context_dict,
-                )
-                
-                executed_results.append({
-                    "tool_call_id": tool_call.id,
-                    "function_name": tool_call.function.name,
-                    "result": result,
-                })
-                
-                logger.info(f"Tool '{tool_call.function.name}' executed successfully")
-                
-            except Exception as e:
-                executed_results.append({
-                    "tool_call_id": tool_call.id,  
-                    "function_name": tool_call.function.name,
-                    "error": str(e),
-                })
-                logger.error(f"Tool '{tool_call.function.name}' execution failed: {e}")
+        # 全ツール呼び出しを並列実行（結果は呼び出し順）
+        executed_results = await execute_tool_calls(
+            service, llm_response.tool_calls, tools, repository_context
+        )
 
         # 実行結果をレスポンスに追加
         llm_response.tool_execution_results = executed_results
@@ -751,27 +970,132 @@ IMPORTANT: You have access to tools for document analysis and repository managem
         repository_context: Optional["RepositoryContext"] = None,
         document_metadata: Optional["DocumentMetadata"] = None,
         document_content: Optional[str] = None,
+        repository_chunks: Optional[List["DocumentChunk"]] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
     ) -> str:
-        """クエリ用のキャッシュキーを生成"""
-        key_data = {
-            "prompt": prompt,
-            "conversation_history": (
-                [msg.model_dump() for msg in conversation_history]
-                if conversation_history
-                else None
-            ),
-            "options": options,
-            "repository_context": (
-                repository_context.model_dump() if repository_context else None
-            ),
-            "document_metadata": (
-                document_metadata.model_dump() if document_metadata else None
-            ),
-            "document_content": document_content,
-        }
+        """
+        クエリ用のキャッシュキーを生成
+
+        ドキュメントはSHA、会話履歴は連鎖ダイジェストで表します（cache_key参照）。
+        キャッシュは共有されるため、プロバイダーと解決済みモデルもキーに含めます。
+        """
+        return build_cache_key(
+            prompt,
+            conversation_history,
+            options,
+            repository_context,
+            document_metadata,
+            document_content,
+            repository_chunks,
+            provider=provider,
+            model=model,
+        )
+
+    async def _get_cached_response(self, cache_key: str) -> Optional[LLMResponse]:
+        """
+        キャッシュ済みレスポンスを取得
+
+        dictと非同期キャッシュサービス（TieredCache等）の両方に対応します。
+        """
+        if isinstance(self.cache_service, dict):
+            return self.cache_service.get(cache_key)
+        return await self.cache_service.get(cache_key)
+
+    async def _cache_response(self, cache_key: str, response: LLMResponse) -> None:
+        """
+        レスポンスをキャッシュに保存
+
+        非同期キャッシュサービスにはLLMキャッシュのTTLを指定します。
+        """
+        if isinstance(self.cache_service, dict):
+            self.cache_service[cache_key] = response
+        else:
+            await self.cache_service.set(cache_key, response, ttl=settings.llm_cache_ttl)
 
-        key_string = str(sorted(key_data.items()))
-        return hashlib.md5(key_string.encode()).hexdigest()
+    async def _calculate_document_token_budget(
+        self,
+        service: "LLMServiceBase",
+        prompt: str,
+        conversation_history: Optional[List[MessageItem]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        モデルのコンテキストウィンドウからドキュメント用トークン予算を算出
+        （llm_document_max_tokens を上限とする）
+
+        Args:
+            service: LLMサービス
+            prompt: ユーザープロンプト
+            conversation_history: 会話履歴
+            options: 処理オプション（modelを含む場合はそのモデルを優先）
+
+        Returns:
+            ドキュメント内容に割り当てるトークン数
+        """
+        model = (options or {}).get("model") or getattr(service, "default_model", None)
+        context_window = None
+        try:
+            capabilities = await service.get_capabilities()
+            window = capabilities.max_tokens.get(model) if model else None
+            if isinstance(window, int):
+                context_window = window
+        except Exception as e:
+            logger.debug(f"Could not determine context window for model {model}: {e}")
+
+        reserved_tokens = estimate_text_tokens(prompt or "")
+        for message in conversation_history or []:
+            reserved_tokens += estimate_text_tokens(message.content)
+
+        return calculate_document_token_budget(
+            context_window, reserved_tokens, max_tokens=settings.llm_document_max_tokens
+        )
+
+    async def _retrieve_repository_chunks(
+        self,
+        repository_context: "RepositoryContext",
+        prompt: str,
+        top_k: int,
+    ) -> Optional[List["DocumentChunk"]]:
+        """
+        リポジトリ全体のチャンクインデックスから関連チャンクを取得
+
+        検索は既存のインデックスに対してローカルで行い、クエリ中にドキュメントは取得しない。
+        未構築または期限切れのインデックスはバックグラウンドで構築する。
+
+        Args:
+            repository_context: リポジトリコンテキスト
+            prompt: ユーザープロンプト
+            top_k: 取得件数
+
+        Returns:
+            関連度順のチャンクリスト（取得できない場合はNone）
+        """
+        try:
+            if not self.document_service:
+                from doc_ai_helper_backend.services.document import DocumentService
+                self.document_service = DocumentService()
+
+            service = repository_context.service
+            service = service.value if hasattr(service, "value") else service
+            index = repository_index_registry.get_built(
+                self.document_service,
+                service,
+                repository_context.owner,
+                repository_context.repo,
+                repository_context.ref or "main",
+            )
+            if index is None:
+                logger.info("Repository index is not built yet, building in background")
+                return None
+
+            results = index.search(prompt, top_k)
+            logger.info(f"Repository chunks retrieved: {len(results)} (index: {index.chunk_count} chunks)")
+            return [chunk for chunk, _ in results] or None
+
+        except Exception as e:
+            logger.warning(f"Failed to retrieve repository chunks: {e}")
+            return None
 
     async def _retrieve_document_content(
         self, 
@@ -808,6 +1132,22 @@ IMPORTANT: You have access to tools for document analysis and repository managem
             )
             
             logger.info(f"Document content retrieved: {len(document_response.content.content)} characters")
+
+            # 構築済みのリポジトリインデックスがあれば取得した内容で更新（SHAが同じなら何もしない）
+            service = repository_context.service
+            index = repository_index_registry.get(
+                service.value if hasattr(service, "value") else service,
+                repository_context.owner,
+                repository_context.repo,
+                repository_context.ref or "main",
+            )
+            if index is not None:
+                index.add_document(
+                    repository_context.current_path,
+                    document_response.content.content,
+                    document_response.metadata.sha,
+                )
+
             return document_response.content.content, document_response.metadata
             
         except Exception as e:
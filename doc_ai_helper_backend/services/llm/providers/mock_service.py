@@ -90,7 +90,7 @@ class MockLLMService(LLMServiceBase):
             supports_function_calling=True,
         )
 
-    async def estimate_tokens(self, text: str) -> int:
+    async def estimate_tokens(self, text: str, model: Optional[str] = None) -> int:
         """テキスト内のトークン数を推定（簡単な文字ベース）"""
         return len(text) // 4  # 簡単な推定
 
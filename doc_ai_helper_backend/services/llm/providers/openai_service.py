@@ -21,6 +21,7 @@ if TYPE_CHECKING:
     )
 
 from doc_ai_helper_backend.services.llm.base import LLMServiceBase
+from doc_ai_helper_backend.services.llm.tokenizer import tokenizer_registry
 from doc_ai_helper_backend.models.llm import (
     LLMResponse,
     LLMUsage,
@@ -130,9 +131,16 @@ class OpenAIService(LLMServiceBase):
             supports_function_calling=True,
         )
 
-    async def estimate_tokens(self, text: str) -> int:
-        """OpenAIのtiktokenを使用してテキスト内のトークン数を推定"""
+    async def estimate_tokens(self, text: str, model: Optional[str] = None) -> int:
+        """
+        OpenAIのtiktokenを使用してテキスト内のトークン数を推定
+
+        デフォルト以外のモデルが指定された場合は、そのモデルのエンコーダーを
+        共有レジストリから取得して使用します。
+        """
         try:
+            if model and model != self.default_model:
+                return tokenizer_registry.count_tokens(text, model=model)
             return len(self._token_encoder.encode(text))
         except Exception as e:
             logger.warning(f"Failed to estimate tokens: {str(e)}, using character approximation")
@@ -214,14 +222,91 @@ class OpenAIService(LLMServiceBase):
 
             stream = await self.async_client.chat.completions.create(**options)
 
-            async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # クライアント切断時に接続を解放して生成を止める
+                await self._close_stream(stream)
 
         except Exception as e:
             logger.error(f"OpenAI streaming API call failed: {str(e)}")
             raise LLMServiceException(f"OpenAI streaming failed: {str(e)}")
 
+    async def _stream_provider_api_with_tools(
+        self, options: Dict[str, Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """ツール呼び出しのデルタを含めてOpenAI APIからストリーミング"""
+        try:
+            options["stream"] = True
+            options["stream_options"] = {"include_usage": True}
+
+            stream = await self.async_client.chat.completions.create(**options)
+
+            # インデックスごとにツール呼び出しの断片を組み立てる
+            calls: Dict[int, Dict[str, str]] = {}
+            try:
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        yield {
+                            "usage": LLMUsage(
+                                prompt_tokens=chunk.usage.prompt_tokens,
+                                completion_tokens=chunk.usage.completion_tokens,
+                                total_tokens=chunk.usage.total_tokens,
+                            )
+                        }
+                    if not chunk.choices:
+                        continue
+
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        yield {"content": delta.content}
+
+                    for tool_call in delta.tool_calls or []:
+                        call = calls.setdefault(tool_call.index, {"id": "", "name": "", "arguments": ""})
+                        name = tool_call.function.name if tool_call.function else None
+                        arguments = tool_call.function.arguments if tool_call.function else None
+                        if tool_call.id:
+                            call["id"] = tool_call.id
+                        if name:
+                            call["name"] += name
+                        if arguments:
+                            call["arguments"] += arguments
+                        yield {
+                            "tool_call_delta": {
+                                "index": tool_call.index,
+                                "id": tool_call.id,
+                                "name": name,
+                                "arguments": arguments or "",
+                            }
+                        }
+            finally:
+                # クライアント切断時に接続を解放して生成を止める
+                await self._close_stream(stream)
+
+            if calls:
+                yield {
+                    "tool_calls": [
+                        ToolCall(
+                            id=call["id"],
+                            function=FunctionCall(name=call["name"], arguments=call["arguments"] or "{}"),
+                        )
+                        for _, call in sorted(calls.items())
+                    ]
+                }
+
+        except Exception as e:
+            logger.error(f"OpenAI streaming API call failed: {str(e)}")
+            raise LLMServiceException(f"OpenAI streaming failed: {str(e)}")
+
+    @staticmethod
+    async def _close_stream(stream: Any) -> None:
+        """ストリームを閉じて接続を解放（AsyncStreamは close、非同期ジェネレーターは aclose）"""
+        close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+        if close is not None:
+            await close()
+
     async def _convert_provider_response(self, raw_response: Any, options: Dict[str, Any]) -> LLMResponse:
         """OpenAIレスポンスを標準化されたLLMResponseに変換"""
         try:
@@ -0,0 +1,383 @@
+"""
+Repository Chunk Index
+
+リポジトリ全体のドキュメントチャンクに対するローカル語彙インデックスを提供します。
+(service, owner, repo, ref) ごとにインデックスを保持し、クエリ時にはネットワークアクセスなしで
+全ドキュメントから関連チャンクを取得できるようにします。
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from doc_ai_helper_backend.core.config import settings
+from doc_ai_helper_backend.core.exceptions import (
+    GitHubRateLimitError,
+    RateLimitException,
+)
+
+from .document_retriever import BM25Index, DocumentChunk, split_into_chunks
+
+logger = logging.getLogger(__name__)
+
+# インデックス対象とするドキュメントの拡張子
+INDEXABLE_EXTENSIONS = {".md", ".markdown", ".qmd", ".html", ".htm"}
+# インデックス構築時の同時取得数
+INDEX_BUILD_CONCURRENCY = 4
+
+RepositoryKey = Tuple[str, str, str, str]
+
+
+class RepositoryChunkIndex:
+    """
+    単一リポジトリ(ref)のチャンクインデックス
+
+    ドキュメントはパスとSHAで管理し、SHAが変わらない限り再分割しない。
+    BM25インデックスは検索時に必要になった時点で再構築する。
+    """
+
+    def __init__(self, key: RepositoryKey):
+        """
+        インデックスの初期化
+
+        Args:
+            key: (service, owner, repo, ref)
+        """
+        self.key = key
+        self.built_at: Optional[float] = None
+        self._documents: Dict[str, Tuple[Optional[str], List[DocumentChunk]]] = {}
+        self._bm25: Optional[BM25Index] = None
+
+    @property
+    def document_count(self) -> int:
+        """インデックス済みドキュメント数"""
+        return len(self._documents)
+
+    @property
+    def chunk_count(self) -> int:
+        """インデックス済みチャンク数"""
+        return sum(len(chunks) for _, chunks in self._documents.values())
+
+    def paths(self) -> List[str]:
+        """インデックス済みドキュメントのパス一覧"""
+        return list(self._documents)
+
+    def is_stale(self, ttl: int) -> bool:
+        """インデックスが未構築またはTTLを超過しているか"""
+        return self.built_at is None or time.time() - self.built_at > ttl
+
+    def has_document(self, path: str, sha: Optional[str] = None) -> bool:
+        """指定パス（とSHA）のドキュメントがインデックス済みか"""
+        entry = self._documents.get(path)
+        if entry is None:
+            return False
+        return sha is None or entry[0] == sha
+
+    def add_document(self, path: str, content: str, sha: Optional[str] = None) -> bool:
+        """
+        ドキュメントをインデックスに追加（同一SHAの場合は何もしない）
+
+        Args:
+            path: ドキュメントパス
+            content: ドキュメント内容
+            sha: ドキュメントのblob SHA
+
+        Returns:
+            インデックスが更新された場合True
+        """
+        if sha is not None and self.has_document(path, sha):
+            return False
+        self._documents[path] = (sha, split_into_chunks(content, source=path))
+        self._bm25 = None
+        return True
+
+    def remove_document(self, path: str) -> bool:
+        """ドキュメントをインデックスから削除"""
+        if self._documents.pop(path, None) is None:
+            return False
+        self._bm25 = None
+        return True
+
+    def search(self, query: str, top_k: int = 8) -> List[Tuple[DocumentChunk, float]]:
+        """
+        クエリに関連するチャンクを取得
+
+        Args:
+            query: 検索クエリ
+            top_k: 取得件数
+
+        Returns:
+            (チャンク, スコア)のリスト（スコア降順）
+        """
+        if self._bm25 is None:
+            chunks = [
+                chunk for _, doc_chunks in self._documents.values() for chunk in doc_chunks
+            ]
+            self._bm25 = BM25Index(chunks)
+        return self._bm25.top_k(query, top_k)
+
+
+class RepositoryIndexRegistry:
+    """
+    リポジトリごとのチャンクインデックスを管理するプロセス全体のレジストリ
+
+    保持するリポジトリ数はLRUで制限し、同一リポジトリの構築は1回にまとめる。
+    """
+
+    def __init__(self, max_repositories: int = 32):
+        """
+        レジストリの初期化
+
+        Args:
+            max_repositories: 保持する最大リポジトリ数
+        """
+        self.max_repositories = max_repositories
+        self._indexes: "OrderedDict[RepositoryKey, RepositoryChunkIndex]" = OrderedDict()
+        self._locks: Dict[RepositoryKey, asyncio.Lock] = {}
+        self._builds: Dict[RepositoryKey, "asyncio.Task"] = {}
+
+    def get(self, service: str, owner: str, repo: str, ref: str) -> Optional[RepositoryChunkIndex]:
+        """既存のインデックスを取得（存在しない場合はNone）"""
+        key = (service, owner, repo, ref)
+        index = self._indexes.get(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+        return index
+
+    def get_or_create(self, service: str, owner: str, repo: str, ref: str) -> RepositoryChunkIndex:
+        """インデックスを取得、存在しない場合は空のインデックスを作成"""
+        key = (service, owner, repo, ref)
+        index = self.get(*key)
+        if index is None:
+            index = RepositoryChunkIndex(key)
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_repositories:
+                evicted, _ = self._indexes.popitem(last=False)
+                self._locks.pop(evicted, None)
+        return index
+
+    def discard(self, service: str, owner: str, repo: str, ref: str) -> None:
+        """インデックスを破棄"""
+        key = (service, owner, repo, ref)
+        self._indexes.pop(key, None)
+        self._locks.pop(key, None)
+
+    async def ensure_built(
+        self,
+        document_service,
+        service: str,
+        owner: str,
+        repo: str,
+        ref: str,
+        root_path: str = "",
+    ) -> RepositoryChunkIndex:
+        """
+        インデックスが未構築または期限切れの場合に構築する
+
+        Args:
+            document_service: ドキュメント取得に使うDocumentService
+            service: Gitサービス名
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            ref: ブランチ/タグ名
+            root_path: インデックス対象のルートディレクトリ
+
+        Returns:
+            構築済みのインデックス
+        """
+        key = (service, owner, repo, ref)
+        index = self.get_or_create(*key)
+        if not index.is_stale(settings.repository_index_ttl):
+            return index
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if index.is_stale(settings.repository_index_ttl):
+                await build_repository_index(
+                    index,
+                    document_service,
+                    root_path=root_path,
+                    max_documents=settings.repository_index_max_documents,
+                )
+        return index
+
+    def get_built(
+        self,
+        document_service,
+        service: str,
+        owner: str,
+        repo: str,
+        ref: str,
+        root_path: str = "",
+    ) -> Optional[RepositoryChunkIndex]:
+        """
+        構築済みのインデックスを取得し、未構築または期限切れならバックグラウンドで構築する
+
+        クエリ処理中にドキュメントを取得しないため、構築を待たずに既存のインデックス
+        （期限切れでも）を返す。一度も構築されていない場合はNoneを返す。
+
+        Args:
+            document_service: ドキュメント取得に使うDocumentService
+            service: Gitサービス名
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            ref: ブランチ/タグ名
+            root_path: インデックス対象のルートディレクトリ
+
+        Returns:
+            構築済みのインデックス（未構築の場合はNone）
+        """
+        key = (service, owner, repo, ref)
+        index = self.get_or_create(*key)
+        if index.is_stale(settings.repository_index_ttl):
+            build = self._builds.get(key)
+            if build is None or build.done():
+                self._builds[key] = asyncio.ensure_future(
+                    self._build_in_background(key, document_service, root_path)
+                )
+        return index if index.built_at is not None else None
+
+    async def _build_in_background(
+        self, key: RepositoryKey, document_service, root_path: str
+    ) -> None:
+        """バックグラウンドでインデックスを構築（失敗はログのみ）"""
+        try:
+            await self.ensure_built(document_service, *key, root_path=root_path)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Background repository index build failed for {key}: {e}")
+        finally:
+            self._builds.pop(key, None)
+
+    async def rebuild(
+        self,
+        document_service,
+        service: str,
+        owner: str,
+        repo: str,
+        ref: str,
+        root_path: str = "",
+        transform_links: bool = False,
+        skip_unchanged: bool = True,
+    ) -> RepositoryChunkIndex:
+        """
+        期限に関係なくインデックスを再構築する（ウォームアップ用）
+
+        同一リポジトリの構築とは同じロックで直列化する。
+
+        Args:
+            document_service: ドキュメント取得に使うDocumentService
+            service: Gitサービス名
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            ref: ブランチ/タグ名
+            root_path: インデックス対象のルートディレクトリ
+            transform_links: リンク変換済みのドキュメントを取得するか
+            skip_unchanged: SHAが変わっていないドキュメントの取得を省略するか
+
+        Returns:
+            構築済みのインデックス
+        """
+        key = (service, owner, repo, ref)
+        index = self.get_or_create(*key)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            await build_repository_index(
+                index,
+                document_service,
+                root_path=root_path,
+                max_documents=settings.repository_index_max_documents,
+                transform_links=transform_links,
+                skip_unchanged=skip_unchanged,
+            )
+        return index
+
+
+async def build_repository_index(
+    index: RepositoryChunkIndex,
+    document_service,
+    root_path: str = "",
+    max_documents: int = 200,
+    concurrency: int = INDEX_BUILD_CONCURRENCY,
+    transform_links: bool = False,
+    skip_unchanged: bool = True,
+) -> RepositoryChunkIndex:
+    """
+    リポジトリ構造を取得し、対象ドキュメントをインデックスに登録
+
+    SHAが変わっていないドキュメントは再取得しない。構造から消えたドキュメントは削除する。
+
+    Args:
+        index: 構築対象のインデックス
+        document_service: ドキュメント取得に使うDocumentService
+        root_path: インデックス対象のルートディレクトリ
+        max_documents: インデックスする最大ドキュメント数
+        concurrency: 同時取得数
+        transform_links: リンク変換済みのドキュメントを取得するか
+            （Trueの場合はドキュメントAPIの既定と同じキャッシュキーに載る）
+        skip_unchanged: SHAが変わっていないドキュメントの取得を省略するか
+            （Falseの場合は全件取得し、ドキュメントキャッシュも温める）
+
+    Returns:
+        構築済みのインデックス
+    """
+    service, owner, repo, ref = index.key
+    structure = await document_service.get_repository_structure(service, owner, repo, ref)
+
+    prefix = root_path.strip("/")
+    targets = [
+        item
+        for item in structure.tree
+        if item.type == "file"
+        and os.path.splitext(item.path)[1].lower() in INDEXABLE_EXTENSIONS
+        and (not prefix or item.path.startswith(prefix + "/"))
+    ][:max_documents]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(path: str) -> None:
+        async with semaphore:
+            try:
+                document = await document_service.get_document(
+                    service, owner, repo, path, ref=ref, transform_links=transform_links
+                )
+                index.add_document(path, document.content.content, document.metadata.sha)
+            except (RateLimitException, GitHubRateLimitError):
+                # レート制限は呼び出し元に伝え、残りの取得を止める
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to index {service}/{owner}/{repo}/{path}: {e}")
+
+    tasks = [
+        asyncio.ensure_future(fetch(item.path))
+        for item in targets
+        if not (skip_unchanged and item.sha and index.has_document(item.path, item.sha))
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    current_paths = {item.path for item in targets}
+    for path in [p for p in index.paths() if p not in current_paths]:
+        index.remove_document(path)
+
+    index.built_at = time.time()
+    logger.info(
+        f"Repository index built for {service}/{owner}/{repo}@{ref}: "
+        f"{index.document_count} documents, {index.chunk_count} chunks"
+    )
+    return index
+
+
+# プロセス全体で共有するレジストリ
+repository_index_registry = RepositoryIndexRegistry(
+    max_repositories=settings.repository_index_max_repositories
+)
@@ -0,0 +1,211 @@
+"""
+Single Flight
+
+同一のキャッシュキーに対する実行中のLLMクエリを1つにまとめます。
+共有リンクの直後など、同じ文書への同じ質問が同時に届いた場合でも
+プロバイダー呼び出しは1回だけ行い、後続のリクエストは先行リクエストの
+結果を待つか、ストリームを分岐して受け取ります。
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional
+
+from doc_ai_helper_backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _StreamFlight:
+    """実行中のストリーム1本分の状態（受信済みイベントと各購読者の読み出し位置）"""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.positions: Dict[int, int] = {}
+        self.changed = asyncio.Event()
+        self.consumed = asyncio.Event()
+        self.task: Optional["asyncio.Task"] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self.positions)
+
+    def notify(self) -> None:
+        """待機中の購読者を起こす"""
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def notify_consumed(self) -> None:
+        """読み出し位置の更新を上流の読み出し側に通知"""
+        self.consumed.set()
+        self.consumed = asyncio.Event()
+
+    def lag(self) -> int:
+        """最も遅い購読者が未読のイベント数"""
+        if not self.positions:
+            return 0
+        return len(self.events) - min(self.positions.values())
+
+
+def _is_current_loop(task: "asyncio.Task") -> bool:
+    """タスクが現在のイベントループに属するか"""
+    return task.get_loop() is asyncio.get_running_loop()
+
+
+class SingleFlight:
+    """
+    キャッシュキー単位での実行中クエリの重複排除
+
+    非ストリーミングクエリは先行リクエストのタスクを共有し、ストリーミング
+    クエリは先行リクエストのイベントを全購読者に配信します。実行は専用の
+    タスクで行うため、先行リクエストのクライアントが切断しても後続の
+    リクエストには影響しません。
+    """
+
+    def __init__(self, max_lag: Optional[int] = None):
+        """
+        状態の初期化
+
+        Args:
+            max_lag: 最も遅い購読者より先に読み出すイベント数の上限（省略時は設定値）
+        """
+        self.max_lag = max(
+            max_lag if max_lag is not None else settings.llm_stream_buffer_size, 1
+        )
+        self._calls: Dict[str, "asyncio.Task"] = {}
+        self._streams: Dict[str, _StreamFlight] = {}
+        self.deduplicated_queries = 0
+        self.deduplicated_streams = 0
+
+    def in_flight(self) -> int:
+        """実行中のクエリ数"""
+        return len(self._calls) + len(self._streams)
+
+    def stream_subscribers(self, key: str) -> int:
+        """実行中のストリームの購読者数"""
+        flight = self._streams.get(key)
+        return flight.subscribers if flight is not None else 0
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        同一キーの実行中クエリがあればその結果を待ち、なければ実行
+
+        Args:
+            key: クエリのキャッシュキー
+            call: 先行リクエストとして実行するコルーチン関数
+
+        Returns:
+            Any: クエリの結果（後続リクエストには同じ結果を返す）
+        """
+        task = self._calls.get(key)
+        if task is not None and not task.done() and _is_current_loop(task):
+            self.deduplicated_queries += 1
+            logger.info("Joining in-flight query for the same cache key")
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(call())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finish_call(key, done))
+        # 呼び出し元がキャンセルされても実行は他の待機者のために継続
+        return await asyncio.shield(task)
+
+    def _finish_call(self, key: str, task: "asyncio.Task") -> None:
+        """完了したクエリを登録から外す"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # 待機者がいない場合の未取得例外の警告を防ぐ
+            task.exception()
+
+    async def stream(
+        self,
+        key: str,
+        open_stream: Callable[[], Awaitable[AsyncGenerator[Dict[str, Any], None]]],
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        同一キーの実行中ストリームがあれば分岐し、なければ開始
+
+        後から参加した購読者にも受信済みのイベントを先頭から配信します。
+        上流は最も遅い購読者より ``max_lag`` イベント以上先には読み出さないため、
+        遅いクライアントの背圧はプロバイダーの接続まで伝わります。
+        全ての購読者が離脱した場合は上流のストリームを閉じます。
+
+        Args:
+            key: クエリのキャッシュキー
+            open_stream: 先行リクエストとして上流ストリームを開くコルーチン関数
+
+        Yields:
+            Dict[str, Any]: ストリーミングイベント
+        """
+        flight = self._streams.get(key)
+        if flight is not None and flight.task is not None and _is_current_loop(flight.task):
+            self.deduplicated_streams += 1
+            logger.info("Joining in-flight stream for the same cache key")
+        else:
+            flight = _StreamFlight()
+            self._streams[key] = flight
+            flight.task = asyncio.ensure_future(self._produce(key, flight, open_stream))
+
+        subscriber = object()
+        flight.positions[id(subscriber)] = 0
+        index = 0
+        try:
+            while True:
+                while index < len(flight.events):
+                    event = flight.events[index]
+                    index += 1
+                    yield event
+                    # 次のイベントを要求された時点で前のイベントは送信済み
+                    flight.positions[id(subscriber)] = index
+                    flight.notify_consumed()
+                if flight.error is not None:
+                    raise flight.error
+                if flight.done:
+                    return
+                await flight.changed.wait()
+        finally:
+            del flight.positions[id(subscriber)]
+            flight.notify_consumed()
+            if flight.subscribers == 0 and not flight.task.done():
+                # 購読者がいなくなったストリームは新規参加させずに停止
+                if self._streams.get(key) is flight:
+                    del self._streams[key]
+                flight.task.cancel()
+                try:
+                    await flight.task
+                except asyncio.CancelledError:
+                    pass
+
+    async def _produce(
+        self,
+        key: str,
+        flight: _StreamFlight,
+        open_stream: Callable[[], Awaitable[AsyncGenerator[Dict[str, Any], None]]],
+    ) -> None:
+        """上流ストリームを読み出して購読者に配信"""
+        try:
+            events = await open_stream()
+            try:
+                async for event in events:
+                    flight.events.append(event)
+                    flight.notify()
+                    # 遅い購読者が追いつくまで上流の読み出しを止める（背圧）
+                    while flight.lag() >= self.max_lag:
+                        await flight.consumed.wait()
+            finally:
+                await events.aclose()
+            flight.done = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            if self._streams.get(key) is flight:
+                del self._streams[key]
+            flight.notify()
+
+
+# プロセス全体で共有する実行中クエリの登録
+single_flight = SingleFlight()
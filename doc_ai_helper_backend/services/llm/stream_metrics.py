@@ -0,0 +1,80 @@
+"""
+Stream Metrics
+
+ストリーミングクエリの実行結果（完了・キャンセル・失敗）を集計します。
+クライアント切断によりキャンセルされたストリームについては、生成せずに
+済んだトークン数の推定値も記録します。
+"""
+
+import threading
+from typing import Dict
+
+# ストリームの終了状態
+STREAM_COMPLETED = "completed"
+STREAM_CANCELLED = "cancelled"
+STREAM_FAILED = "failed"
+
+
+class StreamMetrics:
+    """
+    ストリーミングクエリのプロセス全体の集計
+    """
+
+    def __init__(self):
+        """集計の初期化"""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """集計をリセット"""
+        with self._lock:
+            self._active = 0
+            self._outcomes = {STREAM_COMPLETED: 0, STREAM_CANCELLED: 0, STREAM_FAILED: 0}
+            self._streamed_tokens = 0
+            self._tokens_saved = 0
+            self._replayed = 0
+
+    def record_started(self) -> None:
+        """ストリームの開始を記録"""
+        with self._lock:
+            self._active += 1
+
+    def record_replayed(self) -> None:
+        """キャッシュ済みレスポンスの再生を記録"""
+        with self._lock:
+            self._replayed += 1
+
+    def record_finished(
+        self, outcome: str, streamed_tokens: int, max_tokens: int = 0
+    ) -> None:
+        """
+        ストリームの終了を記録
+
+        Args:
+            outcome: 終了状態（completed / cancelled / failed）
+            streamed_tokens: クライアントに送信したトークン数（推定）
+            max_tokens: 生成トークン数の上限。キャンセル時は残りを節約分とみなす
+        """
+        with self._lock:
+            self._active = max(self._active - 1, 0)
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+            self._streamed_tokens += streamed_tokens
+            if outcome == STREAM_CANCELLED:
+                self._tokens_saved += max(max_tokens - streamed_tokens, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        """現在の集計値を取得"""
+        with self._lock:
+            return {
+                "active_streams": self._active,
+                "completed_streams": self._outcomes[STREAM_COMPLETED],
+                "cancelled_streams": self._outcomes[STREAM_CANCELLED],
+                "failed_streams": self._outcomes[STREAM_FAILED],
+                "replayed_streams": self._replayed,
+                "streamed_tokens": self._streamed_tokens,
+                "estimated_tokens_saved": self._tokens_saved,
+            }
+
+
+# プロセス全体で共有する集計
+stream_metrics = StreamMetrics()
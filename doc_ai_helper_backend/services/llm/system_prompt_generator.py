@@ -7,7 +7,7 @@ System Prompt Generation
 """
 
 import logging
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 # Forward references for repository context models
 if TYPE_CHECKING:
@@ -16,6 +16,8 @@ if TYPE_CHECKING:
         DocumentMetadata,
     )
 
+from .document_retriever import DocumentChunk, select_relevant_content
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,22 +26,33 @@ def generate_system_prompt(
     document_metadata: Optional["DocumentMetadata"] = None,
     document_content: Optional[str] = None,
     include_document_in_system_prompt: bool = True,
+    query: Optional[str] = None,
+    max_document_tokens: Optional[int] = None,
+    repository_chunks: Optional[List[DocumentChunk]] = None,
 ) -> Optional[str]:
     """
     統合されたシステムプロンプト生成
-    
+
     Args:
         repository_context: リポジトリコンテキスト情報
         document_metadata: ドキュメントメタデータ
         document_content: ドキュメント内容
         include_document_in_system_prompt: システムプロンプトにドキュメントを含めるか
-        
+            （False でも repository_chunks があればチャンクのみのプロンプトを生成）
+        query: ドキュメントの関連チャンク選択に使うユーザープロンプト
+        max_document_tokens: ドキュメント内容に割り当てるトークン予算
+            （指定時は関連度順にチャンクを選択、未指定時は先頭から切り詰め）
+        repository_chunks: リポジトリ全体から取得した関連チャンク（関連度順）
+
     Returns:
         生成されたシステムプロンプト、または None
     """
     try:
         if not include_document_in_system_prompt:
-            return None
+            # リポジトリ全体検索のチャンクは自動取り込みの設定とは独立して埋め込む
+            if not repository_chunks:
+                return None
+            document_content = None
 
         prompt_parts = []
 
@@ -71,13 +84,42 @@ def generate_system_prompt(
             if hasattr(document_metadata, 'file_size') and document_metadata.file_size:
                 prompt_parts.append(f"ファイルサイズ: {document_metadata.file_size} bytes")
 
+        # リポジトリ全体の関連チャンク埋め込み（ドキュメント予算の一部を割り当て）
+        if repository_chunks:
+            chunk_budget = max_document_tokens
+            if chunk_budget is not None and document_content:
+                chunk_budget //= 2
+            included_chunks = _select_chunks_within_budget(repository_chunks, chunk_budget)
+            if included_chunks:
+                prompt_parts.append("=== リポジトリ内の関連ドキュメント ===")
+                for chunk in included_chunks:
+                    prompt_parts.append(f"--- {chunk.source}: {chunk.heading} ---" if chunk.heading else f"--- {chunk.source} ---")
+                    prompt_parts.append(chunk.text)
+                prompt_parts.append("=== 関連ドキュメントここまで ===")
+                if max_document_tokens is not None:
+                    max_document_tokens = max(
+                        0, max_document_tokens - sum(chunk.tokens for chunk in included_chunks)
+                    )
+                logger.info(f"Repository chunks included: {len(included_chunks)}/{len(repository_chunks)}")
+
         # ドキュメント内容埋め込み
         if document_content:
             prompt_parts.append("=== 現在のドキュメント内容 ===")
             
-            # 長すぎる場合は切り詰め（トークン制限を考慮）
             max_content_length = 8000  # 約2000トークンに相当
-            if len(document_content) > max_content_length:
+            if max_document_tokens is not None:
+                # トークン予算内でプロンプトに関連するチャンクを選択
+                selected_content, stats = select_relevant_content(
+                    document_content, query, max_document_tokens
+                )
+                prompt_parts.append(selected_content)
+                logger.info(
+                    f"Document content selected by relevance: "
+                    f"{stats['selected_chunks']}/{stats['total_chunks']} chunks, "
+                    f"{stats['selected_tokens']}/{stats['total_tokens']} tokens"
+                )
+            elif len(document_content) > max_content_length:
+                # 予算が指定されない場合は従来通り先頭から切り詰め
                 truncated_content = document_content[:max_content_length] + "\n...(内容が長いため省略されました)"
                 prompt_parts.append(truncated_content)
                 logger.info(f"Document content truncated from {len(document_content)} to {max_content_length} characters")
@@ -95,6 +137,30 @@ def generate_system_prompt(
         return None
 
 
+def _select_chunks_within_budget(
+    chunks: List[DocumentChunk], token_budget: Optional[int]
+) -> List[DocumentChunk]:
+    """
+    関連度順のチャンクをトークン予算内に収まるだけ選択
+
+    Args:
+        chunks: 関連度順のチャンク
+        token_budget: トークン予算（Noneの場合は無制限）
+
+    Returns:
+        選択されたチャンク
+    """
+    if token_budget is None:
+        return list(chunks)
+    selected = []
+    used = 0
+    for chunk in chunks:
+        if used + chunk.tokens <= token_budget:
+            selected.append(chunk)
+            used += chunk.tokens
+    return selected
+
+
 def _build_bilingual_tool_system_prompt() -> str:
     """
     バイリンガルツール実行システムのプロンプトを構築
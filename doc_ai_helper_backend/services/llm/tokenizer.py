@@ -0,0 +1,127 @@
+"""
+Tokenizer Registry
+
+プロセス全体で共有するトークンエンコーダーの登録とトークン数のメモ化を提供します。
+エンコーダーはモデル（またはエンコーディング名）ごとに一度だけ読み込み、
+同じ内容のテキストのトークン数は内容のハッシュをキーに再利用するため、
+長い会話履歴を毎回トークン化し直すコストを避けられます。
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from doc_ai_helper_backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# モデル固有のエンコーダーがない場合のエンコーディング
+DEFAULT_ENCODING = "cl100k_base"
+
+
+class TokenizerRegistry:
+    """
+    エンコーダーとトークン数のプロセス全体のキャッシュ
+    """
+
+    def __init__(self, max_counts: Optional[int] = None):
+        """
+        レジストリの初期化
+
+        Args:
+            max_counts: メモ化するトークン数の最大件数（省略時は設定値）
+        """
+        self._lock = threading.Lock()
+        self._encoders: Dict[str, Any] = {}
+        self._counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._max_counts = (
+            max_counts if max_counts is not None else settings.llm_token_count_cache_size
+        )
+
+    def clear(self) -> None:
+        """エンコーダーとメモ化したトークン数を破棄"""
+        with self._lock:
+            self._encoders.clear()
+            self._counts.clear()
+
+    def get_encoder(
+        self, model: Optional[str] = None, encoding_name: str = DEFAULT_ENCODING
+    ) -> Optional[Any]:
+        """
+        モデルまたはエンコーディング名に対応するエンコーダーを取得
+
+        Args:
+            model: モデル名（指定時はモデル固有のエンコーダーを優先）
+            encoding_name: モデルがない場合や未知のモデルの場合のエンコーディング
+
+        Returns:
+            エンコーダー。tiktokenが利用できない場合はNone
+        """
+        key = f"model:{model}" if model else encoding_name
+        encoder = self._encoders.get(key)
+        if encoder is not None:
+            return encoder
+
+        try:
+            import tiktoken
+        except ImportError:
+            return None
+
+        if model:
+            try:
+                encoder = tiktoken.encoding_for_model(model)
+            except KeyError:
+                # モデル固有のエンコーダーが利用できない場合の代替
+                encoder = tiktoken.get_encoding(encoding_name)
+        else:
+            encoder = tiktoken.get_encoding(encoding_name)
+
+        with self._lock:
+            return self._encoders.setdefault(key, encoder)
+
+    def count_tokens(
+        self,
+        text: str,
+        model: Optional[str] = None,
+        encoding_name: str = DEFAULT_ENCODING,
+    ) -> int:
+        """
+        テキストのトークン数を取得（内容のハッシュでメモ化）
+
+        Args:
+            text: 対象テキスト
+            model: モデル名
+            encoding_name: エンコーディング名
+
+        Returns:
+            int: トークン数。tiktokenが利用できない場合は文字数からの概算
+        """
+        encoder = self.get_encoder(model, encoding_name)
+        if encoder is None:
+            return len(text) // 4  # 4文字 ≈ 1トークンの概算
+
+        key = (
+            getattr(encoder, "name", encoding_name),
+            hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+        )
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                return count
+
+        count = len(encoder.encode(text))
+
+        if self._max_counts > 0:
+            with self._lock:
+                self._counts[key] = count
+                self._counts.move_to_end(key)
+                while len(self._counts) > self._max_counts:
+                    self._counts.popitem(last=False)
+        return count
+
+
+# プロセス全体で共有するレジストリ
+tokenizer_registry = TokenizerRegistry()
@@ -4,9 +4,11 @@ Tool Execution and Followup
 ツール実行とフォローアップレスポンス生成機能を提供します。
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+import time
+from typing import AsyncGenerator, Callable, Dict, Any, Optional, List, TYPE_CHECKING
 
 # Forward references for repository context models
 if TYPE_CHECKING:
@@ -18,7 +20,9 @@ from doc_ai_helper_backend.models.llm import (
     MessageItem,
     MessageRole,
     FunctionDefinition,
+    ToolChoice,
 )
+from doc_ai_helper_backend.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,82 +36,387 @@ async def handle_tool_execution_and_followup(
     conversation_history: Optional[List[MessageItem]],
     system_prompt: Optional[str],
     options: Optional[Dict[str, Any]],
+    max_rounds: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    time_budget: Optional[float] = None,
 ):
-    """ツール実行とフォローアップレスポンス生成を処理"""
+    """
+    ツール実行とフォローアップレスポンス生成を処理
+
+    ツール呼び出しを実行し、実際の結果を ``tool`` ロールのメッセージとして
+    モデルに返す。モデルがツールを呼ばなくなった時点で終了し、ラウンド数・
+    トークン・時間の予算を使い切った場合はツールなしで最終回答を求める。
+
+    Args:
+        service: LLMサービス
+        llm_response: ツール呼び出しを含む最初のレスポンス（結果で更新される）
+        tools: 利用可能な関数定義
+        repository_context: リポジトリコンテキスト
+        original_prompt: ユーザーのプロンプト
+        conversation_history: 会話履歴
+        system_prompt: システムプロンプト
+        options: プロバイダーオプション
+        max_rounds: ツール実行の最大ラウンド数（省略時は設定値）
+        token_budget: 全ラウンドの合計トークン予算（省略時は設定値、0で無制限）
+        time_budget: 全ラウンドの合計時間予算（秒、省略時は設定値、0で無制限）
+    """
+    if max_rounds is None:
+        max_rounds = settings.llm_tool_max_rounds
+    if token_budget is None:
+        token_budget = settings.llm_tool_token_budget
+    if time_budget is None:
+        time_budget = settings.llm_tool_time_budget
+
     logger.info(f"Tool calls detected: {len(llm_response.tool_calls)}, executing tools and generating followup response")
-    
-    # 全ツール呼び出しを実行
+    started = time.monotonic()
+
+    messages = list(conversation_history or [])
+    messages.append(MessageItem(role=MessageRole.USER, content=original_prompt))
+    executed_calls = []
     executed_results = []
-    for tool_call in llm_response.tool_calls:
+    current = llm_response
+    rounds = 0
+
+    while current.tool_calls:
+        rounds += 1
+
+        # このラウンドのツール呼び出しを並列実行（結果は呼び出し順）
+        results = await execute_tool_calls(
+            service, current.tool_calls, tools, repository_context
+        )
+        executed_calls.extend(current.tool_calls)
+        executed_results.extend(results)
+
+        # 実際のツール結果をモデルに返す
+        messages.append(MessageItem(
+            role=MessageRole.ASSISTANT,
+            content=current.content or "",
+            tool_calls=current.tool_calls,
+        ))
+        messages.extend(build_tool_result_messages(results))
+
+        # 予算を使い切った場合はツールなしで最終回答を求める
+        final_round = tool_budget_exhausted(
+            rounds,
+            llm_response.usage.total_tokens if llm_response.usage else 0,
+            time.monotonic() - started,
+            max_rounds,
+            token_budget,
+            time_budget,
+        )
+
         try:
-            # リポジトリコンテキストを辞書に変換
-            repo_context_dict = convert_repository_context_to_dict(repository_context)
-            
-            # 利用可能な関数のマッピング取得
-            available_functions = {func.name: func for func in tools}
-            
-            # ツール呼び出し実行
-            result = await service.execute_function_call(
-                tool_call.function,
-                available_functions,
-                repository_context=repo_context_dict,
+            provider_options = await service._prepare_provider_options(
+                prompt="",  # プロンプトは会話メッセージに含めている
+                conversation_history=messages,
+                options=(options or {}).copy(),
+                system_prompt=system_prompt,
+                tools=tools,
+                tool_choice=ToolChoice(type="none") if final_round else None,
+            )
+            raw_response = await service._call_provider_api(provider_options)
+            next_response = await service._convert_provider_response(
+                raw_response, provider_options
             )
-            
-            executed_results.append({
-                "tool_call_id": tool_call.id,
-                "function_name": tool_call.function.name,
-                "result": result,
-            })
-            
-            logger.info(f"Tool '{tool_call.function.name}' executed successfully")
-            
         except Exception as e:
-            executed_results.append({
-                "tool_call_id": tool_call.id,  
-                "function_name": tool_call.function.name,
-                "error": str(e),
-            })
-            logger.error(f"Tool '{tool_call.function.name}' execution failed: {e}")
+            logger.error(f"Error generating followup response: {str(e)}")
+            next_response = None
+
+        if next_response is None:
+            logger.warning("Followup response generation failed or returned empty content")
+            break
+
+        # 使用量統計を更新
+        if next_response.usage and llm_response.usage:
+            llm_response.usage.prompt_tokens += next_response.usage.prompt_tokens
+            llm_response.usage.completion_tokens += next_response.usage.completion_tokens
+            llm_response.usage.total_tokens += next_response.usage.total_tokens
+
+        current = next_response
+        if final_round:
+            break
 
     # 実行結果をレスポンスに追加
+    llm_response.tool_calls = executed_calls
     llm_response.tool_execution_results = executed_results
-    
-    # ツール実行結果に基づくフォローアップレスポンス生成
-    followup_response = await generate_followup_response(
-        service=service,
-        original_prompt=original_prompt,
-        tool_calls=llm_response.tool_calls,
-        tool_results=executed_results,
-        conversation_history=conversation_history,
-        system_prompt=system_prompt,
-        options=options or {},
+
+    # 最終ラウンドの回答でメインレスポンス内容を更新
+    if current is not llm_response and current.content:
+        llm_response.content = current.content
+        logger.info(
+            f"Followup response generated after {rounds} tool rounds: "
+            f"{len(llm_response.content)} characters"
+        )
+
+
+async def stream_tool_loop(
+    service: "LLMServiceBase",
+    tools: List[FunctionDefinition],
+    repository_context: Optional["RepositoryContext"],
+    prompt: str,
+    conversation_history: Optional[List[MessageItem]],
+    system_prompt: Optional[str],
+    options: Optional[Dict[str, Any]],
+    tool_choice: Optional[ToolChoice] = None,
+    max_rounds: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    ツール付きクエリをストリーミングで実行
+
+    ``handle_tool_execution_and_followup`` と同じ複数ラウンドのループを、
+    コンテンツとツール呼び出しのデルタを逐次返しながら実行する。
+    ツール実行中は進捗イベントを返し、最後にフォローアップを
+    ストリーミングする。
+
+    Args:
+        service: LLMサービス
+        tools: 利用可能な関数定義
+        repository_context: リポジトリコンテキスト
+        prompt: ユーザーのプロンプト
+        conversation_history: 会話履歴
+        system_prompt: システムプロンプト
+        options: プロバイダーオプション
+        tool_choice: 最初のラウンドのツール選択戦略
+        max_rounds: ツール実行の最大ラウンド数（省略時は設定値）
+        token_budget: 全ラウンドの合計トークン予算（省略時は設定値、0で無制限）
+        time_budget: 全ラウンドの合計時間予算（秒、省略時は設定値、0で無制限）
+
+    Yields:
+        Dict[str, Any]: ``{"content", "done"}`` のコンテンツチャンク、
+        ``{"type": "tool_call_delta", ...}`` のツール呼び出しの断片、
+        ``{"type": "tool_execution", "status", ...}`` のツール実行の進捗
+    """
+    if max_rounds is None:
+        max_rounds = settings.llm_tool_max_rounds
+    if token_budget is None:
+        token_budget = settings.llm_tool_token_budget
+    if time_budget is None:
+        time_budget = settings.llm_tool_time_budget
+
+    started = time.monotonic()
+    messages = list(conversation_history or [])
+    messages.append(MessageItem(role=MessageRole.USER, content=prompt))
+    used_tokens = 0
+    rounds = 0
+    final_round = False
+
+    while True:
+        # 最初のラウンドはプロンプトを、以降は会話メッセージ全体を送る
+        provider_options = await service._prepare_provider_options(
+            prompt=prompt if rounds == 0 else "",
+            conversation_history=conversation_history if rounds == 0 else messages,
+            options=(options or {}).copy(),
+            system_prompt=system_prompt,
+            tools=tools,
+            tool_choice=(
+                ToolChoice(type="none") if final_round
+                else tool_choice if rounds == 0 else None
+            ),
+        )
+
+        content_parts = []
+        tool_calls = []
+        provider_events = service._stream_provider_api_with_tools(provider_options)
+        try:
+            async for event in provider_events:
+                if event.get("content"):
+                    content_parts.append(event["content"])
+                    yield {"content": event["content"], "done": False}
+                elif "tool_call_delta" in event:
+                    yield {"type": "tool_call_delta", "round": rounds + 1, **event["tool_call_delta"], "done": False}
+                elif "usage" in event:
+                    used_tokens += event["usage"].total_tokens
+                elif "tool_calls" in event:
+                    tool_calls = event["tool_calls"]
+        finally:
+            # 中断時もプロバイダーのストリームを確実に閉じる
+            await provider_events.aclose()
+
+        if not tool_calls or final_round:
+            break
+        rounds += 1
+
+        # ツールを並列実行し、完了したものから進捗を返す
+        for tool_call in tool_calls:
+            yield {
+                "type": "tool_execution",
+                "status": "started",
+                "round": rounds,
+                "tool_call_id": tool_call.id,
+                "function_name": tool_call.function.name,
+                "done": False,
+            }
+
+        completed: asyncio.Queue = asyncio.Queue()
+        execution = asyncio.ensure_future(execute_tool_calls(
+            service, tool_calls, tools, repository_context,
+            on_result=lambda index, result: completed.put_nowait(result),
+        ))
+        getter = None
+        try:
+            for _ in tool_calls:
+                # 実行タスクが途中で失敗した場合に待ち続けないよう、両方を待つ
+                getter = asyncio.ensure_future(completed.get())
+                await asyncio.wait({getter, execution}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    # 全件の通知前に実行タスクが終了した（例外があればここで送出）
+                    execution.result()
+                    break
+                result = getter.result()
+                yield {
+                    "type": "tool_execution",
+                    "status": "failed" if "error" in result else "completed",
+                    "round": rounds,
+                    "tool_call_id": result["tool_call_id"],
+                    "function_name": result["function_name"],
+                    "done": False,
+                }
+            results = await execution
+        finally:
+            # 呼び出し元が中断した場合は実行中のツールもキャンセル
+            if getter is not None and not getter.done():
+                getter.cancel()
+            if not execution.done():
+                execution.cancel()
+
+        messages.append(MessageItem(
+            role=MessageRole.ASSISTANT,
+            content="".join(content_parts),
+            tool_calls=tool_calls,
+        ))
+        messages.extend(build_tool_result_messages(results))
+
+        final_round = tool_budget_exhausted(
+            rounds, used_tokens, time.monotonic() - started,
+            max_rounds, token_budget, time_budget,
+        )
+
+
+def tool_budget_exhausted(
+    rounds: int,
+    used_tokens: int,
+    elapsed: float,
+    max_rounds: int,
+    token_budget: int,
+    time_budget: float,
+) -> bool:
+    """ツールループの予算（ラウンド数・トークン・時間）を使い切ったか判定"""
+    exhausted = (
+        rounds >= max_rounds
+        or (token_budget > 0 and used_tokens >= token_budget)
+        or (time_budget > 0 and elapsed >= time_budget)
     )
-    
-    # フォローアップでメインレスポンス内容を更新
-    if followup_response and followup_response.content:
-        llm_response.content = followup_response.content
-        
-        # 使用量統計を更新
-        if followup_response.usage and llm_response.usage:
-            llm_response.usage.prompt_tokens += followup_response.usage.prompt_tokens
-            llm_response.usage.completion_tokens += followup_response.usage.completion_tokens
-            llm_response.usage.total_tokens += followup_response.usage.total_tokens
-        
-        # 会話履歴の最適化情報も転送（重要：これが抜けていた）
-        if hasattr(followup_response, 'optimized_conversation_history'):
-            llm_response.optimized_conversation_history = followup_response.optimized_conversation_history
-        if hasattr(followup_response, 'history_optimization_info'):
-            llm_response.history_optimization_info = followup_response.history_optimization_info
-        
-        content_len = len(llm_response.content) if llm_response.content is not None else 0
-        logger.info(f"Followup response generated: {content_len} characters")
-        
-        # 会話履歴の転送状況をログ出力（安全にチェック）
-        history = getattr(llm_response, 'optimized_conversation_history', None)
-        history_count = len(history) if history is not None else 0
-        logger.info(f"Conversation history transferred: {history_count} messages")
-    else:
-        logger.warning("Followup response generation failed or returned empty content")
+    if exhausted:
+        logger.info(
+            f"Tool loop budget reached after {rounds} rounds "
+            f"({used_tokens} tokens, {elapsed:.1f}s), requesting final answer"
+        )
+    return exhausted
+
+
+def build_tool_result_messages(tool_results: List[Dict[str, Any]]) -> List[MessageItem]:
+    """ツール実行結果を ``tool`` ロールのメッセージに変換"""
+    messages = []
+    for result in tool_results:
+        if "error" in result:
+            payload = {"success": False, "error": result["error"]}
+        else:
+            payload = result.get("result")
+        messages.append(MessageItem(
+            role=MessageRole.TOOL,
+            content=json.dumps(payload, ensure_ascii=False, default=str),
+            tool_call_id=result["tool_call_id"],
+        ))
+    return messages
+
+
+async def execute_tool_calls(
+    service: "LLMServiceBase",
+    tool_calls: List,
+    tools: List[FunctionDefinition],
+    repository_context: Optional["RepositoryContext"],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    ツール呼び出しを並列実行
+
+    独立したツール呼び出しを同時に実行し、全体の待ち時間を最も遅いツールの
+    実行時間に抑える。失敗・タイムアウトしたツールはエラー結果として記録し、
+    他のツールの実行は継続する。呼び出し元がキャンセルされた場合は
+    実行中のツールもキャンセルされる。
+
+    Args:
+        service: LLMサービス
+        tool_calls: 実行するツール呼び出し
+        tools: 利用可能な関数定義
+        repository_context: リポジトリコンテキスト
+        max_concurrency: 同時実行数の上限（省略時はMCP設定の max_tools_per_request）
+        timeout: ツールごとのタイムアウト秒数（省略時はMCP設定の tool_timeout）
+        on_result: ツールごとの完了通知（呼び出しのインデックスと結果を受け取る）
+
+    Returns:
+        List[Dict[str, Any]]: ツール呼び出しと同じ順序の実行結果
+    """
+    if max_concurrency is None or timeout is None:
+        from doc_ai_helper_backend.services.mcp.config import default_mcp_config
+
+        if max_concurrency is None:
+            max_concurrency = default_mcp_config.max_tools_per_request
+        if timeout is None:
+            timeout = default_mcp_config.tool_timeout
+
+    # 全ツール呼び出しで共通の値はループ外で一度だけ構築
+    repo_context_dict = convert_repository_context_to_dict(repository_context)
+    available_functions = {func.name: func for func in tools}
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def execute(index: int, tool_call) -> Dict[str, Any]:
+        result = await execute_one(tool_call)
+        if on_result is not None:
+            on_result(index, result)
+        return result
+
+    async def execute_one(tool_call) -> Dict[str, Any]:
+        function_name = tool_call.function.name
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    service.execute_function_call(
+                        tool_call.function,
+                        available_functions,
+                        repository_context=repo_context_dict,
+                    ),
+                    timeout=timeout if timeout and timeout > 0 else None,
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Tool '{function_name}' timed out after {timeout}s")
+                return {
+                    "tool_call_id": tool_call.id,
+                    "function_name": function_name,
+                    "error": f"Tool execution timed out after {timeout} seconds",
+                }
+            except Exception as e:
+                logger.error(f"Tool '{function_name}' execution failed: {e}")
+                return {
+                    "tool_call_id": tool_call.id,
+                    "function_name": function_name,
+                    "error": str(e),
+                }
+
+        logger.info(f"Tool '{function_name}' executed successfully")
+        return {
+            "tool_call_id": tool_call.id,
+            "function_name": function_name,
+            "result": result,
+        }
+
+    return list(await asyncio.gather(
+        *(execute(index, tool_call) for index, tool_call in enumerate(tool_calls))
+    ))
 
 
 def convert_repository_context_to_dict(
@@ -47,6 +47,10 @@ class MCPConfig(BaseModel):
         default=10, description="Maximum number of tools that can be called per request"
     )
 
+    tool_timeout: float = Field(
+        default=30.0, description="Timeout in seconds for a single tool call"
+    )
+
 
 def create_mcp_config_from_env() -> MCPConfig:
     """
@@ -67,6 +71,7 @@ def create_mcp_config_from_env() -> MCPConfig:
         enable_analysis_tools=os.getenv("MCP_ENABLE_ANALYSIS_TOOLS", "true").lower() == "true",
         max_content_length=int(os.getenv("MCP_MAX_CONTENT_LENGTH", "1048576")),  # 1MB
         max_tools_per_request=int(os.getenv("MCP_MAX_TOOLS_PER_REQUEST", "10")),
+        tool_timeout=float(os.getenv("MCP_TOOL_TIMEOUT", "30")),
     )
 
 
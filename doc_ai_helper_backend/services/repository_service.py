@@ -8,12 +8,13 @@ delegation pattern support for RepositoryContext creation.
 import logging
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from ..core.exceptions import RepositoryServiceException
 from ..db.models import Repository as RepositoryModel
+from ..db.models import RepositorySyncState as RepositorySyncStateModel
 from ..models.repository import (
     GitServiceType,
     RepositoryCreate,
@@ -223,6 +224,11 @@ class RepositoryService:
                 logger.warning(f"Repository not found for deletion: ID {repository_id}")
                 return False
 
+            await self.db.execute(
+                delete(RepositorySyncStateModel).where(
+                    RepositorySyncStateModel.repository_id == repository_id
+                )
+            )
             await self.db.delete(db_repo)
             await self.db.commit()
 
@@ -270,6 +276,77 @@ class RepositoryService:
             logger.error(error_msg)
             raise RepositoryServiceException(error_msg) from e
 
+    async def get_last_synced_commit(
+        self, repository_id: int, branch: str
+    ) -> Optional[str]:
+        """
+        Get the last synced commit of a repository branch.
+        
+        Args:
+            repository_id: Repository ID
+            branch: Branch or tag name
+            
+        Returns:
+            Commit SHA or None if the branch was never synced
+        """
+        try:
+            result = await self.db.execute(
+                select(RepositorySyncStateModel).where(
+                    RepositorySyncStateModel.repository_id == repository_id,
+                    RepositorySyncStateModel.branch == branch,
+                )
+            )
+            state = result.scalar_one_or_none()
+            return state.last_commit_sha if state else None
+
+        except Exception as e:
+            error_msg = f"Failed to get sync state of repository {repository_id}: {str(e)}"
+            logger.error(error_msg)
+            raise RepositoryServiceException(error_msg) from e
+
+    async def record_sync(
+        self, repository_id: int, branch: str, commit_sha: str
+    ) -> None:
+        """
+        Record the last synced commit of a repository branch.
+        
+        Args:
+            repository_id: Repository ID
+            branch: Branch or tag name
+            commit_sha: Synced commit SHA
+            
+        Raises:
+            RepositoryServiceException: If recording fails
+        """
+        try:
+            result = await self.db.execute(
+                select(RepositorySyncStateModel).where(
+                    RepositorySyncStateModel.repository_id == repository_id,
+                    RepositorySyncStateModel.branch == branch,
+                )
+            )
+            state = result.scalar_one_or_none()
+
+            if state:
+                state.last_commit_sha = commit_sha
+            else:
+                self.db.add(
+                    RepositorySyncStateModel(
+                        repository_id=repository_id,
+                        branch=branch,
+                        last_commit_sha=commit_sha,
+                    )
+                )
+            await self.db.commit()
+
+            logger.info(f"Recorded sync of repository {repository_id}@{branch}: {commit_sha}")
+
+        except Exception as e:
+            await self.db.rollback()
+            error_msg = f"Failed to record sync of repository {repository_id}: {str(e)}"
+            logger.error(error_msg)
+            raise RepositoryServiceException(error_msg) from e
+
     def _to_response(self, db_repo: RepositoryModel) -> RepositoryResponse:
         """
         Convert SQLAlchemy model to Pydantic response model.
@@ -22,6 +22,7 @@ os.environ["SECRET_KEY"] = "test-secret-key"
 # Import main app
 from doc_ai_helper_backend.main import app
 from doc_ai_helper_backend.api.dependencies import get_llm_service
+from doc_ai_helper_backend.services.llm.factory import LLMServiceFactory
 from doc_ai_helper_backend.services.llm.providers.mock_service import MockLLMService
 
 
@@ -30,6 +31,13 @@ def get_test_llm_service():
     return MockLLMService(response_delay=0.0)
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_llm_services():
+    """テスト間で共有LLMサービスインスタンスを持ち越さない"""
+    yield
+    LLMServiceFactory.clear_shared()
+
+
 # Create test client fixture
 @pytest.fixture
 def client():
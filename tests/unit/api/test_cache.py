@@ -0,0 +1,90 @@
+"""
+Test cache administration endpoints.
+"""
+
+import pytest
+
+from doc_ai_helper_backend.api.dependencies import get_document_cache
+from doc_ai_helper_backend.core.config import settings
+from doc_ai_helper_backend.main import app
+from doc_ai_helper_backend.services.cache import TieredCache
+
+
+@pytest.fixture
+def cache(client, monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache_admin", True)
+    cache = TieredCache()
+    app.dependency_overrides[get_document_cache] = lambda: cache
+    return cache
+
+
+def test_cache_admin_disabled(client):
+    """Test that the endpoints are hidden behind the feature flag."""
+    response = client.get(f"{settings.api_prefix}/cache/stats")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_cache_stats(client, cache):
+    """Test per-namespace cache statistics."""
+    await cache.set("document:mock:octocat:Hello-World:README.md:main", "doc")
+    await cache.get("document:mock:octocat:Hello-World:README.md:main")
+    await cache.get("document:mock:octocat:Hello-World:missing.md:main")
+
+    response = client.get(f"{settings.api_prefix}/cache/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_entries"] == 1
+    document = data["namespaces"]["document"]
+    assert document["hot_entries"] == 1
+    assert document["hits"] == 1
+    assert document["misses"] == 1
+    assert document["hit_rate"] == 0.5
+    assert document["oldest_entry_age"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_purge_by_repository_and_ref(client, cache):
+    """Test purging the entries of a repository ref."""
+    await cache.set("document:mock:octocat:Hello-World:README.md:main", "a")
+    await cache.set("document:mock:octocat:Hello-World:README.md:main|raw", "b")
+    await cache.set("structure:mock:octocat:Hello-World:main:", "c")
+    await cache.set("document:mock:octocat:Hello-World:README.md:dev", "d")
+    await cache.set("document:mock:octocat:Other:README.md:main", "e")
+    await cache.set("llm:0123abcd", "f")
+
+    response = client.delete(
+        f"{settings.api_prefix}/cache/entries",
+        params={"owner": "octocat", "repo": "Hello-World", "ref": "main"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 3
+    assert sorted(cache.keys()) == [
+        "document:mock:octocat:Hello-World:README.md:dev",
+        "document:mock:octocat:Other:README.md:main",
+        "llm:0123abcd",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_purge_by_prefix(client, cache):
+    """Test purging entries by key prefix."""
+    await cache.set("llm:0123abcd", "a")
+    await cache.set("structure:mock:octocat:Hello-World:main:", "b")
+
+    response = client.delete(
+        f"{settings.api_prefix}/cache/entries", params={"prefix": "llm:"}
+    )
+
+    assert response.json()["deleted"] == 1
+    assert cache.keys() == ["structure:mock:octocat:Hello-World:main:"]
+
+
+def test_purge_requires_a_filter(client, cache):
+    """Test that an unfiltered purge is rejected."""
+    response = client.delete(f"{settings.api_prefix}/cache/entries")
+
+    assert response.status_code == 400
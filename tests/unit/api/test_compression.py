@@ -0,0 +1,113 @@
+"""
+Test response compression middleware.
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from doc_ai_helper_backend.api.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+from doc_ai_helper_backend.services.cache import TieredCache
+
+BODY = "# Title\n\n" + "Lorem ipsum dolor sit amet. " * 200
+
+
+@pytest.fixture
+def cache():
+    return TieredCache()
+
+
+@pytest.fixture
+def client(cache):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, cache=cache)
+
+    @app.get("/document")
+    async def document():
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/events")
+    async def events():
+        async def generate():
+            for _ in range(3):
+                yield "data: " + "x" * 1000 + "\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    """Test content coding negotiation."""
+    supported = ["br", "zstd", "gzip"]
+
+    assert negotiate_encoding("gzip, deflate, br", supported) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert negotiate_encoding("br;q=0, *", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding(None, supported) is None
+
+
+def test_compresses_document(client):
+    """Test that large text responses are gzip-compressed."""
+    response = client.get("/document", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert response.text == BODY
+
+
+@pytest.mark.asyncio
+async def test_caches_compressed_body(client, cache):
+    """Test that compressed bodies are reused by entity tag."""
+    client.get("/document", headers={"Accept-Encoding": "gzip"})
+
+    cached = await cache.get('http:gzip:"abc"')
+    assert gzip.decompress(cached).decode() == BODY
+
+    # A cached body is served without recompressing
+    await cache.set('http:gzip:"abc"', gzip.compress(b"cached"))
+    response = client.get("/document", headers={"Accept-Encoding": "gzip"})
+    assert response.text == "cached"
+
+
+@pytest.mark.parametrize(
+    "path,headers",
+    [
+        ("/document", {"Accept-Encoding": "identity"}),
+        ("/small", {"Accept-Encoding": "gzip"}),
+        ("/image", {"Accept-Encoding": "gzip"}),
+    ],
+)
+def test_skips_compression(client, path, headers):
+    """Test that unaccepted, small and binary responses are not compressed."""
+    response = client.get(path, headers=headers)
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+def test_event_stream_passes_through(client):
+    """Test that SSE responses stream uncompressed."""
+    with client.stream("GET", "/events", headers={"Accept-Encoding": "gzip"}) as response:
+        chunks = list(response.iter_raw())
+
+    assert "Content-Encoding" not in response.headers
+    assert len(chunks) >= 1
+    assert b"".join(chunks).count(b"data: ") == 3
@@ -322,3 +322,153 @@ def test_get_document_without_frontmatter(client):
     # フロントマターがない場合、空の辞書または基本的な値のみを持つことを確認
     assert "metadata" in data
     assert data["metadata"]["extra"]["frontmatter"] == {}
+
+
+def test_get_backlinks(client):
+    """Test backlinks endpoint."""
+    response = client.get(
+        f"{settings.api_prefix}/documents/links/mock/octocat/Hello-World/backlinks/docs/index.md"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["path"] == "docs/index.md"
+    assert isinstance(data["backlinks"], list)
+
+
+def test_get_broken_links(client):
+    """Test broken links endpoint."""
+    # Process a document so the link graph is populated
+    client.get(
+        f"{settings.api_prefix}/documents/contents/mock/octocat/Hello-World/README.md"
+    )
+
+    response = client.get(
+        f"{settings.api_prefix}/documents/links/mock/octocat/Hello-World/broken"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["broken_links"] == []
+    assert data["indexed_documents"] >= 1
+
+
+def test_get_raw_document(client):
+    """Test raw document streaming endpoint."""
+    response = client.get(
+        f"{settings.api_prefix}/documents/raw/mock/octocat/Hello-World/README.md"
+    )
+
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"].startswith("text/markdown")
+    assert response.text.startswith("# Hello World")
+
+
+def test_get_raw_document_range(client):
+    """Test raw document streaming with Range requests."""
+    url = f"{settings.api_prefix}/documents/raw/mock/octocat/Hello-World/README.md"
+    full = client.get(url).content
+
+    response = client.get(url, headers={"Range": "bytes=2-6"})
+    assert response.status_code == 206
+    assert response.content == full[2:7]
+    assert response.headers["content-range"] == f"bytes 2-6/{len(full)}"
+
+    response = client.get(url, headers={"Range": "bytes=-3"})
+    assert response.status_code == 206
+    assert response.content == full[-3:]
+
+    response = client.get(url, headers={"Range": f"bytes={len(full)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(full)}"
+
+
+def test_get_asset_cached_and_conditional(client, tmp_path, monkeypatch):
+    """Test the asset proxy with the disk cache, If-None-Match and Range."""
+    from doc_ai_helper_backend.api.dependencies import get_asset_cache
+    from doc_ai_helper_backend.main import app
+    from doc_ai_helper_backend.services.cache import AssetCache
+
+    cache = AssetCache(str(tmp_path))
+    app.dependency_overrides[get_asset_cache] = lambda: cache
+    url = f"{settings.api_prefix}/documents/assets/mock/octocat/Hello-World/README.md"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.text.startswith("# Hello World")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("private")
+    assert len(cache) == 1
+
+    # Served from disk without contacting the Git service
+    monkeypatch.setattr(
+        documents.DocumentService,
+        "open_raw_stream",
+        lambda *args, **kwargs: pytest.fail("asset not served from cache"),
+    )
+    response = client.get(url, headers={"Range": "bytes=0-1"})
+    assert response.status_code == 206
+    assert response.content == b"# "
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_get_document_etag_and_not_modified(client):
+    """Test ETag revalidation of document responses."""
+    url = f"{settings.api_prefix}/documents/contents/mock/octocat/Hello-World/README.md"
+
+    response = client.get(url)
+    etag = response.headers["etag"]
+    assert "must-revalidate" in response.headers["cache-control"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # Differently transformed variants have their own tags
+    response = client.get(
+        url, params={"transform_links": False}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_get_repository_structure_etag_and_not_modified(client):
+    """Test ETag revalidation of structure responses."""
+    url = f"{settings.api_prefix}/documents/structure/mock/octocat/Hello-World"
+
+    etag = client.get(url).headers["etag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_get_document_with_field_selection(client):
+    """Test returning only selected document fields."""
+    url = f"{settings.api_prefix}/documents/contents/mock/octocat/Hello-World/README.md"
+
+    response = client.get(url, params={"fields": "content"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["content"]["content"].startswith("# Hello World")
+    assert data["path"] == "README.md"
+    assert "transformed_content" not in data
+    assert "links" not in data
+    assert "metadata" not in data
+    assert response.headers["etag"] != client.get(url).headers["etag"]
+
+
+def test_get_document_with_unknown_field(client):
+    """Test that unknown fields are rejected."""
+    response = client.get(
+        f"{settings.api_prefix}/documents/contents/mock/octocat/Hello-World/README.md",
+        params={"fields": "content,secrets"},
+    )
+
+    assert response.status_code == 400
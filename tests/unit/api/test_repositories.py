@@ -3,7 +3,7 @@ Unit tests for Repository API endpoints.
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 from fastapi import status
 from datetime import datetime
@@ -17,7 +17,12 @@ from doc_ai_helper_backend.models.repository import (
 )
 from doc_ai_helper_backend.models.repository_context import RepositoryContext, GitService
 from doc_ai_helper_backend.core.exceptions import RepositoryServiceException
-from doc_ai_helper_backend.api.dependencies import get_repository_service
+from doc_ai_helper_backend.api.dependencies import (
+    get_repository_service,
+    get_repository_sync_engine,
+    get_repository_warmer,
+)
+from doc_ai_helper_backend.models.document import RepositorySyncResult
 
 
 class TestRepositoryAPI:
@@ -121,6 +126,34 @@ class TestRepositoryAPI:
             finally:
                 app.dependency_overrides.clear()
 
+    @pytest.mark.asyncio
+    async def test_create_repository_schedules_warmup(self, client, sample_repository_response):
+        """Test repository creation schedules a background warm-up."""
+        with patch("doc_ai_helper_backend.core.config.settings.enable_repository_management", True):
+            mock_service = AsyncMock()
+            mock_service.create_repository.return_value = sample_repository_response
+            mock_warmer = MagicMock()
+
+            app.dependency_overrides[get_repository_service] = lambda: mock_service
+            app.dependency_overrides[get_repository_warmer] = lambda: mock_warmer
+
+            try:
+                repository_data = {
+                    "name": "test-repo",
+                    "owner": "test-owner",
+                    "service_type": "github",
+                    "url": "https://github.com/test-owner/test-repo",
+                }
+
+                response = client.post("/api/v1/repositories/", json=repository_data)
+
+                assert response.status_code == status.HTTP_201_CREATED
+                mock_warmer.schedule.assert_called_once_with(
+                    "github", "test-owner", "test-repo", "main", "docs"
+                )
+            finally:
+                app.dependency_overrides.clear()
+
     @pytest.mark.asyncio
     async def test_create_repository_validation_error(self, client):
         """Test repository creation with validation error."""
@@ -268,4 +301,41 @@ class TestRepositoryAPI:
                 
                 assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
             finally:
-                app.dependency_overrides.clear()
\ No newline at end of file
+                app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_sync_repository_records_head(self, client, sample_repository_response):
+        """Test repository sync records the synced head commit."""
+        with patch("doc_ai_helper_backend.core.config.settings.enable_repository_management", True):
+            mock_service = AsyncMock()
+            mock_service.get_repository.return_value = sample_repository_response
+            mock_service.get_last_synced_commit.return_value = "base"
+            mock_engine = MagicMock()
+            mock_engine.sync = AsyncMock(
+                return_value=RepositorySyncResult(
+                    service="github",
+                    owner="test-owner",
+                    repo="test-repo",
+                    ref="main",
+                    previous_commit="base",
+                    current_commit="head",
+                    mode="incremental",
+                    refreshed=["docs/index.md"],
+                )
+            )
+
+            app.dependency_overrides[get_repository_service] = lambda: mock_service
+            app.dependency_overrides[get_repository_sync_engine] = lambda: mock_engine
+
+            try:
+                response = client.post("/api/v1/repositories/1/sync")
+
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["refreshed"] == ["docs/index.md"]
+                mock_engine.sync.assert_awaited_once_with(
+                    "github", "test-owner", "test-repo", "main",
+                    root_path="docs", last_commit="base",
+                )
+                mock_service.record_sync.assert_awaited_once_with(1, "main", "head")
+            finally:
+                app.dependency_overrides.clear()
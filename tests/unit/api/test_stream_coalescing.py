@@ -0,0 +1,112 @@
+"""
+Test coalescing of streamed LLM events.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from doc_ai_helper_backend.api.stream_coalescing import (
+    DONE_EVENT,
+    coalesce_stream_events,
+    serialize_event,
+)
+
+
+async def _events(*events, delay=0.0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+def _content(text):
+    return {"content": text, "done": False}
+
+
+def test_serialize_event_fast_paths():
+    """Test that fast-path serialization matches json.dumps."""
+    for event in (_content('he said "hi"\n'), {"content": "", "done": True}):
+        assert serialize_event(event) == json.dumps(event)
+    assert serialize_event({"content": "", "done": True}) == DONE_EVENT
+
+
+@pytest.mark.asyncio
+async def test_merges_content_until_size_threshold():
+    """Test that content fragments are merged into fewer events."""
+    source = _events(*[_content("ab") for _ in range(5)], {"content": "", "done": True})
+
+    payloads = [
+        json.loads(data)
+        async for data in coalesce_stream_events(source, max_chars=4, max_delay=10)
+    ]
+
+    assert payloads == [
+        _content("abab"),
+        _content("abab"),
+        _content("ab"),
+        {"content": "", "done": True},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_content_after_delay():
+    """Test that pending content is sent once the time window passes."""
+    source = _events(_content("a"), _content("b"), delay=0.05)
+
+    payloads = [
+        json.loads(data)
+        async for data in coalesce_stream_events(source, max_chars=1000, max_delay=0.01)
+    ]
+
+    assert payloads == [_content("a"), _content("b")]
+
+
+@pytest.mark.asyncio
+async def test_other_events_keep_their_order():
+    """Test that non-content events flush pending content first."""
+    progress = {"type": "tool_execution", "status": "started", "done": False}
+    source = _events(_content("a"), progress, _content("b"))
+
+    payloads = [
+        json.loads(data)
+        async for data in coalesce_stream_events(source, max_chars=1000, max_delay=10)
+    ]
+
+    assert payloads == [_content("a"), progress, _content("b")]
+
+
+@pytest.mark.asyncio
+async def test_source_error_is_raised_after_pending_content():
+    """Test that source errors reach the consumer."""
+    async def failing():
+        yield _content("partial")
+        raise RuntimeError("provider failed")
+
+    received = []
+    with pytest.raises(RuntimeError, match="provider failed"):
+        async for data in coalesce_stream_events(failing(), max_chars=1000, max_delay=10):
+            received.append(json.loads(data))
+
+    assert received == [_content("partial")]
+
+
+@pytest.mark.asyncio
+async def test_bounded_buffer_applies_backpressure():
+    """Test that the source is not read far ahead of a slow consumer."""
+    produced = 0
+
+    async def source():
+        nonlocal produced
+        for _ in range(100):
+            produced += 1
+            yield {"type": "progress", "done": False}
+
+    stream = coalesce_stream_events(source(), buffer_size=2)
+    await stream.__anext__()
+    await asyncio.sleep(0.01)
+
+    # One event consumed, at most the buffer plus one in flight read ahead
+    assert produced <= 4
+    await stream.aclose()
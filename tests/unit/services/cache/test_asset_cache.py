@@ -0,0 +1,63 @@
+"""
+Tests for the asset disk cache.
+"""
+
+import os
+
+import pytest
+
+from doc_ai_helper_backend.services.cache import AssetCache
+from doc_ai_helper_backend.services.cache.asset_cache import AssetTooLargeError
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_put_and_get(tmp_path):
+    cache = AssetCache(str(tmp_path))
+
+    path = await cache.put("mock", "octocat", "repo", "sha1", _chunks(b"abc", b"def"))
+
+    assert cache.get("mock", "octocat", "repo", "sha1") == path
+    assert open(path, "rb").read() == b"abcdef"
+    assert cache.get("mock", "octocat", "repo", "sha2") is None
+    assert cache.total_bytes == 6
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_size(tmp_path):
+    cache = AssetCache(str(tmp_path), max_bytes=10)
+    await cache.put("mock", "o", "r", "a", _chunks(b"x" * 4))
+    await cache.put("mock", "o", "r", "b", _chunks(b"x" * 4))
+    cache.get("mock", "o", "r", "a")
+    await cache.put("mock", "o", "r", "c", _chunks(b"x" * 4))
+
+    assert cache.get("mock", "o", "r", "b") is None
+    assert cache.get("mock", "o", "r", "a") is not None
+    assert cache.get("mock", "o", "r", "c") is not None
+    assert cache.total_bytes == 8
+    assert len(os.listdir(tmp_path)) == 2
+
+
+@pytest.mark.asyncio
+async def test_oversized_asset_is_not_cached(tmp_path):
+    cache = AssetCache(str(tmp_path), max_entry_bytes=4)
+
+    with pytest.raises(AssetTooLargeError):
+        await cache.put("mock", "o", "r", "big", _chunks(b"xxx", b"xxx"))
+
+    assert cache.get("mock", "o", "r", "big") is None
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_existing_entries_are_adopted(tmp_path):
+    await AssetCache(str(tmp_path)).put("mock", "o", "r", "a", _chunks(b"data"))
+
+    cache = AssetCache(str(tmp_path))
+
+    assert cache.get("mock", "o", "r", "a") is not None
+    assert cache.total_bytes == 4
@@ -0,0 +1,56 @@
+"""
+Tests for the in-memory cache service.
+"""
+
+import pytest
+
+from doc_ai_helper_backend.services.cache import MemoryCache
+
+
+@pytest.mark.asyncio
+async def test_set_and_get():
+    cache = MemoryCache()
+    await cache.set("key", {"value": 1})
+
+    assert await cache.get("key") == {"value": 1}
+    assert await cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_dropped():
+    cache = MemoryCache(default_ttl=0)
+    await cache.set("key", "value")
+
+    assert await cache.get("key") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = MemoryCache(max_entries=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert "b" not in cache
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_delete_and_clear():
+    cache = MemoryCache()
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+
+    assert await cache.delete("a") is True
+    assert await cache.delete("a") is False
+
+    await cache.clear()
+    assert len(cache) == 0
+
+
+def test_empty_cache_is_truthy():
+    # Services check ``if self.cache_service:`` before caching
+    assert MemoryCache()
@@ -0,0 +1,77 @@
+"""
+Tests for application cache snapshots.
+"""
+
+import time
+
+import pytest
+
+from doc_ai_helper_backend.services.cache import TieredCache
+from doc_ai_helper_backend.services.cache.snapshot import (
+    load_snapshot,
+    restore_snapshot,
+    save_snapshot,
+)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "cache.snapshot")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(snapshot_path):
+    cache = TieredCache()
+    await cache.set("document:a", {"content": "a"})
+    await cache.set("llm:b", "response", ttl=None)
+
+    assert save_snapshot(cache, snapshot_path, "1.0") == 2
+
+    restored = TieredCache()
+    assert await restore_snapshot(restored, snapshot_path, "1.0") == 2
+    assert await restored.get("document:a") == {"content": "a"}
+    assert await restored.get("llm:b") == "response"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_from_other_version_is_ignored(snapshot_path):
+    cache = TieredCache()
+    await cache.set("document:a", "a")
+    save_snapshot(cache, snapshot_path, "1.0")
+
+    assert load_snapshot(snapshot_path, "2.0") == []
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_restored(snapshot_path, monkeypatch):
+    cache = TieredCache()
+    await cache.set("document:short", "a", ttl=10)
+    await cache.set("document:long", "b", ttl=1000)
+    save_snapshot(cache, snapshot_path, "1.0")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 100)
+
+    assert [key for key, _, _ in load_snapshot(snapshot_path, "1.0")] == ["document:long"]
+
+
+@pytest.mark.asyncio
+async def test_restore_does_not_overwrite_fresh_entries(snapshot_path):
+    cache = TieredCache()
+    await cache.set("document:a", "old")
+    save_snapshot(cache, snapshot_path, "1.0")
+
+    restarted = TieredCache()
+    await restarted.set("document:a", "new")
+
+    assert await restore_snapshot(restarted, snapshot_path, "1.0") == 0
+    assert await restarted.get("document:a") == "new"
+
+
+def test_missing_or_corrupt_snapshot_yields_nothing(snapshot_path):
+    assert load_snapshot(snapshot_path, "1.0") == []
+
+    with open(snapshot_path, "wb") as file:
+        file.write(b"garbage")
+
+    assert load_snapshot(snapshot_path, "1.0") == []
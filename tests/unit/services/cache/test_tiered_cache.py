@@ -0,0 +1,159 @@
+"""
+Tests for the two-tier application cache.
+"""
+
+import os
+
+import pytest
+
+from doc_ai_helper_backend.services.cache import TieredCache
+from doc_ai_helper_backend.services.cache.tiered_cache import (
+    compress,
+    decompress,
+    key_namespace,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TieredCache(max_entries=2, directory=str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_key_namespace():
+    assert key_namespace("document:mock:o:r:README.md:main") == "document"
+    assert key_namespace("plain") == "default"
+
+
+def test_compress_round_trip():
+    data = b"hello " * 100
+    record = compress(data)
+
+    assert len(record) < len(data)
+    assert decompress(record) == data
+
+
+@pytest.mark.asyncio
+async def test_hot_overflow_is_demoted_and_promoted_back(cache):
+    await cache.set("document:a", {"value": "a"})
+    await cache.set("document:b", {"value": "b"})
+    await cache.set("document:c", {"value": "c"})
+
+    assert cache.hot_count == 2
+    assert cache.warm_bytes("document") > 0
+    assert len(cache) == 3
+
+    # Promoted from the warm tier on hit, demoting the next LRU entry
+    assert await cache.get("document:a") == {"value": "a"}
+    assert cache.hot_count == 2
+    assert "document:b" in cache
+    assert await cache.get("document:b") == {"value": "b"}
+
+
+@pytest.mark.asyncio
+async def test_namespace_budget_evicts_warm_entries(tmp_path):
+    cache = TieredCache(
+        max_entries=1, directory=str(tmp_path), namespace_budgets={"llm": 0}
+    )
+    await cache.set("llm:a", "response")
+    await cache.set("llm:b", "response")
+
+    # A zero budget keeps the namespace memory-only
+    assert "llm:a" not in cache
+    assert cache.warm_bytes("llm") == 0
+
+    big = os.urandom(4096)
+    cache.namespace_budgets["structure"] = 6000
+    await cache.set("structure:a", big)
+    await cache.set("structure:b", big)
+    await cache.set("structure:c", big)
+
+    assert cache.warm_bytes("structure") <= 6000
+    assert "structure:a" not in cache
+    assert await cache.get("structure:b") == big
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_dropped(cache):
+    await cache.set("document:a", "a", ttl=0)
+    await cache.set("document:b", "b", ttl=0)
+    await cache.set("document:c", "c", ttl=0)
+
+    assert await cache.get("document:a") is None
+    assert await cache.get("document:c") is None
+
+
+@pytest.mark.asyncio
+async def test_delete_and_clear(cache):
+    for key in ("document:a", "document:b", "document:c"):
+        await cache.set(key, key)
+
+    assert await cache.delete("document:a") is True
+    assert await cache.delete("document:a") is False
+    assert await cache.get("document:a") is None
+
+    await cache.clear()
+    assert len(cache) == 0
+    assert cache  # an empty cache is still a configured cache
+
+
+@pytest.mark.asyncio
+async def test_close_removes_warm_file(tmp_path):
+    cache = TieredCache(max_entries=1, directory=str(tmp_path))
+    await cache.set("document:a", "a")
+    await cache.set("document:b", "b")
+    assert os.listdir(tmp_path)
+
+    cache.close()
+
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_stats_and_delete_where(tmp_path):
+    cache = TieredCache(
+        max_entries=1, directory=str(tmp_path), namespace_budgets={"llm": 0}
+    )
+    await cache.set("document:a", "a")
+    await cache.set("document:b", "b")
+    await cache.set("llm:x", "x")
+    await cache.get("document:a")
+    await cache.get("llm:missing")
+
+    stats = cache.stats()
+    assert stats["document"]["demotions"] == 2
+    assert stats["document"]["hits"] == 1
+    assert stats["document"]["warm_entries"] == 1
+    # Promoting "a" pushed "llm:x" out, and llm has no warm budget
+    assert stats["llm"]["evictions"] == 1
+    assert stats["llm"]["misses"] == 1
+    assert stats["llm"]["hot_entries"] == 0
+
+    assert cache.delete_where(lambda key: key.startswith("document:")) == 2
+    assert cache.keys() == []
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_restore_does_not_evict_live_entries(tmp_path):
+    cache = TieredCache(max_entries=3, directory=str(tmp_path))
+    await cache.set("document:live", "live")
+
+    restored = cache.restore(
+        [("document:old", "old", None), ("document:mid", "mid", None), ("document:new", "new", None)]
+    )
+
+    assert restored == 3
+    # The oldest restored entry went to the warm tier instead of evicting
+    # the live one; the others sit behind it in the hot tier
+    assert cache.hot_count == 3
+    assert cache.warm_bytes("document") > 0
+
+    # The next insertion demotes a restored entry, not the live one
+    await cache.set("document:next", "next")
+    warm = cache.warm_bytes("document")
+    assert await cache.get("document:live") == "live"
+    assert cache.warm_bytes("document") == warm
+    cache.close()
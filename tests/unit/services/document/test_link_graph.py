@@ -0,0 +1,122 @@
+"""
+Tests for the cross-document link graph.
+"""
+
+import pytest
+
+from doc_ai_helper_backend.models.link_info import LinkInfo
+from doc_ai_helper_backend.services.document.link_graph import (
+    LinkGraph,
+    LinkGraphRegistry,
+    resolve_link_target,
+)
+
+
+def _link(url: str, is_image: bool = False, is_external: bool = False) -> LinkInfo:
+    return LinkInfo(
+        text=url, url=url, is_image=is_image, position=(0, 0), is_external=is_external
+    )
+
+
+@pytest.fixture
+def graph():
+    graph = LinkGraph(("mock", "octocat", "Hello-World", "main"))
+    graph.update_document(
+        "docs/index.md",
+        "sha1",
+        [
+            _link("guide.md#intro"),
+            _link("../README.md"),
+            _link("missing.md"),
+            _link("images/logo.png", is_image=True),
+            _link("#anchor"),
+            _link("https://example.com", is_external=True),
+            _link("mailto:user@example.com"),
+        ],
+    )
+    graph.update_document("README.md", "sha2", [_link("docs/guide.md")])
+    return graph
+
+
+class TestResolveLinkTarget:
+    """Tests for link target resolution."""
+
+    def test_relative_and_absolute_paths(self):
+        assert resolve_link_target("b.md", "docs") == "docs/b.md"
+        assert resolve_link_target("../b.md", "docs/sub") == "docs/b.md"
+        assert resolve_link_target("/b.md", "docs") == "b.md"
+        assert resolve_link_target("b%20c.md?x=1#y", "") == "b c.md"
+
+    def test_non_path_links_are_ignored(self):
+        assert resolve_link_target("#anchor", "docs") is None
+        assert resolve_link_target("https://example.com/a.md", "docs") is None
+        assert resolve_link_target("mailto:a@example.com", "docs") is None
+
+
+class TestLinkGraph:
+    """Tests for LinkGraph."""
+
+    def test_backlinks(self, graph):
+        assert graph.backlinks("docs/guide.md") == ["README.md", "docs/index.md"]
+        assert graph.backlinks("README.md") == ["docs/index.md"]
+        assert graph.backlinks("unknown.md") == []
+
+    def test_update_with_same_sha_is_skipped(self, graph):
+        assert graph.update_document("README.md", "sha2", []) is False
+        assert graph.backlinks("docs/guide.md") == ["README.md", "docs/index.md"]
+
+    def test_update_with_new_sha_replaces_links(self, graph):
+        assert graph.update_document("README.md", "sha3", []) is True
+        assert graph.backlinks("docs/guide.md") == ["docs/index.md"]
+
+    def test_remove_document(self, graph):
+        assert graph.remove_document("docs/index.md") is True
+        assert graph.backlinks("README.md") == []
+        assert graph.document_count == 1
+
+    def test_broken_links_require_tree(self, graph):
+        assert graph.broken_links() == ([], 0)
+
+    def test_broken_links_against_tree(self, graph):
+        graph.set_tree(["README.md", "docs", "docs/index.md", "docs/guide.md"])
+
+        broken, checked = graph.broken_links()
+
+        assert checked == 4
+        assert [(link.source, link.target) for link in broken] == [
+            ("docs/index.md", "docs/missing.md")
+        ]
+
+    def test_unlisted_directories_are_not_reported(self, graph):
+        # Non-recursive listing: only root entries are known
+        graph.set_tree(["README.md", "docs"])
+
+        broken, checked = graph.broken_links()
+
+        assert broken == []
+        assert checked == 1
+
+    def test_path_exists(self, graph):
+        assert graph.path_exists("README.md") is None  # no tree yet
+
+        graph.set_tree(["README.md", "docs", "docs/index.md", "tools"])
+
+        assert graph.path_exists("docs/index.md") is True
+        assert graph.path_exists("docs/missing.md") is False
+        assert graph.path_exists("nowhere/deep/missing.md") is False
+        # Unlisted directory: cannot tell
+        assert graph.path_exists("tools/script.md") is None
+        assert graph.path_exists("docs/index.md", max_age=-1) is None
+
+
+class TestLinkGraphRegistry:
+    """Tests for LinkGraphRegistry."""
+
+    def test_get_or_create_and_eviction(self):
+        registry = LinkGraphRegistry(max_repositories=1)
+        first = registry.get_or_create("mock", "o", "a", "main")
+
+        assert registry.get_or_create("mock", "o", "a", "main") is first
+
+        registry.get_or_create("mock", "o", "b", "main")
+        assert registry.get("mock", "o", "a", "main") is None
@@ -0,0 +1,114 @@
+"""
+Tests for the linked document prefetcher.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from doc_ai_helper_backend.core.exceptions import RateLimitException
+from doc_ai_helper_backend.models.document import (
+    DocumentContent,
+    DocumentMetadata,
+    DocumentResponse,
+    DocumentType,
+)
+from doc_ai_helper_backend.models.link_info import LinkInfo
+from doc_ai_helper_backend.services.document.prefetch import LinkPrefetcher
+
+
+def _link(url: str, is_image: bool = False, is_external: bool = False) -> LinkInfo:
+    return LinkInfo(
+        text=url, url=url, is_image=is_image, position=(0, 0), is_external=is_external
+    )
+
+
+@pytest.fixture
+def document():
+    return DocumentResponse(
+        path="docs/index.md",
+        name="index.md",
+        type=DocumentType.MARKDOWN,
+        metadata=DocumentMetadata(
+            size=1,
+            last_modified=datetime.now(timezone.utc),
+            content_type="text/markdown",
+        ),
+        content=DocumentContent(content="# Index"),
+        repository="Hello-World",
+        owner="octocat",
+        service="mock",
+        ref="main",
+        links=[
+            _link("guide.md"),
+            _link("guide.md#section"),
+            _link("../README.md"),
+            _link("images/logo.png", is_image=True),
+            _link("https://example.com/page.md", is_external=True),
+            _link("data.csv"),
+            _link("#top"),
+            _link("index.md"),
+        ],
+    )
+
+
+@pytest.fixture
+def document_service():
+    service = MagicMock()
+    service.get_document = AsyncMock()
+    return service
+
+
+def test_candidate_paths(document, document_service):
+    prefetcher = LinkPrefetcher(document_service)
+
+    assert prefetcher.candidate_paths(document) == ["docs/guide.md", "README.md"]
+
+
+def test_candidate_paths_respects_limit(document, document_service):
+    prefetcher = LinkPrefetcher(document_service, max_links_per_document=1)
+
+    assert prefetcher.candidate_paths(document) == ["docs/guide.md"]
+
+
+@pytest.mark.asyncio
+async def test_schedule_fetches_links_in_background(document, document_service):
+    prefetcher = LinkPrefetcher(document_service, start_delay=0)
+
+    assert prefetcher.schedule(document) == 2
+    # Scheduling the same document again while in flight is a no-op
+    assert prefetcher.schedule(document) == 0
+
+    await asyncio.gather(*prefetcher._tasks)
+
+    fetched = sorted(call.args[3] for call in document_service.get_document.await_args_list)
+    assert fetched == ["README.md", "docs/guide.md"]
+    assert prefetcher.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_pauses_repository(document, document_service):
+    document_service.get_document.side_effect = RateLimitException()
+    prefetcher = LinkPrefetcher(
+        document_service, start_delay=0, max_concurrency_per_repo=1
+    )
+
+    prefetcher.schedule(document)
+    await asyncio.gather(*prefetcher._tasks)
+
+    assert prefetcher.is_cooling_down("mock", "octocat", "Hello-World")
+    assert document_service.get_document.await_count == 1
+    assert prefetcher.schedule(document) == 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_pending(document, document_service):
+    prefetcher = LinkPrefetcher(document_service, start_delay=10)
+    prefetcher.schedule(document)
+
+    await prefetcher.close()
+
+    document_service.get_document.assert_not_called()
+    assert prefetcher.pending_count == 0
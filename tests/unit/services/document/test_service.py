@@ -2,12 +2,21 @@
 Unit tests for DocumentService.
 """
 
+from datetime import datetime
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from doc_ai_helper_backend.services.document import DocumentService
-from doc_ai_helper_backend.models.document import DocumentType, DocumentResponse
+from doc_ai_helper_backend.models.document import (
+    DocumentType,
+    DocumentResponse,
+    FileTreeItem,
+    RepositoryStructureResponse,
+)
 from doc_ai_helper_backend.core.exceptions import NotFoundException
+from doc_ai_helper_backend.services.cache import MemoryCache
+from doc_ai_helper_backend.services.document.link_graph import link_graph_registry
 
 
 class TestDocumentService:
@@ -49,3 +58,109 @@ class TestDocumentService:
                     repo="test_repo",
                     path="nonexistent.md",
                 )
+
+    @pytest.mark.asyncio
+    async def test_missing_document_is_negatively_cached(self):
+        """Test repeated requests for a missing path skip the Git service."""
+        document_service = DocumentService(cache_service=MemoryCache())
+        git_service = MagicMock()
+        git_service.get_document = AsyncMock(side_effect=NotFoundException("missing"))
+
+        with patch(
+            "doc_ai_helper_backend.services.document.service.GitServiceFactory.create",
+            return_value=git_service,
+        ):
+            for _ in range(3):
+                with pytest.raises(NotFoundException):
+                    await document_service.get_document(
+                        "mock", "owner", "negative-repo", "missing.md"
+                    )
+
+            await document_service.invalidate_document(
+                "mock", "owner", "negative-repo", "missing.md"
+            )
+            with pytest.raises(NotFoundException):
+                await document_service.get_document(
+                    "mock", "owner", "negative-repo", "missing.md"
+                )
+
+        assert git_service.get_document.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_document_answered_from_tree_index(self):
+        """Test paths absent from a fresh tree index never reach the Git service."""
+        document_service = DocumentService(cache_service=MemoryCache())
+        link_graph_registry.get_or_create("mock", "owner", "tree-repo", "main").set_tree(
+            ["README.md", "docs", "docs/index.md"]
+        )
+        git_service = MagicMock()
+        git_service.get_document = AsyncMock(side_effect=NotFoundException("missing"))
+
+        with patch(
+            "doc_ai_helper_backend.services.document.service.GitServiceFactory.create",
+            return_value=git_service,
+        ):
+            with pytest.raises(NotFoundException):
+                await document_service.get_document(
+                    "mock", "owner", "tree-repo", "docs/missing.md"
+                )
+
+        git_service.get_document.assert_not_awaited()
+
+
+    @pytest.mark.asyncio
+    async def test_truncated_tree_is_not_used_as_index(self):
+        """Test that a truncated tree never answers missing paths locally."""
+        document_service = DocumentService(cache_service=MemoryCache())
+        structure = RepositoryStructureResponse(
+            service="mock",
+            owner="owner",
+            repo="truncated-repo",
+            tree=[FileTreeItem(path="README.md", name="README.md", type="file")],
+            truncated=True,
+            last_updated=datetime.utcnow(),
+        )
+        git_service = MagicMock()
+        git_service.get_repository_structure = AsyncMock(return_value=structure)
+        git_service.get_document = AsyncMock(side_effect=NotFoundException("missing"))
+
+        with patch(
+            "doc_ai_helper_backend.services.document.service.GitServiceFactory.create",
+            return_value=git_service,
+        ):
+            await document_service.get_repository_structure(
+                "mock", "owner", "truncated-repo", use_cache=False
+            )
+            with pytest.raises(NotFoundException):
+                await document_service.get_document(
+                    "mock", "owner", "truncated-repo", "docs/unlisted.md"
+                )
+
+        graph = link_graph_registry.get("mock", "owner", "truncated-repo", "main")
+        assert graph is None or not graph.has_tree
+        git_service.get_document.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_document_without_links_skips_extraction(self):
+        """Test link extraction and transformation are skipped when not needed."""
+        cache = MemoryCache()
+        document_service = DocumentService(cache_service=cache)
+
+        document = await document_service.get_document(
+            "mock", "octocat", "Hello-World", "README.md",
+            transform_links=False, extract_links=False,
+        )
+
+        assert document.links is None
+        assert document.transformed_content is None
+        assert DocumentService._document_cache_key(
+            "mock", "octocat", "Hello-World", "README.md", "main", False, None, False
+        ) in cache
+
+        # A variant with links serves later link-less requests too
+        full = await document_service.get_document(
+            "mock", "octocat", "Hello-World", "README.md"
+        )
+        assert await document_service.get_document(
+            "mock", "octocat", "Hello-World", "README.md", extract_links=False
+        ) is full
@@ -0,0 +1,162 @@
+"""
+Tests for the incremental repository sync engine.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from doc_ai_helper_backend.core.exceptions import NotFoundException
+from doc_ai_helper_backend.models.document import (
+    DocumentContent,
+    DocumentMetadata,
+    DocumentResponse,
+    DocumentType,
+    FileChange,
+    FileTreeItem,
+    RepositoryStructureResponse,
+)
+from doc_ai_helper_backend.services.document.sync import RepositorySyncEngine
+from doc_ai_helper_backend.services.llm.repository_index import (
+    repository_index_registry,
+)
+
+KEY = ("mock", "octocat", "docs-repo", "main")
+
+
+def _document(path: str, sha: str) -> DocumentResponse:
+    return DocumentResponse(
+        path=path,
+        name=path.split("/")[-1],
+        type=DocumentType.MARKDOWN,
+        metadata=DocumentMetadata(
+            size=1,
+            last_modified=datetime.now(timezone.utc),
+            content_type="text/markdown",
+            sha=sha,
+        ),
+        content=DocumentContent(content=f"# {path}"),
+        repository="docs-repo",
+        owner="octocat",
+        service="mock",
+        ref="main",
+    )
+
+
+def _structure(files: dict) -> RepositoryStructureResponse:
+    return RepositoryStructureResponse(
+        service="mock",
+        owner="octocat",
+        repo="docs-repo",
+        ref="main",
+        tree=[
+            FileTreeItem(path=path, name=path.split("/")[-1], type="file", sha=sha)
+            for path, sha in files.items()
+        ],
+        last_updated=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture(autouse=True)
+def index():
+    repository_index_registry.discard(*KEY)
+    index = repository_index_registry.get_or_create(*KEY)
+    index.add_document("docs/a.md", "# a", "sha-a1")
+    index.add_document("docs/b.md", "# b", "sha-b1")
+    index.add_document("docs/old.md", "# old", "sha-old")
+    yield index
+    repository_index_registry.discard(*KEY)
+
+
+@pytest.fixture
+def git_service():
+    git_service = MagicMock()
+    git_service.get_latest_commit = AsyncMock(return_value="head")
+    git_service.compare_commits = AsyncMock(return_value=[])
+    with patch(
+        "doc_ai_helper_backend.services.document.sync.GitServiceFactory.create",
+        return_value=git_service,
+    ):
+        yield git_service
+
+
+@pytest.fixture
+def document_service():
+    service = MagicMock()
+    service.invalidate_document = AsyncMock()
+    service.invalidate_structure = AsyncMock()
+    service.get_repository_structure = AsyncMock(
+        return_value=_structure(
+            {"docs/a.md": "sha-a2", "docs/b.md": "sha-b1", "docs/new.md": "sha-new"}
+        )
+    )
+    service.get_document = AsyncMock(
+        side_effect=lambda s, o, r, path, ref: _document(path, f"sha-{path}")
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_unchanged_head_does_nothing(git_service, document_service):
+    engine = RepositorySyncEngine(document_service)
+
+    result = await engine.sync(*KEY, last_commit="head")
+
+    assert result.mode == "unchanged"
+    git_service.compare_commits.assert_not_awaited()
+    document_service.get_document.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_refreshes_only_changed_paths(
+    git_service, document_service, index
+):
+    git_service.compare_commits.return_value = [
+        FileChange(path="docs/a.md", status="modified"),
+        FileChange(path="docs/b.md", status="removed"),
+        FileChange(path="docs/new.md", status="renamed", previous_path="docs/old.md"),
+        FileChange(path="docs/logo.png", status="added"),
+        FileChange(path="README.md", status="modified"),
+    ]
+    engine = RepositorySyncEngine(document_service)
+
+    result = await engine.sync(*KEY, root_path="docs", last_commit="base")
+
+    assert result.mode == "incremental"
+    assert result.refreshed == ["docs/a.md", "docs/new.md"]
+    assert result.removed == ["docs/b.md", "docs/old.md"]
+    invalidated = sorted(c.args[3] for c in document_service.invalidate_document.await_args_list)
+    assert invalidated == [
+        "README.md", "docs/a.md", "docs/b.md", "docs/logo.png", "docs/new.md", "docs/old.md"
+    ]
+    assert sorted(index.paths()) == ["docs/a.md", "docs/new.md"]
+    document_service.invalidate_structure.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_comparison_falls_back_to_full_sync(
+    git_service, document_service, index
+):
+    git_service.compare_commits.side_effect = NotFoundException("force pushed")
+    engine = RepositorySyncEngine(document_service)
+
+    result = await engine.sync(*KEY, last_commit="base")
+
+    assert result.mode == "full"
+    # b.md is unchanged (same blob SHA) and is not refetched
+    assert result.refreshed == ["docs/a.md", "docs/new.md"]
+    assert result.removed == ["docs/old.md"]
+    assert sorted(index.paths()) == ["docs/a.md", "docs/b.md", "docs/new.md"]
+
+
+@pytest.mark.asyncio
+async def test_large_change_set_falls_back_to_full_sync(git_service, document_service):
+    git_service.compare_commits.return_value = [
+        FileChange(path=f"docs/{i}.md", status="modified") for i in range(3)
+    ]
+    engine = RepositorySyncEngine(document_service, max_changed_paths=2)
+
+    result = await engine.sync(*KEY, last_commit="base")
+
+    assert result.mode == "full"
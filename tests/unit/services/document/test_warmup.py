@@ -0,0 +1,119 @@
+"""
+Tests for the repository warmer.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from doc_ai_helper_backend.core.exceptions import RateLimitException
+from doc_ai_helper_backend.services.cache import MemoryCache
+from doc_ai_helper_backend.services.document import DocumentService
+from doc_ai_helper_backend.services.document.warmup import RepositoryWarmer
+from doc_ai_helper_backend.services.llm.repository_index import (
+    repository_index_registry,
+)
+
+
+@pytest.fixture
+def cache():
+    return MemoryCache()
+
+
+@pytest.fixture(autouse=True)
+def clean_index():
+    repository_index_registry.discard("mock", "octocat", "Hello-World", "main")
+    yield
+    repository_index_registry.discard("mock", "octocat", "Hello-World", "main")
+
+
+@pytest.mark.asyncio
+async def test_warm_populates_caches_and_index(cache):
+    warmer = RepositoryWarmer(DocumentService(cache_service=cache))
+
+    indexed = await warmer.warm("mock", "octocat", "Hello-World", "main")
+
+    index = repository_index_registry.get("mock", "octocat", "Hello-World", "main")
+    assert indexed > 0
+    assert index is not None and index.document_count == indexed
+    assert "structure:mock:octocat:Hello-World:main:" in cache
+    for path in index.paths():
+        # Default (link-transformed) variant, as served by the documents endpoint
+        assert DocumentService._document_cache_key(
+            "mock", "octocat", "Hello-World", path, "main"
+        ) in cache
+
+
+@pytest.mark.asyncio
+async def test_schedule_deduplicates_and_runs_in_background(cache):
+    warmer = RepositoryWarmer(DocumentService(cache_service=cache))
+
+    assert warmer.schedule("mock", "octocat", "Hello-World", "main") is True
+    assert warmer.schedule("mock", "octocat", "Hello-World", "main") is False
+
+    await asyncio.gather(*warmer._tasks)
+
+    assert warmer.pending_count == 0
+    assert repository_index_registry.get("mock", "octocat", "Hello-World", "main")
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_pauses_repository():
+    document_service = MagicMock()
+    document_service.get_repository_structure = AsyncMock(
+        side_effect=RateLimitException()
+    )
+    warmer = RepositoryWarmer(document_service)
+
+    warmer.schedule("mock", "octocat", "Hello-World", "main")
+    await asyncio.gather(*warmer._tasks)
+
+    assert warmer.is_cooling_down("mock", "octocat", "Hello-World")
+    assert warmer.schedule("mock", "octocat", "Hello-World", "main") is False
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_while_fetching_documents_stops_warm_up():
+    calls = 0
+
+    async def get_document(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RateLimitException()
+
+    document_service = MagicMock()
+    document_service.get_repository_structure = AsyncMock(
+        return_value=SimpleNamespace(
+            tree=[
+                SimpleNamespace(path=f"docs/page{i}.md", type="file", sha=f"sha{i}")
+                for i in range(50)
+            ]
+        )
+    )
+    document_service.get_document = get_document
+    warmer = RepositoryWarmer(document_service)
+
+    warmer.schedule("mock", "octocat", "Hello-World", "main")
+    await asyncio.gather(*warmer._tasks)
+
+    assert warmer.is_cooling_down("mock", "octocat", "Hello-World")
+    # Fetching stopped after the rate limit instead of trying every document
+    assert calls < 50
+
+
+@pytest.mark.asyncio
+async def test_periodic_schedules_listed_targets_until_closed(cache):
+    warmer = RepositoryWarmer(DocumentService(cache_service=cache))
+    list_targets = AsyncMock(return_value=[("mock", "octocat", "Hello-World", "main", None)])
+
+    warmer.start_periodic(list_targets, interval_seconds=3600)
+    await asyncio.sleep(0)
+    await asyncio.gather(*warmer._tasks)
+    await warmer.close()
+
+    list_targets.assert_awaited_once()
+    assert repository_index_registry.get("mock", "octocat", "Hello-World", "main")
+    assert warmer._periodic_task is None
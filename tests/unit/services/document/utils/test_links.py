@@ -329,3 +329,26 @@ class TestLinkTransformer:
             content, path, base_url, root_path=None
         )
         assert "/api/v1/documents/contents/github/owner/repo/docs/guide/file.md" in transformed_none
+
+    def test_transform_links_with_asset_proxy(self, monkeypatch):
+        """アセットプロキシ有効時の画像リンク変換のテスト"""
+        from doc_ai_helper_backend.core.config import settings
+
+        monkeypatch.setattr(settings, "enable_asset_proxy", True)
+        content = "![ロゴ](images/logo.png)\n[ドキュメント](guide.md)"
+
+        transformed = LinkTransformer.transform_links(
+            content,
+            "docs/index.md",
+            "/api/v1/documents/contents/mock/owner/repo",
+            "mock",
+            "owner",
+            "repo",
+            "main",
+        )
+
+        assert (
+            f"{settings.api_prefix}/documents/assets/mock/owner/repo/docs/images/logo.png?ref=main"
+            in transformed
+        )
+        assert "/api/v1/documents/contents/mock/owner/repo/docs/guide.md?ref=main" in transformed
@@ -403,3 +403,54 @@ class TestForgejoService:
             assert result["id"] == 12345
             assert result["name"] == "test-repo"
             assert result["full_name"] == "owner/test-repo"
+
+    @pytest.mark.asyncio
+    async def test_compare_commits_maps_renames(self):
+        """Test that renames across the range keep the path at the base commit."""
+        service = ForgejoService(base_url=self.base_url, access_token=self.access_token)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        # Forgejo lists commits newest first
+        mock_response.json.return_value = {
+            "commits": [
+                {
+                    "files": [
+                        {
+                            "filename": "docs/final.md",
+                            "status": "renamed",
+                            "previous_filename": "docs/moved.md",
+                        },
+                        {
+                            "filename": "docs/draft-final.md",
+                            "status": "renamed",
+                            "previous_filename": "docs/draft.md",
+                        },
+                    ]
+                },
+                {
+                    "files": [
+                        {
+                            "filename": "docs/moved.md",
+                            "status": "renamed",
+                            "previous_filename": "docs/original.md",
+                        },
+                        {"filename": "docs/draft.md", "status": "added"},
+                    ]
+                },
+            ]
+        }
+
+        with patch.object(
+            service, "_make_request", new_callable=AsyncMock
+        ) as mock_make_request:
+            mock_make_request.return_value = mock_response
+
+            result = await service.compare_commits("owner", "repo", "base", "head")
+
+        changes = {change.path: change for change in result}
+        assert set(changes) == {"docs/final.md", "docs/draft-final.md"}
+        assert changes["docs/final.md"].status == "renamed"
+        assert changes["docs/final.md"].previous_path == "docs/original.md"
+        assert changes["docs/draft-final.md"].status == "added"
+        assert changes["docs/draft-final.md"].previous_path is None
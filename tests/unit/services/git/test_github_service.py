@@ -3,6 +3,7 @@ Test GitHub service implementation.
 """
 
 import json
+import httpx
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -223,6 +224,7 @@ class TestGitHubService:
         assert response.owner == "octocat"
         assert response.repo == "Hello-World"
         assert len(response.tree) == 3
+        assert response.truncated is False
 
         # ファイルの検証
         readme = next(item for item in response.tree if item.path == "README.md")
@@ -248,6 +250,65 @@ class TestGitHubService:
             == "https://github.com/octocat/Hello-World/tree/main/src"
         )
 
+    @pytest.mark.asyncio
+    async def test_get_repository_structure_truncated(self, github_service):
+        """切り詰められたツリーのフラグが伝播されることのテスト"""
+        mock_data = {
+            "sha": "abc123",
+            "tree": [
+                {"path": "README.md", "mode": "100644", "type": "blob", "sha": "def456"},
+            ],
+            "truncated": True,
+        }
+
+        with patch.object(
+            github_service, "_make_request", new_callable=AsyncMock
+        ) as mock_make_request:
+            mock_make_request.return_value = (mock_data, {})
+
+            response = await github_service.get_repository_structure(
+                "octocat", "Hello-World"
+            )
+
+        assert response.truncated is True
+
+    @pytest.mark.asyncio
+    async def test_compare_commits(self, github_service):
+        """コミット比較でリネーム元のパスが返されることのテスト"""
+        mock_data = {
+            "files": [
+                {"filename": "docs/new.md", "status": "renamed", "previous_filename": "docs/old.md"},
+                {"filename": "README.md", "status": "modified"},
+            ]
+        }
+
+        with patch.object(
+            github_service, "_make_request", new_callable=AsyncMock
+        ) as mock_make_request:
+            mock_make_request.return_value = (mock_data, {})
+
+            changes = await github_service.compare_commits("octocat", "Hello-World", "a", "b")
+
+        assert [(c.path, c.status, c.previous_path) for c in changes] == [
+            ("docs/new.md", "renamed", "docs/old.md"),
+            ("README.md", "modified", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_compare_commits_at_file_limit(self, github_service):
+        """比較APIの上限（300ファイル）に達した場合はエラーになることのテスト"""
+        mock_data = {
+            "files": [{"filename": f"docs/{i}.md", "status": "modified"} for i in range(300)]
+        }
+
+        with patch.object(
+            github_service, "_make_request", new_callable=AsyncMock
+        ) as mock_make_request:
+            mock_make_request.return_value = (mock_data, {})
+
+            with pytest.raises(GitServiceException, match="truncated"):
+                await github_service.compare_commits("octocat", "Hello-World", "a", "b")
+
     @pytest.mark.asyncio
     async def test_search_repository(self, github_service):
         """リポジトリ検索のテスト"""
@@ -502,3 +563,97 @@ class TestGitHubService:
         assert result["name"] == "Hello-World"
         assert result["full_name"] == "octocat/Hello-World"
         mock_make_request.assert_called_once()
+
+    @staticmethod
+    def _patch_transport(handler):
+        """httpx.AsyncClientにモックトランスポートを注入する"""
+        real_client = httpx.AsyncClient
+        return patch(
+            "doc_ai_helper_backend.services.git.base.httpx.AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+    @pytest.mark.asyncio
+    async def test_open_raw_stream_forwards_range(self, github_service):
+        """rawストリームがRangeを上流に転送するテスト"""
+
+        def handler(request):
+            assert request.headers["Accept"] == "application/vnd.github.raw"
+            assert request.headers["Range"] == "bytes=0-3"
+            assert request.headers["Accept-Encoding"] == "identity"
+            assert request.url.params["ref"] == "main"
+            return httpx.Response(
+                206,
+                headers={"Content-Range": "bytes 0-3/10", "ETag": '"abc"'},
+                content=b"0123",
+            )
+
+        with self._patch_transport(handler):
+            stream = await github_service.open_raw_stream(
+                "octocat", "Hello-World", "big.html", byte_range=(0, 3)
+            )
+            body = await stream.read()
+
+        assert body == b"0123"
+        assert stream.status_code == 206
+        assert stream.content_range == (0, 3, 10)
+        assert stream.etag == '"abc"'
+
+    @pytest.mark.asyncio
+    async def test_open_raw_stream_drops_encoded_length(self, github_service):
+        """上流が圧縮した場合にエンコード後の長さを転送しないテスト"""
+        import gzip
+
+        body = b"# Title\n" * 100
+
+        def handler(request):
+            if "Range" in request.headers:
+                return httpx.Response(
+                    206,
+                    headers={"Content-Encoding": "gzip", "Content-Range": "bytes 0-3/800"},
+                    content=gzip.compress(body),
+                )
+            return httpx.Response(
+                200, headers={"Content-Encoding": "gzip"}, content=gzip.compress(body)
+            )
+
+        with self._patch_transport(handler):
+            stream = await github_service.open_raw_stream(
+                "octocat", "Hello-World", "big.md", byte_range=(0, 3)
+            )
+            data = await stream.read()
+
+        # The encoded partial response is replaced by the full decoded content
+        assert data == body
+        assert stream.status_code == 200
+        assert stream.content_length is None
+
+    @pytest.mark.asyncio
+    async def test_open_raw_stream_not_found(self, github_service):
+        """rawストリームで404の場合のテスト"""
+        with self._patch_transport(lambda request: httpx.Response(404, text="Not Found")):
+            with pytest.raises(NotFoundException):
+                await github_service.open_raw_stream("octocat", "Hello-World", "missing.md")
+
+    @pytest.mark.asyncio
+    async def test_get_document_large_file_uses_raw_stream(self, github_service):
+        """1MBを超えるファイルをrawエンドポイントから取得するテスト"""
+        mock_data = {
+            "name": "big.md",
+            "path": "big.md",
+            "sha": "abc123",
+            "size": 2_000_000,
+            "encoding": "none",
+            "content": "",
+            "type": "file",
+        }
+
+        with patch.object(
+            github_service, "_make_request", new_callable=AsyncMock
+        ) as mock_make_request, self._patch_transport(
+            lambda request: httpx.Response(200, content="# 大きな文書".encode("utf-8"))
+        ):
+            mock_make_request.return_value = (mock_data, {})
+            document = await github_service.get_document("octocat", "Hello-World", "big.md")
+
+        assert document.content.content == "# 大きな文書"
@@ -12,7 +12,7 @@ from typing import Dict, Any, List
 from doc_ai_helper_backend.services.git.factory import GitServiceFactory
 from doc_ai_helper_backend.services.git.mock_service import MockGitService
 from doc_ai_helper_backend.models.document import DocumentResponse, FileTreeItem
-from doc_ai_helper_backend.core.exceptions import NotFoundException
+from doc_ai_helper_backend.core.exceptions import GitServiceException, NotFoundException
 
 
 class TestMockGitService:
@@ -314,3 +314,9 @@ class TestMockGitService:
 
         with pytest.raises(NotFoundException):
             await mock_service.get_repository_info("example", "nonexistent-repo")
+
+    @pytest.mark.asyncio
+    async def test_compare_commits_is_not_supported(self, mock_service):
+        """Test that comparisons fail so syncs fall back to a full sync."""
+        with pytest.raises(GitServiceException):
+            await mock_service.compare_commits("example", "docs-project", "a", "b")
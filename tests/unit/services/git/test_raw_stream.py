@@ -0,0 +1,58 @@
+"""
+Tests for raw file streaming primitives.
+"""
+
+import pytest
+
+from doc_ai_helper_backend.services.git.raw_stream import (
+    RAW_CHUNK_SIZE,
+    RangeNotSatisfiableError,
+    RawFileStream,
+    format_range_header,
+    parse_content_range,
+    parse_range_header,
+    resolve_range,
+)
+
+
+def test_parse_range_header():
+    assert parse_range_header("bytes=0-99") == (0, 99)
+    assert parse_range_header("bytes=100-") == (100, None)
+    assert parse_range_header("bytes=-500") == (None, 500)
+    # Ignored: absent, malformed, reversed and multi-range headers
+    assert parse_range_header(None) is None
+    assert parse_range_header("items=0-1") is None
+    assert parse_range_header("bytes=5-1") is None
+    assert parse_range_header("bytes=0-1,4-5") is None
+
+
+def test_format_range_header_round_trip():
+    for value in ("bytes=0-99", "bytes=100-", "bytes=-500"):
+        assert format_range_header(parse_range_header(value)) == value
+
+
+def test_resolve_range():
+    assert resolve_range((0, 99), 50) == (0, 49)
+    assert resolve_range((10, None), 50) == (10, 49)
+    assert resolve_range((None, 10), 50) == (40, 49)
+    assert resolve_range((None, 100), 50) == (0, 49)
+    with pytest.raises(RangeNotSatisfiableError):
+        resolve_range((50, None), 50)
+
+
+def test_parse_content_range():
+    assert parse_content_range("bytes 0-9/100") == (0, 9, 100)
+    assert parse_content_range("bytes 0-9/*") == (0, 9, None)
+    assert parse_content_range("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_from_bytes_streams_in_chunks_and_closes():
+    data = b"x" * (RAW_CHUNK_SIZE + 10)
+    stream = RawFileStream.from_bytes(data, etag="sha")
+
+    chunks = [chunk async for chunk in stream.iter_chunks()]
+
+    assert [len(c) for c in chunks] == [RAW_CHUNK_SIZE, 10]
+    assert stream.total_size == len(data)
+    assert stream._closed
@@ -162,6 +162,17 @@ class TestOpenAIServiceCapabilities:
         # Should fall back to character/4 approximation: 20 // 4 = 5
         assert tokens == 5
 
+    async def test_estimate_tokens_for_requested_model(self, openai_service):
+        """Test that a requested model uses its own encoder from the shared registry."""
+        with patch('doc_ai_helper_backend.services.llm.providers.openai_service.tokenizer_registry') as registry:
+            registry.count_tokens.return_value = 7
+
+            tokens = await openai_service.estimate_tokens("Test text", model="gpt-4o")
+
+        assert tokens == 7
+        registry.count_tokens.assert_called_once_with("Test text", model="gpt-4o")
+        openai_service._token_encoder.encode.assert_not_called()
+
 
 class TestOpenAIServiceMCP:
     """Test MCP server integration."""
@@ -0,0 +1,139 @@
+"""
+Test cases for LLM cache key generation.
+
+LLMレスポンスキャッシュのキー生成のテストケース群。
+"""
+
+import hashlib
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from doc_ai_helper_backend.models.document import DocumentMetadata
+from doc_ai_helper_backend.models.llm import MessageItem, MessageRole
+from doc_ai_helper_backend.services.llm.cache_key import (
+    build_cache_key,
+    document_fingerprint,
+    history_digest,
+)
+
+
+def _history(turns):
+    history = []
+    for i in range(turns):
+        history.append(MessageItem(role=MessageRole.USER, content=f"Question {i}? " * 20))
+        history.append(MessageItem(role=MessageRole.ASSISTANT, content=f"Answer {i}. " * 80))
+    return history
+
+
+def _metadata(sha):
+    return DocumentMetadata(
+        size=10, last_modified=datetime(2024, 1, 1), content_type="text/markdown", sha=sha
+    )
+
+
+class TestHistoryDigest:
+    """Test the rolling conversation history digest."""
+
+    def test_chain_can_be_extended(self):
+        """Test that extending a known prefix digest matches hashing the whole history."""
+        history = _history(3)
+
+        prefix = history_digest(history[:4])
+
+        assert history_digest(history[4:], start=prefix) == history_digest(history)
+
+    def test_order_and_role_matter(self):
+        """Test that reordered or re-attributed messages produce different digests."""
+        user = MessageItem(role=MessageRole.USER, content="hello")
+        assistant = MessageItem(role=MessageRole.ASSISTANT, content="hello")
+
+        assert history_digest([user, assistant]) != history_digest([assistant, user])
+        assert history_digest([user]) != history_digest([assistant])
+
+    def test_timestamps_are_ignored(self):
+        """Test that message timestamps do not change the digest."""
+        first = MessageItem(role=MessageRole.USER, content="hi", timestamp=datetime(2024, 1, 1))
+        second = MessageItem(role=MessageRole.USER, content="hi", timestamp=datetime(2025, 1, 1))
+
+        assert history_digest([first]) == history_digest([second])
+
+
+class TestBuildCacheKey:
+    """Test structured cache keys."""
+
+    def test_document_sha_is_used_instead_of_content(self):
+        """Test that documents with the same blob SHA share a key."""
+        key = build_cache_key("prompt", document_metadata=_metadata("abc"), document_content="one")
+        same_blob = build_cache_key("prompt", document_metadata=_metadata("abc"), document_content="two")
+        other_blob = build_cache_key("prompt", document_metadata=_metadata("def"), document_content="one")
+
+        assert key.startswith("llm:")
+        assert key == same_blob
+        assert key != other_blob
+
+    def test_content_is_hashed_without_sha(self):
+        """Test that content identifies the document when no SHA is known."""
+        assert document_fingerprint(_metadata(None), "one") != document_fingerprint(None, "two")
+        assert document_fingerprint(None, None) is None
+
+    def test_inputs_change_the_key(self):
+        """Test that every query input is part of the key."""
+        base = build_cache_key("prompt", _history(1), {"temperature": 0.1})
+
+        assert base == build_cache_key("prompt", _history(1), {"temperature": 0.1})
+        assert base != build_cache_key("other", _history(1), {"temperature": 0.1})
+        assert base != build_cache_key("prompt", _history(2), {"temperature": 0.1})
+        assert base != build_cache_key("prompt", _history(1), {"temperature": 0.2})
+        assert base != build_cache_key("prompt", _history(1), None)
+
+    def test_provider_and_model_change_the_key(self):
+        """Test that the shared cache never mixes answers from different providers or models."""
+        key = build_cache_key("prompt", provider="openai", model="gpt-4o")
+
+        assert key == build_cache_key("prompt", provider="OpenAI", model="gpt-4o")
+        assert key != build_cache_key("prompt", provider="openai", model="gpt-4o-mini")
+        assert key != build_cache_key("prompt", provider="mock", model="gpt-4o")
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(
+    not os.getenv("RUN_PERFORMANCE_TESTS"),
+    reason="Wall-clock benchmark; set RUN_PERFORMANCE_TESTS=1 to run",
+)
+class TestCacheKeyBenchmark:
+    """Benchmark cache keys on large documents and histories."""
+
+    @staticmethod
+    def _legacy_key(prompt, history, options, document_content):
+        key_data = {
+            "prompt": prompt,
+            "conversation_history": [msg.model_dump() for msg in history],
+            "options": options,
+            "repository_context": None,
+            "document_metadata": None,
+            "document_content": document_content,
+        }
+        return hashlib.md5(str(sorted(key_data.items())).encode()).hexdigest()
+
+    def test_structured_key_is_faster_on_large_inputs(self):
+        """Test that the structured key beats full serialization on a long chat about a large document."""
+        document = "# Heading\n\n" + "Lorem ipsum dolor sit amet. " * 40000  # ~1 MB
+        history = _history(100)
+        options = {"temperature": 0.2, "max_tokens": 1000}
+        metadata = _metadata("3f786850e387550fdab836ed7e6dc881de23001b")
+        rounds = 20
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            self._legacy_key("prompt", history, options, document)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            build_cache_key("prompt", history, options, None, metadata, document)
+        structured = time.perf_counter() - start
+
+        assert structured < legacy
@@ -0,0 +1,155 @@
+"""
+Test cases for relevance-ranked document retrieval.
+
+ドキュメントチャンク分割と関連度ランキングのテストケース群。
+"""
+
+import pytest
+
+from doc_ai_helper_backend.services.llm.document_retriever import (
+    BM25Index,
+    OMISSION_MARKER,
+    calculate_document_token_budget,
+    estimate_text_tokens,
+    pack_chunks,
+    select_relevant_content,
+    split_into_chunks,
+    tokenize,
+)
+from doc_ai_helper_backend.services.llm.system_prompt_generator import (
+    generate_system_prompt,
+)
+
+
+def _build_long_document() -> str:
+    filler = "General background text that is not relevant to anything. " * 40
+    return "\n".join(
+        [
+            "# Project Guide",
+            "Intro paragraph.",
+            "## Installation",
+            filler,
+            "## Deployment",
+            "Use kubernetes helm charts to deploy the service to production.",
+            "## Appendix",
+            filler,
+        ]
+    )
+
+
+class TestChunking:
+    """Test heading-aware chunking."""
+
+    def test_split_by_markdown_headings(self):
+        chunks = split_into_chunks("# A\ntext a\n## B\ntext b\n# C\ntext c")
+
+        assert [chunk.heading for chunk in chunks] == ["A", "A > B", "C"]
+        assert chunks[1].text == "## B\ntext b"
+
+    def test_headings_inside_code_fence_are_ignored(self):
+        content = "# A\n```\n# not a heading\n```\n# B\nbody"
+
+        chunks = split_into_chunks(content)
+
+        assert [chunk.heading for chunk in chunks] == ["A", "B"]
+
+    def test_split_by_html_headings(self):
+        content = "<h1>Title</h1>\n<p>one</p>\n<h2><span>Sub</span></h2>\n<p>two</p>"
+
+        chunks = split_into_chunks(content)
+
+        assert [chunk.heading for chunk in chunks] == ["Title", "Title > Sub"]
+
+    def test_large_section_is_split_by_paragraph(self):
+        paragraph = "word " * 200
+        content = "# Big\n" + "\n\n".join([paragraph] * 4)
+
+        chunks = split_into_chunks(content, max_chunk_tokens=300)
+
+        assert len(chunks) > 1
+        assert all(chunk.heading == "Big" for chunk in chunks)
+
+
+class TestScoring:
+    """Test tokenization and BM25 scoring."""
+
+    def test_tokenize_japanese_bigrams(self):
+        assert tokenize("設定方法 API") == ["api", "設定", "定方", "方法"]
+
+    def test_estimate_text_tokens(self):
+        assert estimate_text_tokens("") == 0
+        assert estimate_text_tokens("abcd") == 1
+        assert estimate_text_tokens("日本語") == 3
+
+    def test_bm25_ranks_relevant_chunk_first(self):
+        chunks = split_into_chunks(_build_long_document())
+        index = BM25Index(chunks)
+
+        top = index.top_k("How do I deploy with helm?", k=1)
+
+        assert top[0][0].heading == "Project Guide > Deployment"
+
+    def test_bm25_unknown_terms_score_zero(self):
+        chunks = split_into_chunks(_build_long_document())
+
+        assert all(score == 0 for score in BM25Index(chunks).score("zzz"))
+
+    def test_pack_chunks_respects_budget_and_order(self):
+        chunks = split_into_chunks("# A\naaa\n# B\nbbb\n# C\nccc")
+        budget = chunks[0].tokens + chunks[2].tokens
+
+        selected = pack_chunks(chunks, [0.0, 0.0, 5.0], budget)
+
+        assert [chunk.index for chunk in selected] == [0, 2]
+
+
+class TestSelectRelevantContent:
+    """Test content selection within a token budget."""
+
+    def test_short_content_is_returned_unchanged(self):
+        content, stats = select_relevant_content("short", "query", 100)
+
+        assert content == "short"
+        assert stats["selected_chunks"] == stats["total_chunks"] == 1
+
+    def test_long_content_keeps_relevant_section(self):
+        content, stats = select_relevant_content(
+            _build_long_document(), "deploy helm kubernetes", 150
+        )
+
+        assert "kubernetes helm charts" in content
+        assert OMISSION_MARKER in content
+        assert stats["selected_tokens"] <= 150
+
+    def test_oversized_single_chunk_is_truncated(self):
+        content, stats = select_relevant_content("x" * 10000, None, 100)
+
+        assert 0 < len(content) < 10000
+        assert stats["selected_tokens"] <= 100
+
+    def test_calculate_document_token_budget(self):
+        assert calculate_document_token_budget(4096, reserved_tokens=48) == 2000
+        assert calculate_document_token_budget(4096, reserved_tokens=4000) == 512
+        assert calculate_document_token_budget(None) == 2048
+
+    def test_document_token_budget_is_capped(self):
+        # The context-window share is only an upper bound
+        assert calculate_document_token_budget(128000, max_tokens=2000) == 2000
+        assert calculate_document_token_budget(4096, reserved_tokens=3000, max_tokens=2000) == 512
+        assert calculate_document_token_budget(None, max_tokens=1000) == 1000
+        assert calculate_document_token_budget(128000, max_tokens=0) == 64000
+
+
+class TestSystemPromptIntegration:
+    """Test retrieval through generate_system_prompt."""
+
+    def test_generate_system_prompt_with_token_budget(self):
+        result = generate_system_prompt(
+            document_content=_build_long_document(),
+            include_document_in_system_prompt=True,
+            query="deploy helm",
+            max_document_tokens=150,
+        )
+
+        assert "kubernetes helm charts" in result
+        assert "...(内容が長いため省略されました)" not in result
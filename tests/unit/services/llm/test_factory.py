@@ -74,6 +74,7 @@ class TestLLMServiceFactory:
         """Set up test method with clean factory state."""
         # Clear factory registry
         LLMServiceFactory._services.clear()
+        LLMServiceFactory.clear_shared()
         
     def teardown_method(self):
         """Clean up after test method."""
@@ -95,6 +96,26 @@ class TestLLMServiceFactory:
         assert "test" in LLMServiceFactory._services
         assert LLMServiceFactory._services["test"] == MockLLMServiceForTesting
 
+    def test_get_shared_reuses_instance(self):
+        """Test that services with the same configuration are shared."""
+        LLMServiceFactory.register("test", MockLLMServiceForTesting)
+
+        first = LLMServiceFactory.get_shared("test", enable_mcp=False, api_key="key-1")
+        second = LLMServiceFactory.get_shared("TEST", enable_mcp=False, api_key="key-1")
+        other_key = LLMServiceFactory.get_shared("test", enable_mcp=False, api_key="key-2")
+
+        assert first is second
+        assert other_key is not first
+
+    def test_get_shared_dropped_on_register(self):
+        """Test that re-registering a provider drops its shared instances."""
+        LLMServiceFactory.register("test", MockLLMServiceForTesting)
+        first = LLMServiceFactory.get_shared("test", enable_mcp=False, api_key="key")
+
+        LLMServiceFactory.register("test", MockLLMServiceForTesting)
+
+        assert LLMServiceFactory.get_shared("test", enable_mcp=False, api_key="key") is not first
+
     def test_create_service_basic(self):
         """Test basic service creation."""
         LLMServiceFactory.register("test", MockLLMServiceForTesting)
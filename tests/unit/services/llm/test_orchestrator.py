@@ -14,11 +14,13 @@ Specific functionality tests are in dedicated modules:
 - test_tool_executor.py: Tool execution and followup
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from typing import Dict, Any, List, Optional
 
 from doc_ai_helper_backend.services.llm.orchestrator import LLMOrchestrator
+from doc_ai_helper_backend.services.llm.tokenizer import tokenizer_registry
 from doc_ai_helper_backend.models.llm import (
     LLMResponse,
     LLMQueryRequest,
@@ -108,6 +110,24 @@ def sample_query_request_with_tools():
     )
 
 
+@pytest.fixture
+def stream_cache_request():
+    """Create a request without document retrieval for stream caching tests.
+
+    Token counting falls back to the character estimate so the caching tests
+    do not download tiktoken encodings.
+    """
+    with patch.object(tokenizer_registry, "get_encoder", return_value=None):
+        yield LLMQueryRequest(
+            query=CoreQueryRequest(
+                prompt="Test prompt",
+                provider="mock",
+                model="test-model",
+            ),
+            document=DocumentContext(auto_include_document=False),
+        )
+
+
 class TestLLMOrchestratorBasic:
     """Test basic orchestrator functionality."""
 
@@ -380,6 +400,78 @@ class TestOrchestratorCaching:
             assert isinstance(result, LLMResponse)
             assert result.content == "Cached response"
 
+    async def test_cache_is_not_shared_across_models(self, orchestrator, mock_llm_service, mock_cache_service, sample_llm_response, stream_cache_request):
+        """Test that identical prompts sent to different models do not share a cached answer."""
+        mock_llm_service._convert_provider_response.return_value = sample_llm_response
+        mock_llm_service.default_model = "default-model"
+        other_model = stream_cache_request.model_copy(deep=True)
+        other_model.query.model = None
+
+        with patch('doc_ai_helper_backend.services.llm.factory.LLMServiceFactory.create') as mock_factory:
+            mock_factory.return_value = mock_llm_service
+
+            await orchestrator.execute_query(stream_cache_request)
+            await orchestrator.execute_query(other_model)
+
+        assert len(mock_cache_service) == 2
+        assert mock_llm_service._call_provider_api.call_count == 2
+
+    async def test_streamed_response_is_cached(self, orchestrator, mock_llm_service, mock_cache_service, stream_cache_request):
+        """Test that a completed stream is cached and served to non-streaming queries."""
+        async def mock_stream():
+            yield "Streamed "
+            yield "answer"
+
+        mock_llm_service._stream_provider_api = Mock(return_value=mock_stream())
+
+        with patch('doc_ai_helper_backend.services.llm.factory.LLMServiceFactory.create') as mock_factory:
+            mock_factory.return_value = mock_llm_service
+
+            chunks = [chunk async for chunk in orchestrator.execute_streaming_query(stream_cache_request)]
+            result = await orchestrator.execute_query(stream_cache_request)
+
+        assert chunks[-1] == {"content": "", "done": True}
+        assert len(mock_cache_service) == 1
+        assert result.content == "Streamed answer"
+        assert result.model == "test-model"
+        mock_llm_service._call_provider_api.assert_not_called()
+
+    async def test_cached_response_is_replayed_as_stream(self, orchestrator, mock_llm_service, mock_cache_service, sample_llm_response, stream_cache_request):
+        """Test that a cache hit is replayed in chunks without calling the provider."""
+        mock_llm_service._convert_provider_response.return_value = sample_llm_response
+        mock_llm_service._stream_provider_api = Mock()
+
+        with patch('doc_ai_helper_backend.services.llm.factory.LLMServiceFactory.create') as mock_factory, \
+                patch('doc_ai_helper_backend.services.llm.orchestrator.settings.llm_stream_replay_chunk_chars', 5):
+            mock_factory.return_value = mock_llm_service
+
+            await orchestrator.execute_query(stream_cache_request)
+            chunks = [chunk async for chunk in orchestrator.execute_streaming_query(stream_cache_request)]
+
+        content_chunks = [chunk["content"] for chunk in chunks[:-1]]
+        assert "".join(content_chunks) == "Test response content"
+        assert all(len(content) <= 5 for content in content_chunks)
+        assert chunks[-1] == {"content": "", "done": True}
+        mock_llm_service._stream_provider_api.assert_not_called()
+
+    async def test_cancelled_stream_is_not_cached(self, orchestrator, mock_llm_service, mock_cache_service, stream_cache_request):
+        """Test that a partially consumed stream does not populate the cache."""
+        async def mock_stream():
+            yield "partial"
+            await asyncio.sleep(10)
+            yield "rest"
+
+        mock_llm_service._stream_provider_api = Mock(return_value=mock_stream())
+
+        with patch('doc_ai_helper_backend.services.llm.factory.LLMServiceFactory.create') as mock_factory:
+            mock_factory.return_value = mock_llm_service
+
+            stream = orchestrator.execute_streaming_query(stream_cache_request)
+            await stream.__anext__()
+            await stream.aclose()
+
+        assert mock_cache_service == {}
+
 
 class TestOrchestratorStreamingErrorHandling:
     """Test orchestrator streaming error handling."""
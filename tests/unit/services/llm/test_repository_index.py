@@ -0,0 +1,181 @@
+"""
+Test cases for the repository-wide chunk index.
+
+リポジトリ全体のチャンクインデックスのテストケース群。
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from doc_ai_helper_backend.core.config import settings
+
+from doc_ai_helper_backend.models.document import (
+    DocumentContent,
+    DocumentMetadata,
+    DocumentResponse,
+    DocumentType,
+    FileTreeItem,
+    RepositoryStructureResponse,
+)
+from doc_ai_helper_backend.services.llm.repository_index import (
+    RepositoryChunkIndex,
+    RepositoryIndexRegistry,
+    build_repository_index,
+)
+
+DOCUMENTS = {
+    "docs/install.md": ("sha-install", "# Install\nRun pip install to set up the package."),
+    "docs/deploy.md": ("sha-deploy", "# Deploy\nUse helm charts on kubernetes."),
+    "docs/page.html": ("sha-page", "<h1>FAQ</h1>\n<p>Frequently asked questions.</p>"),
+}
+
+
+def _make_document(path: str) -> DocumentResponse:
+    sha, content = DOCUMENTS[path]
+    return DocumentResponse(
+        path=path,
+        name=path.split("/")[-1],
+        type=DocumentType.MARKDOWN,
+        metadata=DocumentMetadata(
+            size=len(content),
+            last_modified=datetime.now(timezone.utc),
+            content_type="text/markdown",
+            sha=sha,
+        ),
+        content=DocumentContent(content=content),
+        repository="repo",
+        owner="owner",
+        service="mock",
+        ref="main",
+    )
+
+
+@pytest.fixture
+def document_service():
+    service = MagicMock()
+    tree = [
+        FileTreeItem(path=path, name=path.split("/")[-1], type="file", sha=sha)
+        for path, (sha, _) in DOCUMENTS.items()
+    ]
+    tree.append(FileTreeItem(path="src/main.py", name="main.py", type="file", sha="x"))
+    service.get_repository_structure = AsyncMock(
+        return_value=RepositoryStructureResponse(
+            service="mock",
+            owner="owner",
+            repo="repo",
+            ref="main",
+            tree=tree,
+            last_updated=datetime.now(timezone.utc),
+        )
+    )
+    service.get_document = AsyncMock(
+        side_effect=lambda service, owner, repo, path, **kwargs: _make_document(path)
+    )
+    return service
+
+
+class TestRepositoryChunkIndex:
+    """Test the per-repository chunk index."""
+
+    def test_add_document_skips_same_sha(self):
+        index = RepositoryChunkIndex(("mock", "owner", "repo", "main"))
+
+        assert index.add_document("a.md", "# A\nalpha", sha="1") is True
+        assert index.add_document("a.md", "# A\nalpha", sha="1") is False
+        assert index.add_document("a.md", "# A\nbeta", sha="2") is True
+        assert index.document_count == 1
+
+    def test_search_across_documents(self):
+        index = RepositoryChunkIndex(("mock", "owner", "repo", "main"))
+        index.add_document("a.md", "# A\nalpha topic", sha="1")
+        index.add_document("b.md", "# B\nbeta topic", sha="2")
+
+        results = index.search("beta", top_k=5)
+
+        assert [chunk.source for chunk, _ in results] == ["b.md"]
+
+    def test_remove_document(self):
+        index = RepositoryChunkIndex(("mock", "owner", "repo", "main"))
+        index.add_document("a.md", "# A\nalpha", sha="1")
+
+        assert index.remove_document("a.md") is True
+        assert index.search("alpha") == []
+
+
+class TestBuildRepositoryIndex:
+    """Test building an index from the repository structure."""
+
+    async def test_build_indexes_supported_documents(self, document_service):
+        index = RepositoryChunkIndex(("mock", "owner", "repo", "main"))
+
+        await build_repository_index(index, document_service)
+
+        assert sorted(index.paths()) == sorted(DOCUMENTS)
+        assert index.built_at is not None
+        assert index.search("kubernetes")[0][0].source == "docs/deploy.md"
+
+    async def test_rebuild_skips_unchanged_documents(self, document_service):
+        index = RepositoryChunkIndex(("mock", "owner", "repo", "main"))
+        await build_repository_index(index, document_service)
+        document_service.get_document.reset_mock()
+
+        await build_repository_index(index, document_service)
+
+        document_service.get_document.assert_not_called()
+
+    async def test_build_respects_root_path_and_limit(self, document_service):
+        index = RepositoryChunkIndex(("mock", "owner", "repo", "main"))
+
+        await build_repository_index(
+            index, document_service, root_path="docs", max_documents=1
+        )
+
+        assert index.document_count == 1
+
+
+class TestRepositoryIndexRegistry:
+    """Test the process-wide registry."""
+
+    async def test_ensure_built_builds_once(self, document_service):
+        registry = RepositoryIndexRegistry()
+
+        first = await registry.ensure_built(document_service, "mock", "owner", "repo", "main")
+        second = await registry.ensure_built(document_service, "mock", "owner", "repo", "main")
+
+        assert first is second
+        assert document_service.get_repository_structure.await_count == 1
+
+    async def test_get_built_does_not_wait_for_build(self, document_service):
+        registry = RepositoryIndexRegistry()
+
+        # A cold index is built in the background, not during the query
+        assert registry.get_built(document_service, "mock", "owner", "repo", "main") is None
+        await asyncio.gather(*registry._builds.values())
+
+        index = registry.get_built(document_service, "mock", "owner", "repo", "main")
+        assert index is not None
+        assert index.built_at is not None
+        assert not registry._builds
+
+    async def test_get_built_serves_stale_index_while_rebuilding(self, document_service):
+        registry = RepositoryIndexRegistry()
+        index = await registry.ensure_built(document_service, "mock", "owner", "repo", "main")
+        index.built_at -= settings.repository_index_ttl + 1
+
+        assert registry.get_built(document_service, "mock", "owner", "repo", "main") is index
+        await asyncio.gather(*registry._builds.values())
+
+        assert not index.is_stale(settings.repository_index_ttl)
+        assert document_service.get_repository_structure.await_count == 2
+
+    def test_registry_evicts_least_recently_used(self):
+        registry = RepositoryIndexRegistry(max_repositories=2)
+        registry.get_or_create("mock", "o", "a", "main")
+        registry.get_or_create("mock", "o", "b", "main")
+        registry.get("mock", "o", "a", "main")
+        registry.get_or_create("mock", "o", "c", "main")
+
+        assert registry.get("mock", "o", "b", "main") is None
+        assert registry.get("mock", "o", "a", "main") is not None
@@ -0,0 +1,187 @@
+"""
+Test cases for single-flight deduplication of in-flight queries.
+
+実行中の同一クエリをまとめる処理のテストケース群。
+"""
+
+import asyncio
+
+import pytest
+
+from doc_ai_helper_backend.services.llm.single_flight import SingleFlight
+
+
+def _content(text):
+    return {"content": text, "done": False}
+
+
+class TestSingleFlightRun:
+    """Test deduplication of non-streaming queries."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that identical concurrent queries run the call once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "answer"
+
+        results = await asyncio.gather(*(flight.run("llm:key", call) for _ in range(5)))
+
+        assert results == ["answer"] * 5
+        assert calls == 1
+        assert flight.deduplicated_queries == 4
+        assert flight.in_flight() == 0
+
+    async def test_different_keys_run_separately(self):
+        """Test that queries with different keys are not merged."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0)
+            return object()
+
+        first, second = await asyncio.gather(
+            flight.run("llm:a", call), flight.run("llm:b", call)
+        )
+
+        assert first is not second
+
+    async def test_errors_reach_all_waiters(self):
+        """Test that the leader's error is raised to every waiter."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider failed")
+
+        results = await asyncio.gather(
+            flight.run("llm:key", call), flight.run("llm:key", call), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        """Test that a disconnected leader does not fail waiting followers."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return "answer"
+
+        leader = asyncio.ensure_future(flight.run("llm:key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("llm:key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "answer"
+        assert leader.cancelled()
+
+
+class TestSingleFlightStream:
+    """Test teeing of streaming queries."""
+
+    async def test_late_subscriber_receives_whole_stream(self):
+        """Test that a follower gets events sent before it joined."""
+        flight = SingleFlight()
+        opened = 0
+        release = asyncio.Event()
+
+        async def source():
+            yield _content("a")
+            await release.wait()
+            yield _content("b")
+
+        async def open_stream():
+            nonlocal opened
+            opened += 1
+            return source()
+
+        leader = flight.stream("llm:key", open_stream)
+        assert await leader.__anext__() == _content("a")
+
+        async def consume(stream):
+            return [event async for event in stream]
+
+        follower = asyncio.ensure_future(consume(flight.stream("llm:key", open_stream)))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await consume(leader) == [_content("b")]
+        assert await follower == [_content("a"), _content("b")]
+        assert opened == 1
+        assert flight.deduplicated_streams == 1
+        assert flight.in_flight() == 0
+
+    async def test_source_closed_when_all_subscribers_leave(self):
+        """Test that the provider stream is closed once nobody is listening."""
+        flight = SingleFlight()
+        closed = False
+
+        async def source():
+            nonlocal closed
+            try:
+                while True:
+                    yield _content("x")
+                    await asyncio.sleep(0.01)
+            finally:
+                closed = True
+
+        async def open_stream():
+            return source()
+
+        first = flight.stream("llm:key", open_stream)
+        second = flight.stream("llm:key", open_stream)
+        await first.__anext__()
+        await second.__anext__()
+
+        await first.aclose()
+        assert not closed
+        await second.aclose()
+
+        assert closed
+        assert flight.in_flight() == 0
+
+    async def test_source_error_reaches_subscribers(self):
+        """Test that an upstream error is raised after the delivered events."""
+        flight = SingleFlight()
+
+        async def source():
+            yield _content("partial")
+            raise RuntimeError("provider failed")
+
+        async def open_stream():
+            return source()
+
+        received = []
+        with pytest.raises(RuntimeError, match="provider failed"):
+            async for event in flight.stream("llm:key", open_stream):
+                received.append(event)
+
+        assert received == [_content("partial")]
+
+    async def test_slow_subscriber_applies_backpressure(self):
+        """Test that the provider stream is not read far ahead of the slowest subscriber."""
+        flight = SingleFlight(max_lag=2)
+        produced = 0
+
+        async def source():
+            nonlocal produced
+            for i in range(100):
+                produced += 1
+                yield _content(str(i))
+
+        async def open_stream():
+            return source()
+
+        stream = flight.stream("llm:key", open_stream)
+        await stream.__anext__()
+        await asyncio.sleep(0.01)
+
+        assert produced <= 3
+        await stream.aclose()
+
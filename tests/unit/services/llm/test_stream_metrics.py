@@ -0,0 +1,103 @@
+"""
+Test cases for streaming metrics and cancellation.
+
+ストリーミングの集計とクライアント切断時のキャンセル処理のテストケース群。
+"""
+
+import pytest
+
+from doc_ai_helper_backend.models.llm import (
+    CoreQueryRequest,
+    DocumentContext,
+    LLMQueryRequest,
+    ProcessingOptions,
+)
+from doc_ai_helper_backend.services.llm.orchestrator import LLMOrchestrator
+from doc_ai_helper_backend.services.llm.stream_metrics import (
+    STREAM_CANCELLED,
+    STREAM_COMPLETED,
+    StreamMetrics,
+    stream_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_stream_metrics():
+    stream_metrics.reset()
+    yield
+    stream_metrics.reset()
+
+
+def _request(max_tokens=500):
+    return LLMQueryRequest(
+        query=CoreQueryRequest(prompt="Tell me a long story about documents", provider="mock"),
+        document=DocumentContext(auto_include_document=False),
+        processing=ProcessingOptions(options={"max_tokens": max_tokens}),
+    )
+
+
+class TestStreamMetrics:
+    """Test stream outcome accounting."""
+
+    def test_record_outcomes(self):
+        """Test that outcomes and saved tokens are accumulated."""
+        metrics = StreamMetrics()
+
+        metrics.record_started()
+        metrics.record_started()
+        metrics.record_finished(STREAM_COMPLETED, 100, 1000)
+        metrics.record_finished(STREAM_CANCELLED, 30, 1000)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["active_streams"] == 0
+        assert snapshot["completed_streams"] == 1
+        assert snapshot["cancelled_streams"] == 1
+        assert snapshot["streamed_tokens"] == 130
+        assert snapshot["estimated_tokens_saved"] == 970
+
+
+class TestStreamingCancellation:
+    """Test cancellation of streaming queries."""
+
+    async def test_completed_stream_is_recorded(self):
+        """Test that a fully consumed stream counts as completed."""
+        orchestrator = LLMOrchestrator({})
+
+        chunks = [chunk async for chunk in orchestrator.execute_streaming_query(_request())]
+
+        assert chunks[-1]["done"] is True
+        snapshot = stream_metrics.snapshot()
+        assert snapshot["completed_streams"] == 1
+        assert snapshot["cancelled_streams"] == 0
+
+    async def test_closing_stream_cancels_and_records_savings(self):
+        """Test that closing the stream early records a cancelled stream."""
+        orchestrator = LLMOrchestrator({})
+        stream = orchestrator.execute_streaming_query(_request(max_tokens=500))
+
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert first["done"] is False
+        snapshot = stream_metrics.snapshot()
+        assert snapshot["active_streams"] == 0
+        assert snapshot["cancelled_streams"] == 1
+        assert 0 < snapshot["estimated_tokens_saved"] < 500
+
+    async def test_follower_cancellation_saves_no_tokens(self):
+        """Test that leaving a shared stream does not count as saved tokens."""
+        orchestrator = LLMOrchestrator({})
+        leader = orchestrator.execute_streaming_query(_request())
+        follower = orchestrator.execute_streaming_query(_request())
+
+        await leader.__anext__()
+        await follower.__anext__()
+        await follower.aclose()
+
+        snapshot = stream_metrics.snapshot()
+        assert snapshot["cancelled_streams"] == 1
+        assert snapshot["estimated_tokens_saved"] == 0
+
+        chunks = [chunk async for chunk in leader]
+        assert chunks[-1]["done"] is True
+
@@ -11,6 +11,7 @@ from doc_ai_helper_backend.services.llm.system_prompt_generator import (
     generate_system_prompt,
     _build_bilingual_tool_system_prompt,
 )
+from doc_ai_helper_backend.services.llm.document_retriever import DocumentChunk
 from doc_ai_helper_backend.models.repository_context import (
     RepositoryContext,
     DocumentMetadata,
@@ -83,6 +84,24 @@ class TestGenerateSystemPrompt:
         # Assert
         assert result is None
 
+    def test_generate_system_prompt_disabled_keeps_repository_chunks(self):
+        """Repository chunks are embedded even when auto-include is disabled."""
+        chunks = [
+            DocumentChunk(index=0, text="Install with pip.", heading="Setup", tokens=5, source="docs/setup.md")
+        ]
+
+        result = generate_system_prompt(
+            document_content="# Current document",
+            include_document_in_system_prompt=False,
+            repository_chunks=chunks,
+        )
+
+        assert result is not None
+        assert "--- docs/setup.md: Setup ---" in result
+        assert "Install with pip." in result
+        assert "=== ドキュメント内容ここまで ===" not in result
+        assert "# Current document" not in result
+
     def test_generate_system_prompt_minimal_context(self):
         """Test system prompt generation with minimal context."""
         # Execute
@@ -0,0 +1,116 @@
+"""
+Test cases for the shared tokenizer registry.
+
+共有トークナイザーレジストリとトークン数のメモ化のテストケース群。
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from doc_ai_helper_backend.models.llm import MessageItem, MessageRole
+from doc_ai_helper_backend.services.llm.conversation_optimizer import (
+    optimize_conversation_history,
+)
+from doc_ai_helper_backend.services.llm.tokenizer import (
+    TokenizerRegistry,
+    tokenizer_registry,
+)
+
+
+def _word_encoder(name="cl100k_base"):
+    """Encoder that yields one token per word."""
+    encoder = Mock()
+    encoder.name = name
+    encoder.encode.side_effect = lambda text: text.split()
+    return encoder
+
+
+@pytest.fixture
+def encoder():
+    encoder = _word_encoder()
+    with patch("tiktoken.get_encoding", return_value=encoder) as get_encoding:
+        encoder.get_encoding = get_encoding
+        yield encoder
+
+
+class TestTokenizerRegistry:
+    """Test encoder sharing and token count memoization."""
+
+    def test_encoder_is_loaded_once_per_model(self):
+        """Test that each model's encoder is loaded once and reused."""
+        registry = TokenizerRegistry()
+        with patch("tiktoken.encoding_for_model", side_effect=lambda model: _word_encoder(model)) as for_model:
+            first = registry.get_encoder(model="gpt-4o")
+            second = registry.get_encoder(model="gpt-4o")
+            other = registry.get_encoder(model="gpt-4")
+
+        assert first is second
+        assert other is not first
+        assert for_model.call_count == 2
+
+    def test_unknown_model_falls_back_to_default_encoding(self, encoder):
+        """Test that unknown models use the default encoding."""
+        registry = TokenizerRegistry()
+        with patch("tiktoken.encoding_for_model", side_effect=KeyError("unknown")):
+            assert registry.get_encoder(model="custom-model") is encoder
+
+    def test_counts_are_memoized_by_content(self, encoder):
+        """Test that identical texts are tokenized once."""
+        registry = TokenizerRegistry()
+
+        assert registry.count_tokens("one two three") == 3
+        assert registry.count_tokens("one two three") == 3
+        assert registry.count_tokens("four five") == 2
+
+        assert encoder.encode.call_count == 2
+
+    def test_memoized_counts_are_bounded(self, encoder):
+        """Test that least recently used counts are evicted."""
+        registry = TokenizerRegistry(max_counts=2)
+
+        for text in ("a", "b", "c", "a"):
+            registry.count_tokens(text)
+
+        # "a" was evicted by "c" and had to be tokenized again
+        assert encoder.encode.call_count == 4
+
+    def test_fallback_without_tiktoken(self):
+        """Test the character approximation when tiktoken is not installed."""
+        registry = TokenizerRegistry()
+        with patch.dict("sys.modules", {"tiktoken": None}):
+            assert registry.count_tokens("x" * 40) == 10
+
+
+class TestLinearHistoryOptimization:
+    """Test that history optimization tokenizes each message once."""
+
+    @pytest.fixture(autouse=True)
+    def clear_registry(self):
+        tokenizer_registry.clear()
+        yield
+        tokenizer_registry.clear()
+
+    def test_each_message_is_tokenized_once(self, encoder):
+        """Test that a long history is optimized with one pass of tokenization."""
+        history = [
+            MessageItem(
+                role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                content=f"message {i} " + "word " * 8,
+            )
+            for i in range(50)
+        ]
+
+        optimized, info = optimize_conversation_history(
+            history, max_tokens=100, preserve_recent=2
+        )
+
+        # 11 tokens per message including the role prefix
+        assert optimized == history[-9:]
+        assert info["final_tokens"] == 99
+        assert info["removed_messages"] == 41
+        assert encoder.encode.call_count == len(history)
+
+        # A repeated optimization reuses the memoized counts
+        optimize_conversation_history(history, max_tokens=100, preserve_recent=2)
+        assert encoder.encode.call_count == len(history)
@@ -4,12 +4,15 @@ Test cases for tool execution and followup functionality.
 ツール実行とフォローアップ機能のテストケース群。
 """
 
+import asyncio
 import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from doc_ai_helper_backend.services.llm.tool_executor import (
     handle_tool_execution_and_followup,
+    execute_tool_calls,
+    stream_tool_loop,
     convert_repository_context_to_dict,
     generate_followup_response,
     build_tool_results_summary,
@@ -23,6 +26,7 @@ from doc_ai_helper_backend.models.llm import (
     MessageItem,
     MessageRole,
 )
+from doc_ai_helper_backend.services.llm.providers.mock_service import MockLLMService
 from doc_ai_helper_backend.models.repository_context import (
     RepositoryContext,
     GitService,
@@ -601,4 +605,198 @@ class TestBuildToolResultsSummary:
         
         # Assert
         assert len(result) == 1
-        assert "✅ string_result_tool: 実行完了" in result
\ No newline at end of file
+        assert "✅ string_result_tool: 実行完了" in result
+
+class TestExecuteToolCalls:
+    """Test parallel tool execution."""
+
+    @staticmethod
+    def _tool_calls(count):
+        return [
+            ToolCall(
+                id=f"call_{i}",
+                function=FunctionCall(name="test_tool", arguments=json.dumps({"param1": str(i)}))
+            )
+            for i in range(count)
+        ]
+
+    async def test_runs_tools_concurrently_in_order(self, mock_llm_service, sample_function_definitions):
+        """Test that tools run concurrently and results keep the call order."""
+        running = 0
+        max_running = 0
+
+        async def execute(function_call, available_functions, repository_context=None):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            param = json.loads(function_call.arguments)["param1"]
+            # Later calls finish first
+            await asyncio.sleep(0.01 * (3 - int(param)))
+            running -= 1
+            return {"success": True, "result": param}
+
+        mock_llm_service.execute_function_call.side_effect = execute
+
+        results = await execute_tool_calls(
+            mock_llm_service, self._tool_calls(3), sample_function_definitions, None,
+            max_concurrency=2, timeout=5,
+        )
+
+        assert [r["tool_call_id"] for r in results] == ["call_0", "call_1", "call_2"]
+        assert [r["result"]["result"] for r in results] == ["0", "1", "2"]
+        assert max_running == 2
+
+    async def test_timeout_is_reported_per_tool(self, mock_llm_service, sample_function_definitions):
+        """Test that a slow tool times out without failing the others."""
+        async def execute(function_call, available_functions, repository_context=None):
+            if json.loads(function_call.arguments)["param1"] == "0":
+                await asyncio.sleep(10)
+            return {"success": True}
+
+        mock_llm_service.execute_function_call.side_effect = execute
+
+        results = await execute_tool_calls(
+            mock_llm_service, self._tool_calls(2), sample_function_definitions, None,
+            max_concurrency=4, timeout=0.05,
+        )
+
+        assert "timed out" in results[0]["error"]
+        assert results[1]["result"] == {"success": True}
+
+
+class TestMultiRoundToolLoop:
+    """Test the multi-round tool loop."""
+
+    @staticmethod
+    def _response(content, tool_call_id=None):
+        tool_calls = []
+        if tool_call_id:
+            tool_calls = [
+                ToolCall(id=tool_call_id, function=FunctionCall(name="test_tool", arguments='{}'))
+            ]
+        return LLMResponse(
+            content=content,
+            model="test-model",
+            provider="test-provider",
+            usage=LLMUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+            tool_calls=tool_calls,
+        )
+
+    async def test_feeds_tool_messages_until_done(self, mock_llm_service, sample_function_definitions):
+        """Test that tool results are fed back as tool messages across rounds."""
+        mock_llm_service.execute_function_call.return_value = {"success": True, "result": "ok"}
+        mock_llm_service._convert_provider_response.side_effect = [
+            self._response("", "call_2"),
+            self._response("Final answer"),
+        ]
+        llm_response = self._response("", "call_1")
+
+        await handle_tool_execution_and_followup(
+            service=mock_llm_service,
+            llm_response=llm_response,
+            tools=sample_function_definitions,
+            repository_context=None,
+            original_prompt="Do two steps",
+            conversation_history=None,
+            system_prompt=None,
+            options=None,
+            max_rounds=5,
+        )
+
+        assert llm_response.content == "Final answer"
+        assert [r["tool_call_id"] for r in llm_response.tool_execution_results] == ["call_1", "call_2"]
+        assert llm_response.usage.total_tokens == 45
+        assert mock_llm_service._call_provider_api.call_count == 2
+
+        history = mock_llm_service._prepare_provider_options.call_args[1]["conversation_history"]
+        assert [m.role for m in history] == [
+            MessageRole.USER,
+            MessageRole.ASSISTANT,
+            MessageRole.TOOL,
+            MessageRole.ASSISTANT,
+            MessageRole.TOOL,
+        ]
+        assert history[2].tool_call_id == "call_1"
+        assert json.loads(history[2].content) == {"success": True, "result": "ok"}
+
+    async def test_round_limit_forces_final_answer(self, mock_llm_service, sample_function_definitions):
+        """Test that the last allowed round disables further tool calls."""
+        mock_llm_service.execute_function_call.return_value = {"success": True}
+        mock_llm_service._convert_provider_response.return_value = self._response("Forced", "call_x")
+        llm_response = self._response("", "call_1")
+
+        await handle_tool_execution_and_followup(
+            service=mock_llm_service,
+            llm_response=llm_response,
+            tools=sample_function_definitions,
+            repository_context=None,
+            original_prompt="Loop forever",
+            conversation_history=None,
+            system_prompt=None,
+            options=None,
+            max_rounds=1,
+        )
+
+        assert mock_llm_service._call_provider_api.call_count == 1
+        assert mock_llm_service._prepare_provider_options.call_args[1]["tool_choice"].type == "none"
+        assert llm_response.content == "Forced"
+        assert len(llm_response.tool_execution_results) == 1
+
+
+class TestStreamToolLoop:
+    """Test streaming tool execution."""
+
+    async def test_streams_tool_calls_progress_and_followup(self):
+        """Test that tool deltas and progress precede the streamed followup."""
+        service = MockLLMService(response_delay=0.0)
+        tools = await service.get_available_functions()
+
+        events = [
+            event
+            async for event in stream_tool_loop(
+                service,
+                tools,
+                None,
+                "Please summarize this document",
+                None,
+                None,
+                None,
+            )
+        ]
+
+        kinds = [event.get("type", "content") for event in events]
+        assert kinds.index("tool_call_delta") < kinds.index("tool_execution")
+        progress = [event["status"] for event in events if event.get("type") == "tool_execution"]
+        assert progress == ["started", "completed"]
+        # The followup is streamed after the tools ran
+        assert kinds[-1] == "content"
+        assert events[-1]["content"]
+
+    async def test_execution_failure_is_raised_instead_of_hanging(self):
+        """Test that a tool execution task failing before any result propagates its error."""
+        service = MockLLMService(response_delay=0.0)
+        tools = await service.get_available_functions()
+
+        async def failing_execution(*args, **kwargs):
+            raise RuntimeError("executor crashed")
+
+        async def consume():
+            return [
+                event
+                async for event in stream_tool_loop(
+                    service,
+                    tools,
+                    None,
+                    "Please summarize this document",
+                    None,
+                    None,
+                    None,
+                )
+            ]
+
+        with patch(
+            "doc_ai_helper_backend.services.llm.tool_executor.execute_tool_calls",
+            side_effect=failing_execution,
+        ):
+            with pytest.raises(RuntimeError, match="executor crashed"):
+                await asyncio.wait_for(consume(), timeout=5)
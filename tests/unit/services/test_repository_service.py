@@ -412,4 +412,26 @@ class TestRepositoryService:
 
         # Execute and verify exception
         with pytest.raises(RepositoryServiceException):
-            await repository_service.list_repositories()
\ No newline at end of file
+            await repository_service.list_repositories()
+    # SYNC STATE TESTS
+    @pytest.mark.asyncio
+    async def test_record_sync_creates_state(self, repository_service, mock_db_session):
+        """Test recording the first sync of a branch."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+
+        await repository_service.record_sync(1, "main", "abc123")
+
+        state = mock_db_session.add.call_args.args[0]
+        assert (state.repository_id, state.branch, state.last_commit_sha) == (1, "main", "abc123")
+        mock_db_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_last_synced_commit(self, repository_service, mock_db_session):
+        """Test reading the last synced commit of a branch."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = MagicMock(last_commit_sha="abc123")
+        mock_db_session.execute.return_value = mock_result
+
+        assert await repository_service.get_last_synced_commit(1, "main") == "abc123"